@@ -1,22 +1,33 @@
 from dataclasses import dataclass
-from typing import List
+from typing import Tuple
 
+from apps.cinema.dates import TimeWindow
 from apps.movie.dataclasses import Movie
 
 
-@dataclass
+@dataclass(frozen=True)
 class Cinema:
+    __slots__ = ("name", "movies")
+
     name: str
-    movies: List[Movie]
+    movies: Tuple[Movie, ...]
 
     def get_movies(self):
         return self.movies
 
+    def get_window(self, window: TimeWindow) -> "Cinema":
+        return Cinema(
+            name=self.name,
+            movies=tuple(movie.get_window(window) for movie in self.movies),
+        )
+
 
-@dataclass
+@dataclass(frozen=True)
 class ShowDate:
+    __slots__ = ("date", "cinemas")
+
     date: str
-    cinemas: List[Cinema]
+    cinemas: Tuple[Cinema, ...]
 
     def get_cinemas(self):
         return self.cinemas
@@ -24,5 +35,8 @@ class ShowDate:
     def get_formatted_date(self):
         return self.date.replace("-", " ")
 
-    def add_cinemas(self, cinemas):
-        self.cinemas += cinemas
+    def get_window(self, window: TimeWindow) -> "ShowDate":
+        return ShowDate(
+            date=self.date,
+            cinemas=tuple(cinema.get_window(window) for cinema in self.cinemas),
+        )
@@ -0,0 +1,166 @@
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+MONTHS = {
+    "enero": 1,
+    "febrero": 2,
+    "marzo": 3,
+    "abril": 4,
+    "mayo": 5,
+    "junio": 6,
+    "julio": 7,
+    "agosto": 8,
+    "septiembre": 9,
+    "octubre": 10,
+    "noviembre": 11,
+    "diciembre": 12,
+}
+MONTH_NAMES = {number: name for name, number in MONTHS.items()}
+
+TIME_FORMATS = ("%H:%M", "%H:%M:%S", "%I:%M %p", "%I:%M%p")
+
+LAST_MINUTE = 24 * 60 - 1
+WINDOW_OPEN_START = ("desde", "despues", "después")
+WINDOW_OPEN_END = ("hasta", "antes")
+
+
+def _get_closest_date(month: int, day: int, today: Optional[date] = None) -> date:
+    today = today or date.today()
+    candidates = []
+    for year in (today.year - 1, today.year, today.year + 1):
+        try:
+            candidates.append(date(year, month, day))
+        except ValueError:
+            continue
+    return min(candidates, key=lambda candidate: abs(candidate - today))
+
+
+def parse_day_month(value: str, today: Optional[date] = None) -> Optional[date]:
+    parts = value.strip().lower().replace("/", "-").replace(" ", "-").split("-")
+    parts = [part for part in parts if part]
+    if len(parts) < 2:
+        return None
+    day, month = parts[-2], parts[-1]
+    try:
+        month_number = int(month) if month.isdigit() else MONTHS[month]
+        return _get_closest_date(month_number, int(day), today)
+    except (KeyError, ValueError):
+        return None
+
+
+def parse_iso_date(value: str) -> Optional[date]:
+    try:
+        return date.fromisoformat(value.strip()[:10])
+    except ValueError:
+        return None
+
+
+def parse_date(value: str, today: Optional[date] = None) -> Optional[date]:
+    return parse_iso_date(value) or parse_day_month(value, today)
+
+
+def parse_time(value: str) -> Optional[time]:
+    value = value.strip().upper().replace(".", "")
+    for time_format in TIME_FORMATS:
+        try:
+            return datetime.strptime(value, time_format).time()
+        except ValueError:
+            continue
+    return None
+
+
+@lru_cache(maxsize=4096)
+def parse_minutes(value: str) -> Optional[int]:
+    showing_time = parse_time(value)
+    if showing_time is None:
+        return None
+    return showing_time.hour * 60 + showing_time.minute
+
+
+@dataclass(frozen=True)
+class TimeWindow:
+    start: int
+    end: int
+
+    def get_ranges(self) -> Tuple[Tuple[int, int], ...]:
+        if self.start <= self.end:
+            return ((self.start, self.end),)
+        return ((self.start, LAST_MINUTE), (0, self.end))
+
+
+def _parse_window_minutes(value: str) -> Optional[int]:
+    if value.isdigit() and int(value) < 24:
+        return int(value) * 60
+    return parse_minutes(value)
+
+
+@lru_cache(maxsize=256)
+def parse_time_window(value: Optional[str]) -> Optional[TimeWindow]:
+    if not value:
+        return None
+    start, _, end = value.strip().lower().partition("-")
+    if start in WINDOW_OPEN_START:
+        start, end = end, ""
+    elif start in WINDOW_OPEN_END:
+        start = ""
+    start_minutes = _parse_window_minutes(start) if start else 0
+    end_minutes = _parse_window_minutes(end) if end else LAST_MINUTE
+    if start_minutes is None or end_minutes is None:
+        return None
+    return TimeWindow(start=start_minutes, end=end_minutes)
+
+
+@lru_cache(maxsize=256)
+def _parse_user_date(value: str, today: date) -> Optional[date]:
+    return parse_date(value, today)
+
+
+def parse_user_date(value: Optional[str]) -> Optional[date]:
+    if not value:
+        return None
+    return _parse_user_date(value.strip().replace(" ", "-"), date.today())
+
+
+def format_user_date(value: date) -> str:
+    return f"{value.day}-{MONTH_NAMES[value.month]}"
+
+
+class DateIndex:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[int, Tuple[List[Any], Dict[date, List[Any]]]]" = (
+            OrderedDict()
+        )
+
+    def _build(
+        self, items: List[Any], get_date: Callable[[Any], Optional[date]]
+    ) -> Dict[date, List[Any]]:
+        dates = defaultdict(list)
+        for item in items:
+            item_date = get_date(item)
+            if item_date:
+                dates[item_date].append(item)
+        return dict(dates)
+
+    def get_items(
+        self,
+        items: List[Any],
+        get_date: Callable[[Any], Optional[date]],
+        showing_date: Optional[date],
+    ) -> List[Any]:
+        # Payloads are immutable once fetched, so they are indexed by identity
+        # and the entry keeps the list alive to stop its id from being reused.
+        key = id(items)
+        entry = self.entries.get(key)
+        if entry is None or entry[0] is not items:
+            entry = self.entries[key] = (items, self._build(items, get_date))
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        self.entries.move_to_end(key)
+        return entry[1].get(showing_date, [])
+
+
+date_index = DateIndex(max_entries=1024)
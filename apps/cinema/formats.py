@@ -0,0 +1,158 @@
+import threading
+from dataclasses import dataclass
+from typing import (
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+DIMENSIONS = ("2D", "3D", "4D", "XD")
+LANGUAGES = ("ESP", "SUB")
+PREMIUM_TAGS = ("4DX", "DBOX", "IMAX", "MACRO", "PREMIER", "XE")
+
+# Tokens outside these enumerations are matched as substrings of the name.
+NAME_FIELD = "name"
+
+Field = Tuple[str, str]
+
+
+@dataclass(frozen=True)
+class ShowFormat:
+    id: int
+    name: str
+    dimensions: FrozenSet[str]
+    language: Optional[str]
+    premium: FrozenSet[str]
+
+    @property
+    def bit(self) -> int:
+        return 1 << self.id
+
+    def get_fields(self) -> Iterator[Field]:
+        for dimension in self.dimensions:
+            yield "dimension", dimension
+        if self.language:
+            yield "language", self.language
+        for tag in self.premium:
+            yield "premium", tag
+
+    def has_field(self, field: Field) -> bool:
+        kind, value = field
+        if kind == "dimension":
+            return value in self.dimensions
+        if kind == "language":
+            return value == self.language
+        if kind == "premium":
+            return value in self.premium
+        return value in self.name
+
+
+def _parse_format(format_id: int, name: str) -> ShowFormat:
+    dimensions, language, premium = set(), None, set()
+    for token in name.split():
+        if token in LANGUAGES:
+            language = token
+        elif token in DIMENSIONS:
+            dimensions.add(token)
+        else:
+            # 4DX is both a premium room and a 4D session.
+            if token.startswith("4D"):
+                dimensions.add("4D")
+            premium.add(token)
+    return ShowFormat(
+        id=format_id,
+        name=name,
+        dimensions=frozenset(dimensions),
+        language=language,
+        premium=frozenset(premium),
+    )
+
+
+def _get_token_field(token: str) -> Field:
+    if token in DIMENSIONS:
+        return "dimension", token
+    if token in LANGUAGES:
+        return "language", token
+    if token in PREMIUM_TAGS:
+        return "premium", token
+    return NAME_FIELD, token
+
+
+@dataclass(frozen=True)
+class FormatFilter:
+    text: str
+    mask: int
+    size: int
+    fields: FrozenSet[Field]
+
+    def matches(self, show_format: ShowFormat) -> bool:
+        if show_format.id < self.size:
+            return bool(self.mask & show_format.bit)
+        return all(show_format.has_field(field) for field in self.fields)
+
+    def get_format_ids(self, formats: Iterable[ShowFormat]) -> List[int]:
+        return [show_format.id for show_format in formats if self.matches(show_format)]
+
+
+class FormatVocabulary:
+    def __init__(self):
+        self.formats: List[ShowFormat] = []
+        self.names: Dict[str, ShowFormat] = {}
+        self.upstream_formats: Dict[Tuple[str, str], ShowFormat] = {}
+        self.field_masks: Dict[Tuple[str, str], int] = {}
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.formats)
+
+    def get_format(self, name: str) -> ShowFormat:
+        show_format = self.names.get(name)
+        if show_format is None:
+            with self.lock:
+                show_format = self.names.get(name)
+                if show_format is None:
+                    show_format = _parse_format(len(self.formats), name)
+                    self.formats.append(show_format)
+                    self.names[name] = show_format
+                    for field in show_format.get_fields():
+                        self.field_masks[field] = (
+                            self.field_masks.get(field, 0) | show_format.bit
+                        )
+        return show_format
+
+    def get_upstream_format(
+        self, chain: str, upstream_name: str, get_name: Callable[[str], str]
+    ) -> ShowFormat:
+        show_format = self.upstream_formats.get((chain, upstream_name))
+        if show_format is None:
+            show_format = self.upstream_formats[(chain, upstream_name)] = (
+                self.get_format(get_name(upstream_name))
+            )
+        return show_format
+
+    def get_filter(self, format: Optional[str]) -> Optional[FormatFilter]:
+        if not format:
+            return None
+        with self.lock:
+            formats = self.formats[:]
+            field_masks = dict(self.field_masks)
+        fields = frozenset(_get_token_field(token) for token in format.split())
+        mask = (1 << len(formats)) - 1
+        for field in fields:
+            if field[0] == NAME_FIELD:
+                field_mask = 0
+                for show_format in formats:
+                    if field[1] in show_format.name:
+                        field_mask |= show_format.bit
+            else:
+                field_mask = field_masks.get(field, 0)
+            mask &= field_mask
+        return FormatFilter(text=format, mask=mask, size=len(formats), fields=fields)
+
+
+format_vocabulary = FormatVocabulary()
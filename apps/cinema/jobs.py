@@ -0,0 +1,101 @@
+import asyncio
+import time
+from typing import Any, Dict, Mapping, Set, Tuple
+
+from asgiref.sync import sync_to_async
+
+from apps.cinema.models import Snapshot
+from apps.cinema.registry import CINEHOYTS, CINEMARK, registry, seed_registry
+from apps.cinema.services import cinehoyts as cinehoyts_services
+from apps.cinema.services import cinemark as cinemark_services
+from apps.cinema.services.conditional import conditional_fetcher
+from apps.cinema.snapshots import publish_snapshot, touch_snapshot
+from apps.movie.ingestion import get_cinema_versions, ingest_showings
+
+Source = Tuple[str, str]
+
+
+async def _collect_cinehoyts_zone(
+    zone: str, showings: Dict[str, Any], failures: Dict[str, str]
+):
+    cinemas = registry.get_upstream_zones(CINEHOYTS)[zone]
+    try:
+        zone_showings, changed = await cinehoyts_services.fetch_showings_by_zone(zone)
+    except Exception as error:
+        for cinema in cinemas:
+            failures[cinema["tag"]] = f"{type(error).__name__}: {error}"
+        return
+    if changed:
+        showings[zone] = zone_showings
+    fetched_keys = {cinema_showings["Key"] for cinema_showings in zone_showings}
+    for cinema in cinemas:
+        if cinema["id"] not in fetched_keys:
+            failures[cinema["tag"]] = "missing from billboard"
+
+
+async def _collect_cinemark_cinema(
+    cinema: Mapping[str, Any], showings: Dict[str, Any], failures: Dict[str, str]
+):
+    try:
+        dateshows, changed = await cinemark_services.fetch_showings_by_cinema(
+            cinema["id"]
+        )
+    except Exception as error:
+        failures[cinema["tag"]] = f"{type(error).__name__}: {error}"
+        return
+    if changed:
+        showings[str(cinema["id"])] = dateshows
+
+
+async def collect_showings() -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str]]:
+    showings = {"cinehoyts": {}, "cinemark": {}}
+    failures = {}
+    await asyncio.gather(
+        *[
+            _collect_cinehoyts_zone(zone, showings["cinehoyts"], failures)
+            for zone in registry.get_upstream_zones(CINEHOYTS)
+        ],
+        *[
+            _collect_cinemark_cinema(cinema, showings["cinemark"], failures)
+            for cinema in registry.get_chain_cinemas(CINEMARK)
+        ],
+    )
+    return showings, failures
+
+
+def _get_sources(showings: Dict[str, Dict[str, Any]]) -> Set[Source]:
+    return {
+        (chain, key)
+        for chain, chain_showings in showings.items()
+        for key in chain_showings
+    }
+
+
+def _publish_and_ingest(
+    showings: Dict[str, Dict[str, Any]], failures: Dict[str, str], duration: float
+) -> Tuple[Snapshot, Dict[str, int]]:
+    changed_sources = _get_sources(showings)
+    if not changed_sources:
+        snapshot = touch_snapshot(failures, duration)
+        if snapshot:
+            return snapshot, {"normalized_cinemas": 0}
+    snapshot = publish_snapshot(showings, failures, duration)
+    ingestion = ingest_showings(snapshot.showings, changed_sources)
+    snapshot.cinema_versions = get_cinema_versions()
+    snapshot.save(update_fields=["cinema_versions"])
+    return snapshot, ingestion
+
+
+async def run_snapshot_job() -> Tuple[Snapshot, Dict[str, int]]:
+    await sync_to_async(seed_registry)()
+    await registry.refresh()
+    fetch_stats = conditional_fetcher.get_stats()
+    started_at = time.monotonic()
+    showings, failures = await collect_showings()
+    duration = time.monotonic() - started_at
+    snapshot, report = await sync_to_async(_publish_and_ingest)(
+        showings, failures, duration
+    )
+    for stat, value in conditional_fetcher.get_stats().items():
+        report[stat] = value - fetch_stats[stat]
+    return snapshot, report
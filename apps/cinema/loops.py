@@ -0,0 +1,24 @@
+import asyncio
+from weakref import WeakKeyDictionary
+
+
+class LoopLock:
+    # On Python 3.9 an asyncio.Lock binds to the loop that was current when it
+    # was built, so module singletons create one lock per running loop instead.
+    def __init__(self):
+        self.locks: "WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = (
+            WeakKeyDictionary()
+        )
+
+    def get_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        lock = self.locks.get(loop)
+        if lock is None:
+            lock = self.locks[loop] = asyncio.Lock()
+        return lock
+
+    async def __aenter__(self):
+        await self.get_lock().acquire()
+
+    async def __aexit__(self, *exc_info):
+        self.get_lock().release()
@@ -0,0 +1,83 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.suite import (
+    check_title_corpus,
+    compare_results,
+    get_report,
+    load_baseline,
+    run,
+    save_baseline,
+)
+from cinema_showings_bot.settings import BENCHMARK_BASELINE
+
+
+class Command(BaseCommand):
+    help = (
+        "Times the showing services and the bot commands against synthetic "
+        "billboards and compares the results with the stored baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--cinemas", type=int, default=20)
+        parser.add_argument("--dates", type=int, default=7)
+        parser.add_argument("--movies", type=int, default=20)
+        parser.add_argument("--formats", type=int, default=3)
+        parser.add_argument("--sessions", type=int, default=4)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--min-time", type=float, default=0.05)
+        parser.add_argument("--filter", dest="pattern")
+        parser.add_argument("--baseline", default=BENCHMARK_BASELINE)
+        parser.add_argument("--threshold", type=float, default=0.25)
+        parser.add_argument("--save", action="store_true")
+        parser.add_argument("--check", action="store_true")
+
+    def handle(self, *args, **options):
+        size = {
+            "cinemas": options["cinemas"],
+            "dates": options["dates"],
+            "movies": options["movies"],
+            "formats": options["formats"],
+            "sessions": options["sessions"],
+        }
+        title_mismatches = check_title_corpus()
+        if title_mismatches:
+            raise CommandError(
+                "title grouping differs from the recorded corpus for "
+                + ", ".join(title_mismatches)
+            )
+        results = run(
+            size,
+            repeat=options["repeat"],
+            min_time=options["min_time"],
+            pattern=options["pattern"],
+        )
+        baseline = load_baseline(options["baseline"])
+        if baseline and baseline["size"] != size:
+            self.stderr.write(
+                f"baseline was recorded with {baseline['size']}, not comparing"
+            )
+            baseline = None
+        regressions = []
+        for name, median, change, is_regression in compare_results(
+            results, baseline, options["threshold"]
+        ):
+            change_message = "" if change is None else f"{change:+.0%}"
+            memory_message = ""
+            if "retained" in results[name]:
+                memory_message = (
+                    f" {results[name]['retained'] / 1024:>8.0f} KiB retained"
+                    f" {results[name]['peak'] / 1024:>8.0f} KiB peak"
+                )
+            self.stdout.write(
+                f"{name:<40} {median * 1000:>10.3f} ms {change_message:>8}"
+                f"{memory_message}{' REGRESSION' if is_regression else ''}"
+            )
+            if is_regression:
+                regressions.append(name)
+        if options["save"]:
+            if baseline:
+                results = {**baseline["results"], **results}
+            save_baseline(options["baseline"], get_report(size, results))
+            self.stdout.write(f"baseline saved to {options['baseline']}")
+        if options["check"] and regressions:
+            raise CommandError(f"{len(regressions)} benchmarks regressed")
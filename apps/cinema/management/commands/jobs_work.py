@@ -0,0 +1,56 @@
+import asyncio
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.cinema.jobs import run_snapshot_job
+from apps.cinema.services.http import close_clients
+from cinema_showings_bot.settings import SNAPSHOT_INTERVAL
+
+
+class Command(BaseCommand):
+    help = "Periodically snapshots every Cinehoyts zone and Cinemark cinema."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, default=SNAPSHOT_INTERVAL)
+        parser.add_argument("--once", action="store_true")
+
+    def handle(self, *args, **options):
+        asyncio.run(self.work(options["interval"], options["once"]))
+
+    async def work(self, interval: float, once: bool):
+        try:
+            while True:
+                started_at = time.monotonic()
+                try:
+                    snapshot, report = await run_snapshot_job()
+                except Exception as error:
+                    self.stderr.write(
+                        f"snapshot failed after {time.monotonic() - started_at:.2f}s: "
+                        f"{type(error).__name__}: {error}"
+                    )
+                    if once:
+                        raise CommandError("snapshot failed") from error
+                else:
+                    self.stdout.write(
+                        f"snapshot {snapshot.id}: {snapshot.duration:.2f}s, "
+                        f"{len(snapshot.failures)} failed cinemas, "
+                        f"{report['requests']} requests, "
+                        f"{report['not_modified']} not modified, "
+                        f"{report['unchanged']} unchanged, "
+                        f"{report['decoded']} decoded, "
+                        f"{report['normalized_cinemas']} cinemas normalized, "
+                        f"{report.get('inserted', 0)} inserted, "
+                        f"{report.get('updated', 0)} updated, "
+                        f"{report.get('deleted', 0)} deleted, "
+                        f"{report.get('changed_cinemas', 0)} cinemas changed"
+                    )
+                    for cinema_tag, error in sorted(snapshot.failures.items()):
+                        self.stderr.write(f"  {cinema_tag}: {error}")
+                if once:
+                    break
+                await asyncio.sleep(
+                    max(0.0, interval - (time.monotonic() - started_at))
+                )
+        finally:
+            await close_clients()
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+
+from apps.discord import services as cinema_showings_bot
+
+
+class Command(BaseCommand):
+    help = "Runs the Discord bot."
+
+    def handle(self, *args, **options):
+        cinema_showings_bot.main()
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from apps.cinema.registry import seed_registry
+
+
+class Command(BaseCommand):
+    help = "Seeds the Town/Cinema registry from the chain constants."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="overwrite cinemas and towns that were already seeded",
+        )
+
+    def handle(self, *args, **options):
+        if seed_registry(options["force"]):
+            self.stdout.write("registry seeded")
+        else:
+            self.stdout.write("registry already seeded, use --force to reseed")
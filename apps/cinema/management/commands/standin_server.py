@@ -0,0 +1,51 @@
+from aiohttp import web
+from django.core.management.base import BaseCommand
+
+from apps.cinema.standin import StandinServer
+from cinema_showings_bot.settings import STANDIN_FIXTURES_DIR
+
+
+class Command(BaseCommand):
+    help = (
+        "Serves recorded Cinehoyts/Cinemark billboards from disk. Point "
+        "CINEHOYTS_HOST at http://HOST:PORT and CINEMARK_HOST at "
+        "http://HOST:PORT/api/ to run the bot or the worker against it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8800)
+        parser.add_argument("--fixtures", default=STANDIN_FIXTURES_DIR)
+        parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+        parser.add_argument("--jitter", type=float, default=0.0, help="seconds")
+        parser.add_argument("--error-rate", type=float, default=0.0)
+        parser.add_argument("--scale", type=int, default=1)
+        parser.add_argument(
+            "--record",
+            action="store_true",
+            help="proxy every request to the real upstream and save its response",
+        )
+        parser.add_argument("--cinehoyts-upstream", default="https://cinepolischile.cl")
+        parser.add_argument(
+            "--cinemark-upstream", default="https://api.cinemark.cl/api"
+        )
+
+    def handle(self, *args, **options):
+        server = StandinServer(
+            fixtures_dir=options["fixtures"],
+            latency=options["latency"],
+            jitter=options["jitter"],
+            error_rate=options["error_rate"],
+            scale=options["scale"],
+            cinehoyts_upstream=(
+                options["cinehoyts_upstream"] if options["record"] else None
+            ),
+            cinemark_upstream=(
+                options["cinemark_upstream"] if options["record"] else None
+            ),
+        )
+        mode = "recording" if server.is_recording else "replaying"
+        self.stdout.write(f"{mode} {options['fixtures']}")
+        web.run_app(
+            server.get_application(), host=options["host"], port=options["port"]
+        )
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cinema", "0002_snapshot"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="cinema",
+            name="version",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="snapshot",
+            name="cinema_versions",
+            field=models.JSONField(default=dict),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cinema", "0003_cinema_versions"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="snapshot",
+            name="checked_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cinema", "0004_snapshot_checked_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RegistryVersion",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("version", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="cinema",
+            name="towns",
+            field=models.ManyToManyField(
+                blank=True, related_name="listed_cinemas", to="cinema.town"
+            ),
+        ),
+        migrations.AddField(
+            model_name="cinema",
+            name="upstream_id",
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name="cinema",
+            name="upstream_zone",
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+    ]
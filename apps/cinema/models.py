@@ -1,4 +1,11 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
 from django.db import models
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
 
 
 class Town(models.Model):
@@ -31,3 +38,50 @@ class Cinema(models.Model):
         on_delete=models.CASCADE,
         related_name="cinemas",
     )
+    version = models.PositiveIntegerField(default=0)
+    upstream_id = models.CharField(max_length=255, blank=True, null=True)
+    upstream_zone = models.CharField(max_length=255, blank=True, null=True)
+    towns = models.ManyToManyField(Town, related_name="listed_cinemas", blank=True)
+
+
+class RegistryVersion(models.Model):
+    version = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @classmethod
+    def bump(cls):
+        if not cls.objects.filter(id=1).update(version=F("version") + 1):
+            cls.objects.create(id=1, version=1)
+
+
+registry_signals_paused: ContextVar[bool] = ContextVar(
+    "registry_signals_paused", default=False
+)
+
+
+@contextmanager
+def pause_registry_signals() -> Iterator[None]:
+    token = registry_signals_paused.set(True)
+    try:
+        yield
+    finally:
+        registry_signals_paused.reset(token)
+
+
+class Snapshot(models.Model):
+    created_at = models.DateTimeField(auto_now_add=True)
+    checked_at = models.DateTimeField(auto_now=True)
+    duration = models.FloatField(default=0)
+    showings = models.JSONField(default=dict)
+    failures = models.JSONField(default=dict)
+    cinema_versions = models.JSONField(default=dict)
+
+
+@receiver(post_save, sender=Town)
+@receiver(post_delete, sender=Town)
+@receiver(post_save, sender=Cinema)
+@receiver(post_delete, sender=Cinema)
+@receiver(m2m_changed, sender=Cinema.towns.through)
+def bump_registry_version(sender, action: str = "post", **kwargs):
+    if action.startswith("post") and not registry_signals_paused.get():
+        RegistryVersion.bump()
@@ -0,0 +1,361 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.db import DatabaseError, transaction
+
+from apps.cinema.constants import cinehoyts as cinehoyts_constants
+from apps.cinema.constants import cinemark as cinemark_constants
+from apps.cinema.loops import LoopLock
+from apps.cinema.models import Cinema, RegistryVersion, Town, pause_registry_signals
+from cinema_showings_bot.settings import (
+    CINEHOYTS_HOST,
+    CINEMARK_HOST,
+    REGISTRY_POLL_INTERVAL,
+)
+
+CINEHOYTS = "cinehoyts"
+CINEMARK = "cinemark"
+CHAIN_NAMES = {CINEHOYTS: Cinema.CINEHOYTS, CINEMARK: Cinema.CINEMARK}
+CHAINS = {chain_name: chain for chain, chain_name in CHAIN_NAMES.items()}
+
+CinemaRecord = Mapping[str, Any]
+Membership = Tuple[str, str, str]
+Catalogue = Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Membership]]
+ChainZones = Tuple[List[Dict[str, Any]], Iterable[Tuple[str, Dict[str, Any]]]]
+
+
+@dataclass(frozen=True)
+class RegistryState:
+    cinemas: Mapping[str, Mapping[str, CinemaRecord]] = field(default_factory=dict)
+    chain_cinemas: Mapping[str, Tuple[CinemaRecord, ...]] = field(default_factory=dict)
+    upstream_zones: Mapping[str, Mapping[str, Tuple[CinemaRecord, ...]]] = field(
+        default_factory=dict
+    )
+    zones: Mapping[str, Mapping[str, Tuple[CinemaRecord, ...]]] = field(
+        default_factory=dict
+    )
+    cinema_chains: Mapping[str, str] = field(default_factory=dict)
+    zone_tags: FrozenSet[str] = frozenset()
+    sorted_cinema_tags: Tuple[str, ...] = ()
+    sorted_zone_tags: Tuple[str, ...] = ()
+
+
+def _get_link(chain: str, zone: str, cinema_id: Any) -> str:
+    if chain == CINEHOYTS:
+        return f"{CINEHOYTS_HOST}/cartelera/{zone}/{cinema_id}"
+    return f"{CINEMARK_HOST}vista/data/billboard?cinema_id={cinema_id}"
+
+
+def _get_constant_chains() -> Dict[str, ChainZones]:
+    return {
+        CINEHOYTS: (
+            cinehoyts_constants.CINEMA_ZONES,
+            cinehoyts_constants.CINEMAS.items(),
+        ),
+        CINEMARK: (
+            cinemark_constants.CINEMA_ZONES,
+            [
+                (cinema_zone["tag"], cinema_zone)
+                for cinema_zone in cinemark_constants.CINEMA_MACROZONES
+            ],
+        ),
+    }
+
+
+def get_constant_catalogue() -> Catalogue:
+    towns: Dict[str, Dict[str, Any]] = {}
+    cinemas = []
+    memberships = []
+    for chain, (cinema_zones, macrozones) in _get_constant_chains().items():
+        cinema_macrozones = {}
+        for zone, macrozone in macrozones:
+            towns.setdefault(
+                macrozone["tag"],
+                {
+                    "name": macrozone["tag"],
+                    "city": None,
+                    "zone": macrozone["tag"],
+                    "region": None,
+                },
+            )
+            for cinema in macrozone["list"]:
+                if cinema["tag"] in cinema_macrozones:
+                    continue
+                cinema_macrozones[cinema["tag"]] = macrozone["tag"]
+                cinemas.append(
+                    {
+                        "chain": chain,
+                        "tag": cinema["tag"],
+                        "name": cinema["name"],
+                        "id": cinema["id"],
+                        "zone": zone,
+                        "town": macrozone["tag"],
+                        "link": _get_link(chain, zone, cinema["id"]),
+                    }
+                )
+        listed_zones = set()
+        for cinema_zone in cinema_zones:
+            if cinema_zone["tag"] in listed_zones:
+                continue
+            listed_zones.add(cinema_zone["tag"])
+            zone_macrozones = {
+                cinema_macrozones[cinema["tag"]]
+                for cinema in cinema_zone["list"]
+                if cinema["tag"] in cinema_macrozones
+            }
+            if len(zone_macrozones) > 1:
+                towns.setdefault(
+                    cinema_zone["tag"],
+                    {"name": cinema_zone["tag"], "region": cinema_zone["tag"]},
+                )
+                for macrozone in zone_macrozones:
+                    towns[macrozone]["region"] = (
+                        towns[macrozone]["region"] or cinema_zone["tag"]
+                    )
+            else:
+                towns.setdefault(
+                    cinema_zone["tag"],
+                    {
+                        "name": cinema_zone["tag"],
+                        "city": cinema_zone["tag"],
+                        "zone": next(iter(zone_macrozones), None),
+                    },
+                )
+            memberships += [
+                (chain, cinema_zone["tag"], cinema["tag"])
+                for cinema in cinema_zone["list"]
+            ]
+    return list(towns.values()), cinemas, memberships
+
+
+def _get_upstream_id(chain: str, upstream_id: Optional[str]) -> Any:
+    if chain == CINEMARK and upstream_id and upstream_id.isdigit():
+        return int(upstream_id)
+    return upstream_id
+
+
+def get_database_catalogue() -> Optional[Tuple[int, Catalogue]]:
+    version = RegistryVersion.objects.values_list("version", flat=True).first()
+    if version is None:
+        return None
+    towns = list(Town.objects.order_by("id").values("name", "city", "zone", "region"))
+    cinemas = [
+        {
+            "chain": CHAINS[chain],
+            "tag": tag,
+            "name": name,
+            "id": _get_upstream_id(CHAINS[chain], upstream_id),
+            "zone": zone,
+            "town": town,
+            "link": link,
+        }
+        for chain, tag, name, upstream_id, zone, town, link in Cinema.objects.filter(
+            chain__in=CHAINS
+        )
+        .order_by("id")
+        .values_list(
+            "chain",
+            "keyword",
+            "name",
+            "upstream_id",
+            "upstream_zone",
+            "town__name",
+            "link",
+        )
+    ]
+    memberships = [
+        (CHAINS[chain], town, tag)
+        for chain, town, tag in Cinema.towns.through.objects.filter(
+            cinema__chain__in=CHAINS
+        )
+        .order_by("id")
+        .values_list("cinema__chain", "town__name", "cinema__keyword")
+    ]
+    return version, (towns, cinemas, memberships)
+
+
+def seed_registry(force: bool = False) -> bool:
+    if not force and RegistryVersion.objects.exists():
+        return False
+    towns, cinemas, memberships = get_constant_catalogue()
+    # Every row write would bump the version through the model signals, so
+    # the whole seed is published as a single bump instead.
+    with transaction.atomic(), pause_registry_signals():
+        town_ids = {
+            town["name"]: Town.objects.update_or_create(
+                name=town["name"], defaults=town
+            )[0].id
+            for town in towns
+        }
+        cinema_ids = {
+            (cinema["chain"], cinema["tag"]): Cinema.objects.update_or_create(
+                name=cinema["name"],
+                defaults={
+                    "chain": CHAIN_NAMES[cinema["chain"]],
+                    "keyword": cinema["tag"],
+                    "link": cinema["link"],
+                    "upstream_id": str(cinema["id"]),
+                    "upstream_zone": cinema["zone"],
+                    "town_id": town_ids[cinema["town"]],
+                },
+            )[0].id
+            for cinema in cinemas
+        }
+        CinemaTown = Cinema.towns.through
+        CinemaTown.objects.filter(cinema_id__in=cinema_ids.values()).delete()
+        CinemaTown.objects.bulk_create(
+            [
+                CinemaTown(
+                    cinema_id=cinema_ids[(chain, cinema_tag)], town_id=town_ids[town]
+                )
+                for chain, town, cinema_tag in memberships
+            ]
+        )
+        Town.objects.exclude(name__in=town_ids).filter(
+            cinemas__isnull=True, listed_cinemas__isnull=True
+        ).delete()
+        RegistryVersion.bump()
+    return True
+
+
+def _build_state(catalogue: Catalogue) -> RegistryState:
+    towns, cinema_rows, memberships = catalogue
+    cinemas: Dict[str, Dict[str, CinemaRecord]] = {}
+    chain_cinemas: Dict[str, List[CinemaRecord]] = {}
+    upstream_zones: Dict[str, Dict[str, List[CinemaRecord]]] = {}
+    cinema_chains: Dict[str, str] = {}
+    for cinema in cinema_rows:
+        chain_records = cinemas.setdefault(cinema["chain"], {})
+        if cinema["tag"] in chain_records:
+            continue
+        record = MappingProxyType(
+            {
+                "tag": cinema["tag"],
+                "name": cinema["name"],
+                "id": cinema["id"],
+                "chain": cinema["chain"],
+                "zone": cinema["zone"],
+                "town": cinema["town"],
+            }
+        )
+        chain_records[cinema["tag"]] = record
+        chain_cinemas.setdefault(cinema["chain"], []).append(record)
+        upstream_zones.setdefault(cinema["chain"], {}).setdefault(
+            cinema["zone"], []
+        ).append(record)
+        cinema_chains.setdefault(cinema["tag"], cinema["chain"])
+    zones: Dict[str, Dict[str, List[CinemaRecord]]] = {}
+    for chain, town, cinema_tag in memberships:
+        record = cinemas.get(chain, {}).get(cinema_tag)
+        if record:
+            zones.setdefault(chain, {}).setdefault(town, []).append(record)
+    zone_tags = frozenset(town["name"] for town in towns)
+    return RegistryState(
+        cinemas=cinemas,
+        chain_cinemas={
+            chain: tuple(records) for chain, records in chain_cinemas.items()
+        },
+        upstream_zones={
+            chain: {zone: tuple(records) for zone, records in chain_zones.items()}
+            for chain, chain_zones in upstream_zones.items()
+        },
+        zones={
+            chain: {zone: tuple(records) for zone, records in chain_zones.items()}
+            for chain, chain_zones in zones.items()
+        },
+        cinema_chains=cinema_chains,
+        zone_tags=zone_tags,
+        sorted_cinema_tags=tuple(sorted(cinema_chains)),
+        sorted_zone_tags=tuple(sorted(zone_tags)),
+    )
+
+
+def _load_catalogue() -> Tuple[Optional[int], Catalogue]:
+    try:
+        loaded_catalogue = get_database_catalogue()
+    except DatabaseError:
+        loaded_catalogue = None
+    if loaded_catalogue is None:
+        return None, get_constant_catalogue()
+    return loaded_catalogue
+
+
+def _load_startup_catalogue() -> Tuple[Optional[int], Catalogue]:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return _load_catalogue()
+    # Reading the database here would block the loop, so the built-in catalogue
+    # answers until refresh() loads the stored one in a worker thread.
+    return None, get_constant_catalogue()
+
+
+class CinemaRegistry:
+    def __init__(self):
+        self.state: Optional[RegistryState] = None
+        self.version: Optional[int] = None
+        self.checked_at = 0.0
+        self.lock = LoopLock()
+
+    def get_state(self) -> RegistryState:
+        if self.state is None:
+            self.version, catalogue = _load_startup_catalogue()
+            self.state = _build_state(catalogue)
+            self.checked_at = time.monotonic() if self.version is not None else 0.0
+        return self.state
+
+    async def refresh(self):
+        async with self.lock:
+            if (
+                self.state is not None
+                and time.monotonic() - self.checked_at < REGISTRY_POLL_INTERVAL
+            ):
+                return
+            self.checked_at = time.monotonic()
+            try:
+                version = await sync_to_async(
+                    RegistryVersion.objects.values_list("version", flat=True).first
+                )()
+            except DatabaseError:
+                version = None
+            if self.state is not None and version == self.version:
+                return
+            self.version, catalogue = await sync_to_async(_load_catalogue)()
+            self.state = _build_state(catalogue)
+
+    def get_cinema(self, chain: str, tag: str) -> Optional[CinemaRecord]:
+        return self.get_state().cinemas.get(chain, {}).get(tag)
+
+    def get_chain(self, tag: str) -> Optional[str]:
+        return self.get_state().cinema_chains.get(tag)
+
+    def get_zone(self, chain: str, tag: str) -> Optional[str]:
+        cinema = self.get_cinema(chain, tag)
+        return cinema["zone"] if cinema else None
+
+    def get_chain_cinemas(self, chain: str) -> Tuple[CinemaRecord, ...]:
+        return self.get_state().chain_cinemas.get(chain, ())
+
+    def get_upstream_zones(self, chain: str) -> Mapping[str, Tuple[CinemaRecord, ...]]:
+        return self.get_state().upstream_zones.get(chain, {})
+
+    def get_zone_cinemas(self, chain: str, zone: str) -> Tuple[CinemaRecord, ...]:
+        return self.get_state().zones.get(chain, {}).get(zone, ())
+
+    def is_zone(self, tag: str, chain: Optional[str] = None) -> bool:
+        if chain:
+            return tag in self.get_state().zones.get(chain, {})
+        return tag in self.get_state().zone_tags
+
+    def get_sorted_cinema_tags(self) -> Tuple[str, ...]:
+        return self.get_state().sorted_cinema_tags
+
+    def get_sorted_zone_tags(self) -> Tuple[str, ...]:
+        return self.get_state().sorted_zone_tags
+
+
+registry = CinemaRegistry()
@@ -0,0 +1,105 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from apps.cinema.registry import CINEHOYTS, CINEMARK
+from cinema_showings_bot.settings import (
+    CINEHOYTS_BUDGET,
+    CINEMA_BUDGET,
+    CINEMARK_BUDGET,
+    COMMAND_BUDGET,
+)
+
+T = TypeVar("T")
+
+SKIPPED_TIMEOUT = "timeout"
+SKIPPED_ERROR = "error"
+
+Skipped = Tuple[str, Hashable]
+
+
+class CommandBudget:
+    def __init__(
+        self,
+        timeout: float,
+        chain_timeouts: Dict[str, float],
+        cinema_timeout: float,
+    ):
+        self.started_at = time.monotonic()
+        self.expires_at = self.started_at + timeout
+        self.chain_expires_at = {
+            chain: self.started_at + chain_timeout
+            for chain, chain_timeout in chain_timeouts.items()
+        }
+        self.cinema_timeout = cinema_timeout
+        self.skipped: Dict[str, List[Skipped]] = {
+            SKIPPED_TIMEOUT: [],
+            SKIPPED_ERROR: [],
+        }
+
+    def get_timeout(self, chain: str) -> float:
+        expires_at = min(
+            self.expires_at, self.chain_expires_at.get(chain, self.expires_at)
+        )
+        return max(0.0, min(expires_at - time.monotonic(), self.cinema_timeout))
+
+    def skip(self, reason: str, chain: str, key: Hashable):
+        if (chain, key) not in self.skipped[reason]:
+            self.skipped[reason].append((chain, key))
+
+
+current_budget: ContextVar[Optional[CommandBudget]] = ContextVar(
+    "current_budget", default=None
+)
+
+
+@contextmanager
+def command_budget(timeout: float = COMMAND_BUDGET) -> Iterator[CommandBudget]:
+    budget = CommandBudget(
+        timeout,
+        {CINEHOYTS: CINEHOYTS_BUDGET, CINEMARK: CINEMARK_BUDGET},
+        CINEMA_BUDGET,
+    )
+    token = current_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        current_budget.reset(token)
+
+
+def _retrieve_exception(task: asyncio.Future):
+    if not task.cancelled():
+        task.exception()
+
+
+async def fetch_within_budget(
+    chain: str, key: Hashable, fetch: Callable[[], Awaitable[T]], default: T
+) -> T:
+    budget = current_budget.get()
+    try:
+        if budget is None:
+            return await fetch()
+        # The fetch keeps running past the deadline so a late response still
+        # lands in the cache for the next command.
+        task = asyncio.ensure_future(fetch())
+        task.add_done_callback(_retrieve_exception)
+        return await asyncio.wait_for(asyncio.shield(task), budget.get_timeout(chain))
+    except Exception as error:
+        if budget:
+            if isinstance(error, asyncio.TimeoutError):
+                budget.skip(SKIPPED_TIMEOUT, chain, key)
+            else:
+                budget.skip(SKIPPED_ERROR, chain, key)
+        return default
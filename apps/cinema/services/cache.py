@@ -0,0 +1,89 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+from cinema_showings_bot.settings import (
+    SHOWINGS_CACHE_MAX_ENTRIES,
+    SHOWINGS_CACHE_STALE_TTL,
+    SHOWINGS_CACHE_TTL,
+)
+
+
+class ResponseCache:
+    def __init__(self, ttl: float, stale_ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self.refreshing: Dict[Hashable, asyncio.Task] = {}
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "stale": 0,
+            "refreshes": 0,
+            "refresh_errors": 0,
+            "evictions": 0,
+        }
+
+    def set(self, key: Hashable, value: Any):
+        self.entries[key] = (value, time.monotonic())
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def invalidate(self, key: Hashable):
+        self.entries.pop(key, None)
+
+    def clear(self):
+        self.entries.clear()
+
+    async def _refresh(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]):
+        try:
+            self.set(key, await fetch())
+            self.stats["refreshes"] += 1
+        except Exception:
+            self.stats["refresh_errors"] += 1
+        finally:
+            self.refreshing.pop(key, None)
+
+    async def get_or_fetch(
+        self, key: Hashable, fetch: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        entry = self.entries.get(key)
+        if entry:
+            value, stored_at = entry
+            age = time.monotonic() - stored_at
+            if age < self.ttl:
+                self.stats["hits"] += 1
+                self.entries.move_to_end(key)
+                return value
+            if age < self.ttl + self.stale_ttl:
+                self.stats["stale"] += 1
+                self.entries.move_to_end(key)
+                if key not in self.refreshing:
+                    self.refreshing[key] = asyncio.create_task(
+                        self._refresh(key, fetch)
+                    )
+                return value
+        self.stats["misses"] += 1
+        value = await fetch()
+        self.set(key, value)
+        return value
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats["entries"] = len(self.entries)
+        lookups = stats["hits"] + stats["misses"] + stats["stale"]
+        stats["hit_ratio"] = (
+            (stats["hits"] + stats["stale"]) / lookups if lookups else 0.0
+        )
+        return stats
+
+
+showings_cache = ResponseCache(
+    ttl=SHOWINGS_CACHE_TTL,
+    stale_ttl=SHOWINGS_CACHE_STALE_TTL,
+    max_entries=SHOWINGS_CACHE_MAX_ENTRIES,
+)
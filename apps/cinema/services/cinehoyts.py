@@ -1,46 +1,42 @@
-from typing import Any, Dict, List, Optional, Tuple
-
-import requests
-
-from apps.cinema.constants.cinehoyts import (
-    CINEMA_CITIES,
-    CINEMA_ZONES,
-    CINEMAS,
-    CINEMAS_SANTIAGO,
-    NORTE_Y_CENTRO_DE_CHILE_TAGS,
-    SANTIAGO_CENTRO_TAGS,
-    SANTIAGO_NORTE_Y_PONIENTE_TAGS,
-    SANTIAGO_ORIENTE_TAGS,
-    SANTIAGO_SUR_TAGS,
-    SUR_DE_CHILE_TAGS,
-)
+import asyncio
+from datetime import date
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
 from apps.cinema.dataclasses import Cinema, ShowDate
-from apps.movie.dataclasses import Movie, ShowTime
+from apps.cinema.dates import (
+    date_index,
+    parse_day_month,
+    parse_minutes,
+    parse_time,
+    parse_user_date,
+)
+from apps.cinema.formats import FormatFilter, format_vocabulary
+from apps.cinema.registry import CHAIN_NAMES, CINEHOYTS, registry
+from apps.cinema.services.budgets import fetch_within_budget
+from apps.cinema.services.cache import showings_cache
+from apps.cinema.services.conditional import conditional_fetcher
+from apps.cinema.services.sessions import showtimes_cache
+from apps.cinema.services.singleflight import upstream_flights
+from apps.cinema.services.streams import iter_completed
+from apps.cinema.snapshots import snapshot_store
+from apps.movie.dataclasses import Movie, Session, ShowTimes
+from apps.movie.search import MovieMatch
+from cinema_showings_bot.settings import CINEHOYTS_HOST
 
-CINEHOYTS_HOST = "https://cinepolischile.cl"
 
+def _get_cinemas_from_zone(zone_name: str) -> List[Dict[str, Any]]:
+    return registry.get_zone_cinemas(CINEHOYTS, zone_name)
 
-def _get_cinemas_from_zone(zone_name: str) -> List[str]:
-    for cinema_zone in CINEMA_ZONES:
-        if zone_name == cinema_zone["tag"]:
-            return cinema_zone["list"]
-    return []
+
+def get_response_cinemas(zone: str) -> List[str]:
+    return [
+        cinema["name"]
+        for cinema in registry.get_upstream_zones(CINEHOYTS).get(zone, ())
+    ]
 
 
 def _get_zone_by_cinema(cinema: str) -> Optional[str]:
-    if cinema in NORTE_Y_CENTRO_DE_CHILE_TAGS:
-        return "norte-y-centro-de-chile"
-    elif cinema in SANTIAGO_CENTRO_TAGS:
-        return "santiago-centro"
-    elif cinema in SANTIAGO_ORIENTE_TAGS:
-        return "santiago-oriente"
-    elif cinema in SANTIAGO_NORTE_Y_PONIENTE_TAGS:
-        return "santiago-poniente-y-norte"
-    elif cinema in SANTIAGO_SUR_TAGS:
-        return "santiago-sur"
-    elif cinema in SUR_DE_CHILE_TAGS:
-        return "sur-de-chile"
-    return None
+    return registry.get_zone(CINEHOYTS, cinema)
 
 
 def is_chain(cinema: str) -> bool:
@@ -48,46 +44,56 @@ def is_chain(cinema: str) -> bool:
     return zone is not None
 
 
-def _get_showings_response_by_zone(
+async def fetch_showings_by_zone(zone: str) -> Tuple[List[Dict[str, Any]], bool]:
+    payload = {"claveCiudad": zone, "esVIP": False}
+    clean_showings, changed = await conditional_fetcher.fetch_json(
+        ("cinehoyts", zone),
+        "POST",
+        f"{CINEHOYTS_HOST}/Cartelera.aspx/GetNowPlayingByCity",
+        payload,
+    )
+    return clean_showings["d"]["Cinemas"], changed
+
+
+async def _fetch_showings_by_zone(zone: str) -> List[Dict[str, Any]]:
+    zone_showings, _ = await fetch_showings_by_zone(zone)
+    return zone_showings
+
+
+async def _get_showings_response_by_zone(
     zone: str = "santiago-oriente",
 ) -> List[Dict[str, Any]]:
-    try:
-        payload = {"claveCiudad": zone, "esVIP": False}
-        showings = requests.post(
-            f"{CINEHOYTS_HOST}/Cartelera.aspx/GetNowPlayingByCity", json=payload
-        )
-        print(f"CINEHOYTS RESPONSE: {showings}")
-        clean_showings = showings.json()
-        return clean_showings["d"]["Cinemas"]
-    except Exception:
-        return []
+    snapshot_showings = await snapshot_store.get_showings("cinehoyts", zone)
+    if snapshot_showings is not None:
+        return snapshot_showings
+    key = ("cinehoyts", zone)
+    return await fetch_within_budget(
+        CINEHOYTS,
+        zone,
+        lambda: showings_cache.get_or_fetch(
+            key, lambda: upstream_flights.do(key, lambda: _fetch_showings_by_zone(zone))
+        ),
+        [],
+    )
 
 
 def _get_cinemas_by_zone(zone: str) -> List[Dict[str, Any]]:
-    for cinema_zone in CINEMA_ZONES:
-        if cinema_zone["tag"] == zone:
-            return cinema_zone["list"]
-    return []
+    return registry.get_zone_cinemas(CINEHOYTS, zone)
 
 
 def _get_only_showings_from_cinemas(
     cinema_showings: List[Dict[str, Any]], cinemas: List[Dict[str, Any]]
 ) -> List[Dict[str, Any]]:
-    reduced_cinema_showings = []
-    for cinema_showing in cinema_showings:
-        for cinema in cinemas:
-            if cinema_showing["Key"] == cinema["id"]:
-                reduced_cinema_showings.append(cinema_showing)
-    return reduced_cinema_showings
+    cinema_ids = {cinema["id"] for cinema in cinemas}
+    return [
+        cinema_showing
+        for cinema_showing in cinema_showings
+        if cinema_showing["Key"] in cinema_ids
+    ]
 
 
 def get_cinema_by_cinema_key(cinema_name: str) -> Optional[Dict[str, Any]]:
-    for zone in CINEMA_ZONES:
-        cinemas_in_zone = zone["list"]
-        for cinema in cinemas_in_zone:
-            if cinema_name == cinema["tag"]:
-                return cinema
-    return None
+    return registry.get_cinema(CINEHOYTS, cinema_name)
 
 
 def get_cinema_by_cinemas_and_cinema_key(
@@ -99,22 +105,21 @@ def get_cinema_by_cinemas_and_cinema_key(
     return {}
 
 
+def _get_showtime_date(showtime_date: Dict[str, Any]) -> Optional[date]:
+    return parse_day_month(showtime_date["ShowtimeDate"])
+
+
 def _get_showtimes_by_date(cinemas: Dict[str, Any], date_name: str) -> Dict[str, Any]:
-    for date in cinemas["Dates"]:
-        formatted_showing_date = date["ShowtimeDate"].replace(" ", "-")
-        day, month = formatted_showing_date.split("-")
-        if int(day) < 10 and len(day) == 2:
-            formatted_showing_date = formatted_showing_date[1:]
-        formatted_searched_date = date_name.replace(" ", "-")
-        if formatted_showing_date == formatted_searched_date:
-            return date
-    return {}
+    showtime_dates = date_index.get_items(
+        cinemas["Dates"], _get_showtime_date, parse_user_date(date_name)
+    )
+    return showtime_dates[0] if showtime_dates else {}
 
 
-def _get_movie_showings(movie_list: List[Dict[str, Any]], movie_title="batman") -> Dict:
-    for movie in movie_list:
-        if movie_title in movie["Key"] or movie["Key"] in movie_title:
-            return movie
+def _get_movie_showings(movie_list: List[Dict[str, Any]], movie: MovieMatch) -> Dict:
+    for movie_showings in movie_list:
+        if movie.matches(CHAIN_NAMES[CINEHOYTS], movie_showings["Key"]):
+            return movie_showings
     return {}
 
 
@@ -128,25 +133,33 @@ def _get_formatted_format(format: str):
     return format
 
 
-def _get_showtimes(movie_showings: Dict, format: str = None) -> List[ShowTime]:
-    total_showtimes = []
+def _get_sessions(
+    movie_showings: Dict, format: Optional[FormatFilter]
+) -> Iterator[Session]:
     for formats in movie_showings["Formats"]:
-        showtimes = formats["Showtimes"]
-        format_name = _get_formatted_format(formats["Name"])
-        if format and format not in format_name:
+        show_format = format_vocabulary.get_upstream_format(
+            CINEHOYTS, formats["Name"], _get_formatted_format
+        )
+        if format and not format.matches(show_format):
             continue
-        for show in showtimes:
-            showtime = show["Time"]
-            total_showtimes.append(
-                ShowTime(showtime=showtime, format=format_name, seats="")
-            )
-    return total_showtimes
+        for show in formats["Showtimes"]:
+            minutes = parse_minutes(show["Time"])
+            if minutes is not None:
+                yield minutes, show_format, None
+
+
+def _get_showtimes(
+    movie_showings: Dict, format: Optional[FormatFilter] = None
+) -> ShowTimes:
+    return showtimes_cache.get_showtimes(movie_showings, format, _get_sessions)
 
 
-def get_showings(movie: str, date: str, cinema: str, format: str) -> Optional[ShowDate]:
+async def get_showings(
+    movie: Optional[MovieMatch], date: str, cinema: str, format: Optional[FormatFilter]
+) -> Optional[ShowDate]:
     zone = _get_zone_by_cinema(cinema)
     cinema_showings = get_cinema_by_cinemas_and_cinema_key(
-        _get_showings_response_by_zone(zone), cinema
+        await _get_showings_response_by_zone(zone), cinema
     )
     if not cinema_showings:
         return None
@@ -158,17 +171,17 @@ def get_showings(movie: str, date: str, cinema: str, format: str) -> Optional[Sh
     movie_title = movie_showings["Title"]
     showdate = ShowDate(
         date=showtime_date_name,
-        cinemas=[
+        cinemas=(
             Cinema(
                 name=cinema_name,
-                movies=[
+                movies=(
                     Movie(
                         title=movie_title,
                         showtimes=_get_showtimes(movie_showings, format),
-                    )
-                ],
-            )
-        ],
+                    ),
+                ),
+            ),
+        ),
     )
     return showdate
 
@@ -177,8 +190,8 @@ def _get_formatted_showings_by_cinema(
     date: str,
     cinema_key: str,
     zone_showings: List[Dict[str, Any]],
-    movie: str,
-    format: str,
+    movie: Optional[MovieMatch],
+    format: Optional[FormatFilter],
 ) -> Optional[Cinema]:
     cinema = get_cinema_by_cinemas_and_cinema_key(zone_showings, cinema_key)
     if not cinema:
@@ -188,53 +201,61 @@ def _get_formatted_showings_by_cinema(
         return None
     movies = []
     for movie_showing in showtime_date["Movies"]:
-        if not movie or (
-            movie in movie_showing["Key"] or movie_showing["Key"] in movie
-        ):
+        if not movie or movie.matches(CHAIN_NAMES[CINEHOYTS], movie_showing["Key"]):
             movies.append(
                 Movie(
                     title=movie_showing["Title"],
                     showtimes=_get_showtimes(movie_showing, format),
                 )
             )
-    cinema_showtimes = Cinema(name=cinema["Name"], movies=movies)
+    cinema_showtimes = Cinema(name=cinema["Name"], movies=tuple(movies))
     return cinema_showtimes
 
 
-def _get_formatted_showings_by_zone(
-    date: str, zone: str, movie: str, format: str
-) -> List[Cinema]:
-    if zone not in CINEMAS:
+async def _get_tagged_showings_by_zone(
+    date: str, zone: str, movie: Optional[MovieMatch], format: Optional[FormatFilter]
+) -> List[Tuple[str, Cinema]]:
+    cinemas_in_zone = registry.get_upstream_zones(CINEHOYTS).get(zone)
+    if not cinemas_in_zone:
         return []
-    zone_showings = _get_showings_response_by_zone(zone)
-    cinemas_in_zone = CINEMAS[zone]
+    zone_showings = await _get_showings_response_by_zone(zone)
     zone_showtimes = []
-    for cinema in cinemas_in_zone["list"]:
+    for cinema in cinemas_in_zone:
         zone_showtime = _get_formatted_showings_by_cinema(
             date, cinema["tag"], zone_showings, movie, format
         )
         if not zone_showtime:
             continue
-        zone_showtimes.append(zone_showtime)
+        zone_showtimes.append((cinema["tag"], zone_showtime))
     return zone_showtimes
 
 
+async def _get_formatted_showings_by_zone(
+    date: str, zone: str, movie: Optional[MovieMatch], format: Optional[FormatFilter]
+) -> List[Cinema]:
+    return [
+        cinema
+        for _, cinema in await _get_tagged_showings_by_zone(date, zone, movie, format)
+    ]
+
+
 def _get_zones(zone_name: str) -> Tuple[List[str], bool]:
-    is_city = False
-    if zone_name == "santiago":
-        zones = CINEMAS_SANTIAGO
-    elif zone_name in CINEMA_CITIES.keys():
-        is_city = True
-        zones = [CINEMA_CITIES[zone_name]]
-    else:
-        zones = [zone_name]
-    return zones, is_city
-
-
-def _get_zone_showings(
+    if zone_name in registry.get_upstream_zones(CINEHOYTS):
+        return [zone_name], False
+    zones = list(
+        dict.fromkeys(
+            cinema["zone"] for cinema in registry.get_zone_cinemas(CINEHOYTS, zone_name)
+        )
+    )
+    if not zones:
+        return [zone_name], False
+    return zones, len(zones) == 1
+
+
+async def _get_zone_showings(
     zone: str, zone_name: str, is_city: bool
 ) -> List[Dict[str, Any]]:
-    zone_showings = _get_showings_response_by_zone(zone)
+    zone_showings = await _get_showings_response_by_zone(zone)
     if is_city:
         zone_showings = _get_only_showings_from_cinemas(
             zone_showings, _get_cinemas_by_zone(zone_name)
@@ -242,35 +263,57 @@ def _get_zone_showings(
     return zone_showings
 
 
-def get_showings_by_zone(
-    movie: str, date: str, zone_name: str, format: str
-) -> List[Cinema]:
+def _iter_zones_showings(zone_name: str) -> AsyncIterator[List[Dict[str, Any]]]:
     zones, is_city = _get_zones(zone_name)
-    cinema_showtimes = []
-    for zone in zones:
-        zone_showings = _get_zone_showings(zone, zone_name, is_city)
-        for cinema in zone_showings:
-            cinema_showtime = _get_formatted_showings_by_cinema(
-                date, cinema["Key"], zone_showings, movie, format
-            )
-            if not cinema_showtime:
-                continue
-            cinema_showtimes.append(cinema_showtime)
-    return cinema_showtimes
+    return iter_completed(
+        _get_zone_showings(zone, zone_name, is_city) for zone in zones
+    )
 
 
-def get_showing_by_date(movie: str, date: str, format: str) -> List[Cinema]:
+def _get_zone_cinemas(
+    zone_showings: List[Dict[str, Any]],
+    date: str,
+    movie: Optional[MovieMatch],
+    format: Optional[FormatFilter],
+) -> List[Cinema]:
     cinema_showtimes = []
-    for zone in CINEMAS:
-        cinema_showtime = _get_formatted_showings_by_zone(date, zone, movie, format)
+    for cinema in zone_showings:
+        cinema_showtime = _get_formatted_showings_by_cinema(
+            date, cinema["Key"], zone_showings, movie, format
+        )
         if not cinema_showtime:
             continue
-        cinema_showtimes += cinema_showtime
+        cinema_showtimes.append(cinema_showtime)
     return cinema_showtimes
 
 
+async def iter_showings_by_zone(
+    movie: Optional[MovieMatch],
+    date: str,
+    zone_name: str,
+    format: Optional[FormatFilter],
+) -> AsyncIterator[Cinema]:
+    async for zone_showings in _iter_zones_showings(zone_name):
+        for cinema_showtime in _get_zone_cinemas(zone_showings, date, movie, format):
+            yield cinema_showtime
+
+
+async def iter_showing_by_date(
+    movie: Optional[MovieMatch], date: str, format: Optional[FormatFilter]
+) -> AsyncIterator[Cinema]:
+    async for zone_showtimes in iter_completed(
+        _get_formatted_showings_by_zone(date, zone, movie, format)
+        for zone in registry.get_upstream_zones(CINEHOYTS)
+    ):
+        for cinema_showtime in zone_showtimes:
+            yield cinema_showtime
+
+
 def _get_showdate_from_showtime_date(
-    showtime_date: Dict[str, Any], movie: str, cinema_name: str, format: str
+    showtime_date: Dict[str, Any],
+    movie: Optional[MovieMatch],
+    cinema_name: str,
+    format: Optional[FormatFilter],
 ) -> Optional[ShowDate]:
     showtime_date_name = showtime_date["ShowtimeDate"]
     showtime_movies = showtime_date["Movies"]
@@ -280,27 +323,29 @@ def _get_showdate_from_showtime_date(
     movie_title = movie_showings["Title"]
     return ShowDate(
         date=showtime_date_name,
-        cinemas=[
+        cinemas=(
             Cinema(
                 name=cinema_name,
-                movies=[
+                movies=(
                     Movie(
                         title=movie_title,
                         showtimes=_get_showtimes(movie_showings, format),
-                    )
-                ],
-            )
-        ],
+                    ),
+                ),
+            ),
+        ),
     )
 
 
-def get_showing_by_cinema(
-    movie: str, cinema: str, format: str = None
+async def get_showing_by_cinema(
+    movie: Optional[MovieMatch], cinema: str, format: Optional[FormatFilter] = None
 ) -> List[ShowDate]:
     zone = _get_zone_by_cinema(cinema)
     cinema_showings = get_cinema_by_cinemas_and_cinema_key(
-        _get_showings_response_by_zone(zone), cinema
+        await _get_showings_response_by_zone(zone), cinema
     )
+    if not cinema_showings:
+        return []
     cinema_name = cinema_showings["Name"]
     cinema_dates = cinema_showings["Dates"]
     total_showings = []
@@ -313,28 +358,34 @@ def get_showing_by_cinema(
     return total_showings
 
 
-def get_showing_by_zone(
-    movie: str, zone_name: str, format: str = None
+def _get_zone_movie_showdates(
+    zone_showings: List[Dict[str, Any]],
+    movie: Optional[MovieMatch],
+    format: Optional[FormatFilter],
 ) -> List[ShowDate]:
-    zones, is_city = _get_zones(zone_name)
     total_showings = []
-    for zone in zones:
-        zone_showings = _get_zone_showings(zone, zone_name, is_city)
-        for cinema_showings in zone_showings:
-            cinema_name = cinema_showings["Name"]
-            cinema_dates = cinema_showings["Dates"]
-            total_showings = []
-            for showtime_date in cinema_dates:
-                showdate = _get_showdate_from_showtime_date(
-                    showtime_date, movie, cinema_name, format
-                )
-                if showdate:
-                    total_showings.append(showdate)
+    for cinema_showings in zone_showings:
+        cinema_name = cinema_showings["Name"]
+        cinema_dates = cinema_showings["Dates"]
+        for showtime_date in cinema_dates:
+            showdate = _get_showdate_from_showtime_date(
+                showtime_date, movie, cinema_name, format
+            )
+            if showdate:
+                total_showings.append(showdate)
     return total_showings
 
 
+async def iter_showing_by_zone(
+    movie: Optional[MovieMatch], zone_name: str, format: Optional[FormatFilter] = None
+) -> AsyncIterator[ShowDate]:
+    async for zone_showings in _iter_zones_showings(zone_name):
+        for showdate in _get_zone_movie_showdates(zone_showings, movie, format):
+            yield showdate
+
+
 def _get_movie_showtimes(
-    showtime_movies: List[Dict[str, Any]], format: str
+    showtime_movies: List[Dict[str, Any]], format: Optional[FormatFilter]
 ) -> List[Movie]:
     movies = []
     for movie_showings in showtime_movies:
@@ -345,11 +396,15 @@ def _get_movie_showtimes(
     return movies
 
 
-def get_cinema_showings(cinema: str, format: str) -> List[ShowDate]:
+async def get_cinema_showings(
+    cinema: str, format: Optional[FormatFilter]
+) -> List[ShowDate]:
     zone = _get_zone_by_cinema(cinema)
     cinema_showings = get_cinema_by_cinemas_and_cinema_key(
-        _get_showings_response_by_zone(zone), cinema
+        await _get_showings_response_by_zone(zone), cinema
     )
+    if not cinema_showings:
+        return []
     cinema_name = cinema_showings["Name"]
     cinema_dates = cinema_showings["Dates"]
     total_showings = []
@@ -359,74 +414,122 @@ def get_cinema_showings(cinema: str, format: str) -> List[ShowDate]:
         total_showings.append(
             ShowDate(
                 date=showtime_date_name,
-                cinemas=[Cinema(name=cinema_name, movies=movies)],
+                cinemas=(Cinema(name=cinema_name, movies=tuple(movies)),),
             )
         )
     return total_showings
 
 
-def get_cinema_showings_by_zone(zone_name: str, format: str) -> List[ShowDate]:
-    zones, is_city = _get_zones(zone_name)
+def _get_zone_showdates(
+    zone_showings: List[Dict[str, Any]], format: Optional[FormatFilter]
+) -> List[ShowDate]:
     total_showings = []
-    for zone in zones:
-        zone_showings = _get_zone_showings(zone, zone_name, is_city)
-        for cinema_showings in zone_showings:
-            cinema_name = cinema_showings["Name"]
-            cinema_dates = cinema_showings["Dates"]
-            for showtime_date in cinema_dates:
-                showtime_date_name = showtime_date["ShowtimeDate"]
-                movies = _get_movie_showtimes(showtime_date["Movies"], format)
-                total_showings.append(
-                    ShowDate(
-                        date=showtime_date_name,
-                        cinemas=[Cinema(name=cinema_name, movies=movies)],
-                    )
+    for cinema_showings in zone_showings:
+        cinema_name = cinema_showings["Name"]
+        cinema_dates = cinema_showings["Dates"]
+        for showtime_date in cinema_dates:
+            showtime_date_name = showtime_date["ShowtimeDate"]
+            movies = _get_movie_showtimes(showtime_date["Movies"], format)
+            total_showings.append(
+                ShowDate(
+                    date=showtime_date_name,
+                    cinemas=(Cinema(name=cinema_name, movies=tuple(movies)),),
                 )
+            )
     return total_showings
 
 
-def get_cinema_showings_by_date(cinema: str, date: str, format: str) -> ShowDate:
+async def iter_cinema_showings_by_zone(
+    zone_name: str, format: Optional[FormatFilter]
+) -> AsyncIterator[ShowDate]:
+    async for zone_showings in _iter_zones_showings(zone_name):
+        for showdate in _get_zone_showdates(zone_showings, format):
+            yield showdate
+
+
+async def get_cinema_showings_by_date(
+    cinema: str, date: str, format: Optional[FormatFilter]
+) -> Optional[ShowDate]:
     zone = _get_zone_by_cinema(cinema)
     cinema_showings = get_cinema_by_cinemas_and_cinema_key(
-        _get_showings_response_by_zone(zone), cinema
+        await _get_showings_response_by_zone(zone), cinema
     )
+    if not cinema_showings:
+        return None
     cinema_name = cinema_showings["Name"]
     showtime_date = _get_showtimes_by_date(cinema_showings, date.replace("-", " "))
     showtime_date_name = showtime_date["ShowtimeDate"]
     movies = _get_movie_showtimes(showtime_date["Movies"], format)
     return ShowDate(
-        date=showtime_date_name, cinemas=([Cinema(name=cinema_name, movies=movies)])
+        date=showtime_date_name,
+        cinemas=(Cinema(name=cinema_name, movies=tuple(movies)),),
     )
 
 
-def get_cinema_showings_by_date_and_zone(
-    zone_name: str, date: str, format: str
+def _get_zone_showdates_by_date(
+    zone_showings: List[Dict[str, Any]], date: str, format: Optional[FormatFilter]
 ) -> List[ShowDate]:
-    zones, is_city = _get_zones(zone_name)
     total_showings = []
-    for zone in zones:
-        zone_showings = _get_zone_showings(zone, zone_name, is_city)
-        for cinema_showing in zone_showings:
-            cinema_name = cinema_showing["Name"]
-            showtime_date = _get_showtimes_by_date(
-                cinema_showing, date.replace("-", " ")
-            )
-            showtime_date_name = showtime_date["ShowtimeDate"]
-            movies = _get_movie_showtimes(showtime_date["Movies"], format)
-            total_showings.append(
-                ShowDate(
-                    date=showtime_date_name,
-                    cinemas=([Cinema(name=cinema_name, movies=movies)]),
-                )
+    for cinema_showing in zone_showings:
+        cinema_name = cinema_showing["Name"]
+        showtime_date = _get_showtimes_by_date(cinema_showing, date.replace("-", " "))
+        showtime_date_name = showtime_date["ShowtimeDate"]
+        movies = _get_movie_showtimes(showtime_date["Movies"], format)
+        total_showings.append(
+            ShowDate(
+                date=showtime_date_name,
+                cinemas=(Cinema(name=cinema_name, movies=tuple(movies)),),
             )
+        )
     return total_showings
 
 
-def get_total(date: str, format: str) -> List[Cinema]:
+async def iter_cinema_showings_by_date_and_zone(
+    zone_name: str, date: str, format: Optional[FormatFilter]
+) -> AsyncIterator[ShowDate]:
+    async for zone_showings in _iter_zones_showings(zone_name):
+        for showdate in _get_zone_showdates_by_date(zone_showings, date, format):
+            yield showdate
+
+
+async def get_total(
+    date: str, format: Optional[FormatFilter]
+) -> List[Tuple[str, Cinema]]:
     cinema_showtimes = []
-    for zone in CINEMAS:
-        cinema_showtime = _get_formatted_showings_by_zone(date, zone, "", format)
+    zones_showtimes = await asyncio.gather(
+        *[
+            _get_tagged_showings_by_zone(date, zone, "", format)
+            for zone in registry.get_upstream_zones(CINEHOYTS)
+        ]
+    )
+    for cinema_showtime in zones_showtimes:
         if not cinema_showtime:
             continue
         cinema_showtimes += cinema_showtime
     return cinema_showtimes
+
+
+def normalize_showings(zone_showings: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    for cinema_showings in zone_showings:
+        for showtime_date in cinema_showings["Dates"]:
+            date = parse_day_month(showtime_date["ShowtimeDate"])
+            if not date:
+                continue
+            for movie_showings in showtime_date["Movies"]:
+                for formats in movie_showings["Formats"]:
+                    format_name = format_vocabulary.get_upstream_format(
+                        CINEHOYTS, formats["Name"], _get_formatted_format
+                    ).name
+                    for show in formats["Showtimes"]:
+                        time = parse_time(show["Time"])
+                        if not time:
+                            continue
+                        yield {
+                            "cinema": cinema_showings["Key"],
+                            "movie_title": movie_showings["Title"],
+                            "movie_key": movie_showings["Key"],
+                            "date": date,
+                            "time": time,
+                            "format": format_name,
+                            "seats": None,
+                        }
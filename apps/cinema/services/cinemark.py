@@ -1,218 +1,249 @@
-from typing import Any, Dict, List, Optional
+import asyncio
+from datetime import date
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
 
-import requests
-
-from apps.cinema.constants.cinemark import (
-    CINEMA_ZONES,
-    CINEMA_ZONES_TAGS,
-    CINEMAS_TAGS,
-    TOTAL_CINEMAS_TAGS,
-    CINEMA_MACROZONES,
-)
 from apps.cinema.dataclasses import Cinema, ShowDate
-from apps.movie.dataclasses import Movie, ShowTime
-
-CINEMARK_HOST = "https://api.cinemark.cl/api/"
-
-month_to_number = {
-    "enero": "01",
-    "febrero": "02",
-    "marzo": "03",
-    "abril": "04",
-    "mayo": "05",
-    "junio": "06",
-    "julio": "07",
-    "agosto": "08",
-    "septiembre": "09",
-    "octubre": "10",
-    "noviembre": "11",
-    "diciembre": "12",
-}
+from apps.cinema.dates import (
+    date_index,
+    parse_iso_date,
+    parse_minutes,
+    parse_time,
+    parse_user_date,
+)
+from apps.cinema.formats import FormatFilter, format_vocabulary
+from apps.cinema.registry import CHAIN_NAMES, CINEMARK, registry
+from apps.cinema.services.budgets import fetch_within_budget
+from apps.cinema.services.cache import showings_cache
+from apps.cinema.services.conditional import conditional_fetcher
+from apps.cinema.services.sessions import showtimes_cache
+from apps.cinema.services.singleflight import upstream_flights
+from apps.cinema.services.streams import iter_completed
+from apps.cinema.snapshots import snapshot_store
+from apps.movie.dataclasses import Movie, Session
+from apps.movie.search import MovieMatch
+from cinema_showings_bot.settings import CINEMARK_HOST
 
 
 def is_chain(cinema: str) -> bool:
-    return cinema in CINEMAS_TAGS or cinema in CINEMA_ZONES_TAGS
+    return registry.get_cinema(CINEMARK, cinema) is not None or registry.is_zone(
+        cinema, CINEMARK
+    )
 
 
 def _get_cinemas_from_zone(zone_name: str) -> List[Dict[str, Any]]:
-    for cinema_zone in CINEMA_ZONES:
-        if zone_name == cinema_zone["tag"]:
-            return cinema_zone["list"]
-    return []
+    return registry.get_zone_cinemas(CINEMARK, zone_name)
 
 
 def get_cinema_by_cinema_key(cinema_name: str) -> Optional[Dict[str, Any]]:
-    for zone in CINEMA_ZONES:
-        cinemas_in_zone = zone["list"]
-        for cinema in cinemas_in_zone:
-            if cinema_name == cinema["tag"]:
-                return cinema
-    return None
+    return registry.get_cinema(CINEMARK, cinema_name)
 
 
-def _get_showings_response_by_zone(
+def get_response_cinemas(cinema_id: int) -> List[str]:
+    return [
+        cinema["name"]
+        for cinema in registry.get_chain_cinemas(CINEMARK)
+        if cinema["id"] == cinema_id
+    ]
+
+
+async def fetch_showings_by_cinema(
+    cinema_id: int,
+) -> Tuple[List[Dict[str, Any]], bool]:
+    return await conditional_fetcher.fetch_json(
+        ("cinemark", cinema_id),
+        "GET",
+        f"{CINEMARK_HOST}/vista/data/billboard?cinema_id={cinema_id}",
+    )
+
+
+async def _fetch_showings_by_cinema(cinema_id: int) -> List[Dict[str, Any]]:
+    dateshows, _ = await fetch_showings_by_cinema(cinema_id)
+    return dateshows
+
+
+async def _get_showings_response_by_zone(
     cinema_id: int = 512,
 ) -> List[Dict[str, Any]]:
-    try:
-        showings = requests.get(
-            f"{CINEMARK_HOST}/vista/data/billboard?cinema_id={cinema_id}"
-        )
-        clean_showings = showings.json()
-        return clean_showings
-    except Exception:
-        return []
-
-
-def _check_date(date: str, dateshow: Dict[str, Any]) -> bool:
-    listed_date = date.split("-")
-    listed_dateshow = dateshow["date"].split("-")
-    month_date = listed_date[1]
-    try:
-        month = int(month_date)
-    except Exception:
-        month = month_to_number[month_date]
-    return int(month) == int(listed_dateshow[1]) and int(listed_date[0]) == int(
-        listed_dateshow[2]
+    snapshot_showings = await snapshot_store.get_showings("cinemark", cinema_id)
+    if snapshot_showings is not None:
+        return snapshot_showings
+    key = ("cinemark", cinema_id)
+    return await fetch_within_budget(
+        CINEMARK,
+        cinema_id,
+        lambda: showings_cache.get_or_fetch(
+            key,
+            lambda: upstream_flights.do(
+                key, lambda: _fetch_showings_by_cinema(cinema_id)
+            ),
+        ),
+        [],
     )
 
 
-def _format_movieshow_title(movie_title: str) -> str:
-    return movie_title.lower().replace(" ", "-")
+def _get_dateshow_date(dateshow: Dict[str, Any]) -> Optional[date]:
+    return parse_iso_date(dateshow["date"])
+
+
+def _get_dateshows(
+    dateshows: List[Dict[str, Any]], date_name: str
+) -> List[Dict[str, Any]]:
+    return date_index.get_items(
+        dateshows, _get_dateshow_date, parse_user_date(date_name)
+    )
 
 
-def _check_similar_titles(movie: str, movie_title: str) -> bool:
-    return movie_title in movie or movie in movie_title
+def _format_movieshow_title(movie_title: str) -> str:
+    return movie_title.lower().replace(" ", "-")
 
 
 def _format_show_format(showformat: str) -> str:
     return showformat.split("(")[1][:-1].replace("DOB", "ESP").replace("SUBT", "SUB")
 
 
-def _get_movie_showtimes(
-    movie_title: str, movie_showing: Dict[str, Any], format: str
-) -> Movie:
-    movie_formats = movie_showing["movie_versions"]
-    showtimes = []
-    for show_format in movie_formats:
-        format_name = _format_show_format(show_format["title"])
-        if format and format not in format_name:
+def _get_sessions(
+    movie_showing: Dict[str, Any], format: Optional[FormatFilter]
+) -> Iterator[Session]:
+    for show_format in movie_showing["movie_versions"]:
+        movie_format = format_vocabulary.get_upstream_format(
+            CINEMARK, show_format["title"], _format_show_format
+        )
+        if format and not format.matches(movie_format):
             continue
         for timeshow in show_format["sessions"]:
-            showtime = timeshow["hour"]
-            showtimes.append(
-                ShowTime(
-                    showtime=showtime[:-3],
-                    format=format_name,
-                    seats=timeshow["seats_available"],
-                )
-            )
-    return Movie(title=movie_title, showtimes=showtimes)
+            minutes = parse_minutes(timeshow["hour"])
+            if minutes is None:
+                continue
+            seats = timeshow["seats_available"]
+            yield minutes, movie_format, int(seats) if seats not in (None, "") else None
+
+
+def _get_movie_showtimes(
+    movie_title: str, movie_showing: Dict[str, Any], format: Optional[FormatFilter]
+) -> Movie:
+    return Movie(
+        title=movie_title,
+        showtimes=showtimes_cache.get_showtimes(movie_showing, format, _get_sessions),
+    )
 
 
 def _get_formatted_movie_showings(
     movie_showings: List[Dict[str, Any]],
-    movie: str,
-    format: str,
+    movie: Optional[MovieMatch],
+    format: Optional[FormatFilter],
 ) -> List[Movie]:
     movies = []
     for movie_showing in movie_showings:
         movie_title = _format_movieshow_title(movie_showing["title"])
-        if movie and not _check_similar_titles(movie, movie_title):
+        if movie and not movie.matches(CHAIN_NAMES[CINEMARK], movie_title):
             continue
         movies.append(_get_movie_showtimes(movie_title, movie_showing, format))
     return movies
 
 
-def get_showings(movie: str, date: str, cinema_name: str, format: str) -> ShowDate:
+async def get_showings(
+    movie: Optional[MovieMatch],
+    date: str,
+    cinema_name: str,
+    format: Optional[FormatFilter],
+) -> ShowDate:
     cinema = get_cinema_by_cinema_key(cinema_name)
-    dateshows = _get_showings_response_by_zone(cinema["id"])
+    dateshows = await _get_showings_response_by_zone(cinema["id"])
     cinemas = []
-    for dateshow in dateshows:
-        is_date = _check_date(date, dateshow)
-        if not is_date:
-            continue
+    for dateshow in _get_dateshows(dateshows, date):
         cinemas.append(
             Cinema(
                 name=cinema["name"],
-                movies=_get_formatted_movie_showings(dateshow["movies"], movie, format),
+                movies=tuple(
+                    _get_formatted_movie_showings(dateshow["movies"], movie, format)
+                ),
             )
         )
-    return ShowDate(date=date, cinemas=cinemas)
+    return ShowDate(date=date, cinemas=tuple(cinemas))
 
 
 def _get_cinemas_by_zone(zone: str) -> List[Dict[str, Any]]:
-    for cinema_zone in CINEMA_ZONES:
-        if cinema_zone["tag"] == zone:
-            return cinema_zone["list"]
-    return []
+    return registry.get_zone_cinemas(CINEMARK, zone)
 
 
-def _get_showings_by_cinema(
-    date: str, cinema: Dict[str, Any], movie: str, format: str
+async def _get_showings_by_cinema(
+    date: str,
+    cinema: Dict[str, Any],
+    movie: Optional[MovieMatch],
+    format: Optional[FormatFilter],
 ) -> List[Cinema]:
-    dateshows = _get_showings_response_by_zone(cinema["id"])
+    dateshows = await _get_showings_response_by_zone(cinema["id"])
     cinemas = []
-    for dateshow in dateshows:
-        is_date = _check_date(date, dateshow)
-        if not is_date:
-            continue
+    for dateshow in _get_dateshows(dateshows, date):
         movies = _get_formatted_movie_showings(dateshow["movies"], movie, format)
         cinemas.append(
             Cinema(
                 name=cinema["name"],
-                movies=movies,
+                movies=tuple(movies),
             )
         )
     return cinemas
 
 
-def get_showings_by_cinema_tags(
-    movie: str, date: str, cinemas: List[Dict[str, Any]], format: str
-):
-    cinemas_showdates = []
-    for cinema in cinemas:
-        cinemas_showdates += _get_showings_by_cinema(date, cinema, movie, format)
-    return cinemas_showdates
+async def iter_showings_by_cinema_tags(
+    movie: Optional[MovieMatch],
+    date: str,
+    cinemas: List[Dict[str, Any]],
+    format: Optional[FormatFilter],
+) -> AsyncIterator[Cinema]:
+    async for cinema_showdates in iter_completed(
+        _get_showings_by_cinema(date, cinema, movie, format) for cinema in cinemas
+    ):
+        for cinema_showdate in cinema_showdates:
+            yield cinema_showdate
 
 
-def get_showings_by_zone(movie: str, date: str, zone: str, format: str) -> List[Cinema]:
-    return get_showings_by_cinema_tags(movie, date, _get_cinemas_by_zone(zone), format)
+def iter_showings_by_zone(
+    movie: Optional[MovieMatch], date: str, zone: str, format: Optional[FormatFilter]
+) -> AsyncIterator[Cinema]:
+    return iter_showings_by_cinema_tags(movie, date, _get_cinemas_by_zone(zone), format)
 
 
-def get_showing_by_date(movie: str, date: str, format: str) -> List[Cinema]:
-    cinemas = []
-    for cinema_macrozone in CINEMA_MACROZONES:
-        cinemas += cinema_macrozone["list"]
-    return get_showings_by_cinema_tags(movie, date, cinemas, format)
+def iter_showing_by_date(
+    movie: Optional[MovieMatch], date: str, format: Optional[FormatFilter]
+) -> AsyncIterator[Cinema]:
+    return iter_showings_by_cinema_tags(
+        movie, date, registry.get_chain_cinemas(CINEMARK), format
+    )
 
 
-def get_showing_by_cinema(
-    movie: str, cinema: Dict[str, Any], format: str = None
+async def get_showing_by_cinema(
+    movie: Optional[MovieMatch],
+    cinema: Dict[str, Any],
+    format: Optional[FormatFilter] = None,
 ) -> List[ShowDate]:
-    dateshows = _get_showings_response_by_zone(cinema["id"])
+    dateshows = await _get_showings_response_by_zone(cinema["id"])
     showdates = []
     for dateshow in dateshows:
         movies = _get_formatted_movie_showings(dateshow["movies"], movie, format)
         showdates.append(
             ShowDate(
                 date=dateshow["date"],
-                cinemas=[Cinema(name=cinema["name"], movies=movies)],
+                cinemas=(Cinema(name=cinema["name"], movies=tuple(movies)),),
             )
         )
     return showdates
 
 
-def get_showing_by_zone(
-    movie: str, zone_name: str, format: str = None
-) -> List[ShowDate]:
-    cinemas = _get_cinemas_from_zone(zone_name)
-    total_showings = []
-    for cinema in cinemas:
-        total_showings += get_showing_by_cinema(movie, cinema, format)
-    return total_showings
+async def iter_showing_by_zone(
+    movie: Optional[MovieMatch], zone_name: str, format: Optional[FormatFilter] = None
+) -> AsyncIterator[ShowDate]:
+    async for cinema_showings in iter_completed(
+        get_showing_by_cinema(movie, cinema, format)
+        for cinema in _get_cinemas_from_zone(zone_name)
+    ):
+        for showdate in cinema_showings:
+            yield showdate
 
 
-def _get_movie_showtimes_for_movie_showings(dateshow: Dict, format: str) -> List[Movie]:
+def _get_movie_showtimes_for_movie_showings(
+    dateshow: Dict, format: Optional[FormatFilter]
+) -> List[Movie]:
     movie_showtimes = []
     for movie_showing in dateshow["movies"]:
         movie_title = _format_movieshow_title(movie_showing["title"])
@@ -220,56 +251,97 @@ def _get_movie_showtimes_for_movie_showings(dateshow: Dict, format: str) -> List
     return movie_showtimes
 
 
-def get_cinema_showings(cinema: Dict[str, Any], format: str) -> List[ShowDate]:
-    dateshows = _get_showings_response_by_zone(cinema["id"])
+async def get_cinema_showings(
+    cinema: Dict[str, Any], format: Optional[FormatFilter]
+) -> List[ShowDate]:
+    dateshows = await _get_showings_response_by_zone(cinema["id"])
     showdates = []
     for dateshow in dateshows:
         movies = _get_movie_showtimes_for_movie_showings(dateshow, format)
         showdates.append(
             ShowDate(
                 date=dateshow["date"],
-                cinemas=[Cinema(name=cinema["name"], movies=movies)],
+                cinemas=(Cinema(name=cinema["name"], movies=tuple(movies)),),
             )
         )
     return showdates
 
 
-def get_cinema_showings_by_zone(zone_name: str, format: str) -> List[ShowDate]:
-    cinemas = _get_cinemas_from_zone(zone_name)
-    total_showings = []
-    for cinema in cinemas:
-        total_showings += get_cinema_showings(cinema, format)
-    return total_showings
+async def iter_cinema_showings_by_zone(
+    zone_name: str, format: Optional[FormatFilter]
+) -> AsyncIterator[ShowDate]:
+    async for cinema_showings in iter_completed(
+        get_cinema_showings(cinema, format)
+        for cinema in _get_cinemas_from_zone(zone_name)
+    ):
+        for showdate in cinema_showings:
+            yield showdate
 
 
-def get_cinema_showings_by_date(
-    cinema: Dict[str, Any], date: str, format: str
-) -> ShowDate:
-    dateshows = _get_showings_response_by_zone(cinema["id"])
+async def get_cinema_showings_by_date(
+    cinema: Dict[str, Any], date: str, format: Optional[FormatFilter]
+) -> Optional[ShowDate]:
+    dateshows = await _get_showings_response_by_zone(cinema["id"])
+    if not dateshows:
+        return None
     movies = []
-    for dateshow in dateshows:
-        is_date = _check_date(date, dateshow)
-        if not is_date:
-            continue
+    for dateshow in _get_dateshows(dateshows, date):
         movies += _get_movie_showtimes_for_movie_showings(dateshow, format)
     return ShowDate(
-        date=dateshows[0]["date"], cinemas=[Cinema(name=cinema["name"], movies=movies)]
+        date=dateshows[0]["date"],
+        cinemas=(Cinema(name=cinema["name"], movies=tuple(movies)),),
     )
 
 
-def get_cinema_showings_by_date_and_zone(
-    zone_name: str, date: str, format: str
-) -> List[ShowDate]:
-    cinemas = _get_cinemas_from_zone(zone_name)
-    total_showings = []
-    for cinema in cinemas:
-        total_showings.append(get_cinema_showings_by_date(cinema, date, format))
-    return total_showings
+def iter_cinema_showings_by_date_and_zone(
+    zone_name: str, date: str, format: Optional[FormatFilter]
+) -> AsyncIterator[ShowDate]:
+    return iter_completed(
+        get_cinema_showings_by_date(cinema, date, format)
+        for cinema in _get_cinemas_from_zone(zone_name)
+    )
 
 
-def get_total(date: str, format: str) -> List[Cinema]:
+async def get_total(
+    date: str, format: Optional[FormatFilter]
+) -> List[Tuple[str, Cinema]]:
+    cinemas = registry.get_chain_cinemas(CINEMARK)
     cinemas_showdates = []
-    for cinema_tag in TOTAL_CINEMAS_TAGS:
-        cinema = get_cinema_by_cinema_key(cinema_tag)
-        cinemas_showdates += _get_showings_by_cinema(date, cinema, "", format)
+    for cinema, cinema_showdates in zip(
+        cinemas,
+        await asyncio.gather(
+            *[_get_showings_by_cinema(date, cinema, "", format) for cinema in cinemas]
+        ),
+    ):
+        cinemas_showdates += [
+            (cinema["tag"], showdate) for showdate in cinema_showdates
+        ]
     return cinemas_showdates
+
+
+def normalize_showings(
+    cinema_tag: str, dateshows: List[Dict[str, Any]]
+) -> Iterator[Dict[str, Any]]:
+    for dateshow in dateshows:
+        date = parse_iso_date(dateshow["date"])
+        if not date:
+            continue
+        for movie_showing in dateshow["movies"]:
+            movie_title = _format_movieshow_title(movie_showing["title"])
+            for show_format in movie_showing["movie_versions"]:
+                format_name = format_vocabulary.get_upstream_format(
+                    CINEMARK, show_format["title"], _format_show_format
+                ).name
+                for timeshow in show_format["sessions"]:
+                    time = parse_time(timeshow["hour"])
+                    if not time:
+                        continue
+                    seats = timeshow["seats_available"]
+                    yield {
+                        "cinema": cinema_tag,
+                        "movie_title": movie_title,
+                        "date": date,
+                        "time": time,
+                        "format": format_name,
+                        "seats": int(seats) if seats not in (None, "") else None,
+                    }
@@ -0,0 +1,71 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from apps.cinema.services.http import request
+
+
+@dataclass
+class SourceState:
+    digest: str
+    value: Any
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class ConditionalFetcher:
+    def __init__(self):
+        self.states: Dict[Hashable, SourceState] = {}
+        self.stats = {"requests": 0, "not_modified": 0, "unchanged": 0, "decoded": 0}
+
+    def _get_headers(self, state: Optional[SourceState]) -> Dict[str, str]:
+        headers = {}
+        if state and state.etag:
+            headers["If-None-Match"] = state.etag
+        if state and state.last_modified:
+            headers["If-Modified-Since"] = state.last_modified
+        return headers
+
+    async def fetch_json(
+        self,
+        key: Hashable,
+        method: str,
+        url: str,
+        payload: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[Any, bool]:
+        state = self.states.get(key)
+        status, headers, body = await request(
+            method, url, payload, self._get_headers(state)
+        )
+        self.stats["requests"] += 1
+        if status == 304 and state:
+            self.stats["not_modified"] += 1
+            return state.value, False
+        if status == 304:
+            # There is no stored body to reuse, so ask again without validators.
+            status, headers, body = await request(method, url, payload)
+            self.stats["requests"] += 1
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        if state and state.digest == digest:
+            self.stats["unchanged"] += 1
+            state.etag = headers.get("ETag", state.etag)
+            state.last_modified = headers.get("Last-Modified", state.last_modified)
+            return state.value, False
+        value = json.loads(body)
+        self.stats["decoded"] += 1
+        self.states[key] = SourceState(
+            digest=digest,
+            value=value,
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified"),
+        )
+        return value, True
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats["skipped"] = stats["not_modified"] + stats["unchanged"]
+        return stats
+
+
+conditional_fetcher = ConditionalFetcher()
@@ -0,0 +1,155 @@
+import asyncio
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import aiohttp
+from yarl import URL
+
+from cinema_showings_bot.settings import (
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_KEEPALIVE_TIMEOUT,
+    HTTP_MAX_CONNECTIONS_PER_HOST,
+    HTTP_READ_TIMEOUT,
+)
+
+try:
+    import brotli  # noqa: F401
+
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+
+class HttpClient:
+    def __init__(self, host: str):
+        self.host = host
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stats = {
+            "requests": 0,
+            "errors": 0,
+            "in_flight": 0,
+            "max_in_flight": 0,
+            "queued": 0,
+            "connections_created": 0,
+            "connections_reused": 0,
+            "connect_seconds": 0.0,
+        }
+
+    def _get_trace_config(self) -> aiohttp.TraceConfig:
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_request_start(session, context, params):
+            self.stats["requests"] += 1
+            self.stats["in_flight"] += 1
+            self.stats["max_in_flight"] = max(
+                self.stats["max_in_flight"], self.stats["in_flight"]
+            )
+
+        async def on_request_end(session, context, params):
+            self.stats["in_flight"] -= 1
+
+        async def on_request_exception(session, context, params):
+            self.stats["in_flight"] -= 1
+            self.stats["errors"] += 1
+
+        async def on_connection_queued_start(session, context, params):
+            self.stats["queued"] += 1
+
+        async def on_connection_create_start(session, context, params):
+            context.connect_started_at = time.monotonic()
+
+        async def on_connection_create_end(session, context, params):
+            self.stats["connections_created"] += 1
+            self.stats["connect_seconds"] += (
+                time.monotonic() - context.connect_started_at
+            )
+
+        async def on_connection_reuseconn(session, context, params):
+            self.stats["connections_reused"] += 1
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_request_end.append(on_request_end)
+        trace_config.on_request_exception.append(on_request_exception)
+        trace_config.on_connection_queued_start.append(on_connection_queued_start)
+        trace_config.on_connection_create_start.append(on_connection_create_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace_config
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self.session and not self.session.closed and self.loop is loop:
+            return self.session
+        connector = aiohttp.TCPConnector(
+            limit_per_host=HTTP_MAX_CONNECTIONS_PER_HOST,
+            keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=None,
+            sock_connect=HTTP_CONNECT_TIMEOUT,
+            sock_read=HTTP_READ_TIMEOUT,
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=timeout,
+            headers={"Accept-Encoding": ACCEPT_ENCODING},
+            trace_configs=[self._get_trace_config()],
+        )
+        self.loop = loop
+        return self.session
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        payload: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        async with self._get_session().request(
+            method, url, json=payload, headers=headers
+        ) as response:
+            if response.status != 304:
+                response.raise_for_status()
+            return response.status, dict(response.headers), await response.read()
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        connections = stats["connections_created"] + stats["connections_reused"]
+        stats["reuse_ratio"] = (
+            stats["connections_reused"] / connections if connections else 0.0
+        )
+        return stats
+
+    async def close(self):
+        if self.session and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+
+clients: Dict[str, HttpClient] = {}
+
+
+def get_client(url: str) -> HttpClient:
+    host = str(URL(url).origin())
+    if host not in clients:
+        clients[host] = HttpClient(host)
+    return clients[host]
+
+
+def get_pool_stats() -> Dict[str, Dict[str, Any]]:
+    return {host: client.get_stats() for host, client in clients.items()}
+
+
+async def close_clients():
+    for client in clients.values():
+        await client.close()
+
+
+async def request(
+    method: str,
+    url: str,
+    payload: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> Tuple[int, Dict[str, str], bytes]:
+    return await get_client(url).request(method, url, payload, headers)
@@ -0,0 +1,39 @@
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, Optional, Tuple
+
+from apps.cinema.formats import FormatFilter
+from apps.movie.dataclasses import Session, ShowTimes
+
+ShowTimesKey = Tuple[int, Optional[FormatFilter]]
+
+
+class ShowTimesCache:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[ShowTimesKey, Tuple[Any, ShowTimes]]" = OrderedDict()
+
+    def clear(self):
+        self.entries.clear()
+
+    def get_showtimes(
+        self,
+        movie_showings: Any,
+        format: Optional[FormatFilter],
+        get_sessions: Callable[[Any, Optional[FormatFilter]], Iterable[Session]],
+    ) -> ShowTimes:
+        # Like the date index, payload entries are cached by identity, so the
+        # sorted start times a block builds for time windows outlive a request.
+        key = (id(movie_showings), format)
+        entry = self.entries.get(key)
+        if entry is None or entry[0] is not movie_showings:
+            entry = self.entries[key] = (
+                movie_showings,
+                ShowTimes.from_sessions(get_sessions(movie_showings, format)),
+            )
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        self.entries.move_to_end(key)
+        return entry[1]
+
+
+showtimes_cache = ShowTimesCache(max_entries=16384)
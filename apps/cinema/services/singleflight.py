@@ -0,0 +1,32 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    def __init__(self):
+        self.calls: Dict[Hashable, asyncio.Future] = {}
+        self.stats = {"calls": 0, "shared": 0}
+
+    def _forget(self, key: Hashable, call: asyncio.Future):
+        if self.calls.get(key) is call:
+            del self.calls[key]
+
+    async def do(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        self.stats["calls"] += 1
+        call = self.calls.get(key)
+        if call:
+            self.stats["shared"] += 1
+        else:
+            call = asyncio.ensure_future(fetch())
+            call.add_done_callback(lambda done: self._forget(key, done))
+            self.calls[key] = call
+        return await asyncio.shield(call)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats["fetches"] = stats["calls"] - stats["shared"]
+        stats["in_flight"] = len(self.calls)
+        return stats
+
+
+upstream_flights = SingleFlight()
@@ -0,0 +1,44 @@
+import asyncio
+from typing import AsyncIterator, Awaitable, Iterable, TypeVar
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+async def iter_completed(awaitables: Iterable[Awaitable[T]]) -> AsyncIterator[T]:
+    tasks = [asyncio.ensure_future(awaitable) for awaitable in awaitables]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def _drain(iterator: AsyncIterator[T], queue: asyncio.Queue):
+    try:
+        async for item in iterator:
+            await queue.put((item, None))
+    except Exception as error:
+        await queue.put((_DONE, error))
+    else:
+        await queue.put((_DONE, None))
+
+
+async def merge(*iterators: AsyncIterator[T]) -> AsyncIterator[T]:
+    queue: asyncio.Queue = asyncio.Queue()
+    tasks = [asyncio.ensure_future(_drain(iterator, queue)) for iterator in iterators]
+    try:
+        remaining = len(tasks)
+        while remaining:
+            item, error = await queue.get()
+            if error:
+                raise error
+            if item is _DONE:
+                remaining -= 1
+            else:
+                yield item
+    finally:
+        for task in tasks:
+            task.cancel()
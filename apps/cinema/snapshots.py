@@ -0,0 +1,104 @@
+import time
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.db import DatabaseError
+from django.utils import timezone
+
+from apps.cinema.loops import LoopLock
+from apps.cinema.models import Snapshot
+from cinema_showings_bot.settings import (
+    SNAPSHOT_KEEP,
+    SNAPSHOT_MAX_AGE,
+    SNAPSHOT_POLL_INTERVAL,
+)
+
+
+def publish_snapshot(
+    showings: Dict[str, Dict[str, Any]], failures: Dict[str, str], duration: float
+) -> Snapshot:
+    previous_showings = (
+        Snapshot.objects.order_by("-id").values_list("showings", flat=True).first()
+    )
+    for chain, chain_showings in (previous_showings or {}).items():
+        for key, payload in chain_showings.items():
+            showings.setdefault(chain, {}).setdefault(key, payload)
+    snapshot = Snapshot.objects.create(
+        showings=showings, failures=failures, duration=duration
+    )
+    outdated_ids = Snapshot.objects.order_by("-id").values_list("id", flat=True)[
+        SNAPSHOT_KEEP:
+    ]
+    Snapshot.objects.filter(id__in=list(outdated_ids)).delete()
+    return snapshot
+
+
+def touch_snapshot(failures: Dict[str, str], duration: float) -> Optional[Snapshot]:
+    snapshot = Snapshot.objects.order_by("-id").first()
+    if snapshot:
+        snapshot.failures = failures
+        snapshot.duration = duration
+        snapshot.save(update_fields=["failures", "duration", "checked_at"])
+    return snapshot
+
+
+def _get_latest_snapshot_version() -> Optional[int]:
+    min_checked_at = timezone.now() - timedelta(seconds=SNAPSHOT_MAX_AGE)
+    return (
+        Snapshot.objects.filter(checked_at__gte=min_checked_at)
+        .order_by("-id")
+        .values_list("id", flat=True)
+        .first()
+    )
+
+
+def _get_snapshot(version: int) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, int]]:
+    return Snapshot.objects.values_list("showings", "cinema_versions").get(id=version)
+
+
+class SnapshotStore:
+    def __init__(self):
+        self.version: Optional[int] = None
+        self.showings: Dict[str, Dict[str, Any]] = {}
+        self.cinema_versions: Dict[str, int] = {}
+        self.checked_at = 0.0
+        self.lock = LoopLock()
+
+    async def refresh(self):
+        async with self.lock:
+            if time.monotonic() - self.checked_at < SNAPSHOT_POLL_INTERVAL:
+                return
+            self.checked_at = time.monotonic()
+            try:
+                version = await sync_to_async(_get_latest_snapshot_version)()
+                if version is None:
+                    self.clear()
+                elif version != self.version:
+                    showings, cinema_versions = await sync_to_async(_get_snapshot)(
+                        version
+                    )
+                    self.version = version
+                    self.showings = showings
+                    self.cinema_versions = cinema_versions
+            except DatabaseError:
+                self.clear()
+
+    def clear(self):
+        self.version = None
+        self.showings = {}
+        self.cinema_versions = {}
+
+    def get_cinema_version(self, cinema_tag: str) -> Optional[int]:
+        return self.cinema_versions.get(cinema_tag)
+
+    async def has_snapshot(self) -> bool:
+        await self.refresh()
+        return self.version is not None
+
+    async def get_showings(self, chain: str, key: Any) -> Optional[List[Any]]:
+        await self.refresh()
+        return self.showings.get(chain, {}).get(str(key))
+
+
+snapshot_store = SnapshotStore()
@@ -0,0 +1,164 @@
+import asyncio
+import copy
+import hashlib
+import json
+import os
+import random
+from typing import Any, Dict, Optional
+
+import aiohttp
+from aiohttp import web
+
+CINEHOYTS_PATH = "/Cartelera.aspx/GetNowPlayingByCity"
+CINEMARK_PATH = "/vista/data/billboard"
+
+
+def _scale_cinehoyts(payload: Dict[str, Any], scale: int) -> Dict[str, Any]:
+    for cinema_showings in payload["d"]["Cinemas"]:
+        for showtime_date in cinema_showings["Dates"]:
+            movies = showtime_date["Movies"]
+            showtime_date["Movies"] = movies + [
+                dict(
+                    copy.deepcopy(movie_showings),
+                    Key=f"{movie_showings['Key']}-{copy_number}",
+                    Title=f"{movie_showings['Title']} {copy_number}",
+                )
+                for copy_number in range(1, scale)
+                for movie_showings in movies
+            ]
+    return payload
+
+
+def _scale_cinemark(payload: Any, scale: int) -> Any:
+    for dateshow in payload:
+        movies = dateshow["movies"]
+        dateshow["movies"] = movies + [
+            dict(
+                copy.deepcopy(movie_showing),
+                title=f"{movie_showing['title']} {copy_number}",
+            )
+            for copy_number in range(1, scale)
+            for movie_showing in movies
+        ]
+    return payload
+
+
+class StandinServer:
+    def __init__(
+        self,
+        fixtures_dir: str,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        scale: int = 1,
+        cinehoyts_upstream: Optional[str] = None,
+        cinemark_upstream: Optional[str] = None,
+    ):
+        self.fixtures_dir = fixtures_dir
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.scale = scale
+        self.cinehoyts_upstream = cinehoyts_upstream
+        self.cinemark_upstream = cinemark_upstream
+        self.bodies: Dict[str, bytes] = {}
+        self.stats = {"requests": 0, "errors": 0, "not_modified": 0, "missing": 0}
+
+    @property
+    def is_recording(self) -> bool:
+        return bool(self.cinehoyts_upstream or self.cinemark_upstream)
+
+    def _get_fixture_path(self, chain: str, key: str) -> str:
+        return os.path.join(self.fixtures_dir, chain, f"{key}.json")
+
+    def _load_body(self, chain: str, key: str) -> Optional[bytes]:
+        path = self._get_fixture_path(chain, key)
+        if path not in self.bodies:
+            if not os.path.exists(path):
+                return None
+            with open(path, "rb") as fixture:
+                body = fixture.read()
+            if self.scale > 1:
+                scale_payload = (
+                    _scale_cinehoyts if chain == "cinehoyts" else _scale_cinemark
+                )
+                body = json.dumps(scale_payload(json.loads(body), self.scale)).encode()
+            self.bodies[path] = body
+        return self.bodies[path]
+
+    def _save_body(self, chain: str, key: str, body: bytes):
+        path = self._get_fixture_path(chain, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as fixture:
+            fixture.write(body)
+
+    async def _record_body(
+        self, method: str, url: str, payload: Optional[Dict[str, Any]]
+    ) -> bytes:
+        async with aiohttp.ClientSession() as session:
+            async with session.request(method, url, json=payload) as response:
+                response.raise_for_status()
+                return await response.read()
+
+    async def _respond(
+        self,
+        request: web.Request,
+        chain: str,
+        key: str,
+        upstream_url: Optional[str],
+        payload: Optional[Dict[str, Any]] = None,
+    ) -> web.Response:
+        self.stats["requests"] += 1
+        await asyncio.sleep(
+            max(0.0, self.latency + random.uniform(-self.jitter, self.jitter))
+        )
+        if random.random() < self.error_rate:
+            self.stats["errors"] += 1
+            return web.Response(status=503, text="injected error")
+        if upstream_url:
+            body = await self._record_body(request.method, upstream_url, payload)
+            self._save_body(chain, key, body)
+        else:
+            body = self._load_body(chain, key)
+        if body is None:
+            self.stats["missing"] += 1
+            return web.Response(status=404, text=f"no fixture for {chain} {key}")
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        if request.headers.get("If-None-Match") == etag:
+            self.stats["not_modified"] += 1
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(
+            body=body, content_type="application/json", headers={"ETag": etag}
+        )
+
+    async def handle_cinehoyts(self, request: web.Request) -> web.Response:
+        payload = await request.json()
+        upstream_url = (
+            f"{self.cinehoyts_upstream}{CINEHOYTS_PATH}"
+            if self.cinehoyts_upstream
+            else None
+        )
+        return await self._respond(
+            request, "cinehoyts", payload["claveCiudad"], upstream_url, payload
+        )
+
+    async def handle_cinemark(self, request: web.Request) -> web.Response:
+        cinema_id = request.query["cinema_id"]
+        upstream_url = (
+            f"{self.cinemark_upstream}{CINEMARK_PATH}?cinema_id={cinema_id}"
+            if self.cinemark_upstream
+            else None
+        )
+        return await self._respond(request, "cinemark", cinema_id, upstream_url)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        if request.method == "POST" and request.path.endswith(CINEHOYTS_PATH):
+            return await self.handle_cinehoyts(request)
+        if request.method == "GET" and request.path.endswith(CINEMARK_PATH):
+            return await self.handle_cinemark(request)
+        return web.Response(status=404)
+
+    def get_application(self) -> web.Application:
+        application = web.Application()
+        application.router.add_route("*", "/{path:.*}", self.handle)
+        return application
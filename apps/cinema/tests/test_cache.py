@@ -0,0 +1,37 @@
+import asyncio
+
+from django.test import SimpleTestCase
+
+from apps.cinema.services.cache import ResponseCache
+
+
+class Upstream:
+    def __init__(self):
+        self.calls = 0
+
+    async def fetch(self):
+        self.calls += 1
+        return self.calls
+
+
+class ResponseCacheTests(SimpleTestCase):
+    async def test_fresh_entries_are_served_from_the_cache(self):
+        cache, upstream = ResponseCache(ttl=60, stale_ttl=0, max_entries=2), Upstream()
+        self.assertEqual(await cache.get_or_fetch("zone", upstream.fetch), 1)
+        self.assertEqual(await cache.get_or_fetch("zone", upstream.fetch), 1)
+        self.assertEqual(upstream.calls, 1)
+
+    async def test_stale_entries_are_served_while_they_refresh(self):
+        cache, upstream = ResponseCache(ttl=0, stale_ttl=60, max_entries=2), Upstream()
+        await cache.get_or_fetch("zone", upstream.fetch)
+        self.assertEqual(await cache.get_or_fetch("zone", upstream.fetch), 1)
+        await asyncio.gather(*cache.refreshing.values())
+        self.assertEqual(cache.entries["zone"][0], 2)
+        self.assertEqual(cache.get_stats()["refreshes"], 1)
+
+    async def test_least_recently_used_entries_are_evicted(self):
+        cache, upstream = ResponseCache(ttl=60, stale_ttl=0, max_entries=2), Upstream()
+        for key in ("a", "b", "a", "c"):
+            await cache.get_or_fetch(key, upstream.fetch)
+        self.assertEqual(list(cache.entries), ["a", "c"])
+        self.assertEqual(cache.get_stats()["evictions"], 1)
@@ -0,0 +1,54 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from apps.cinema.services.conditional import ConditionalFetcher
+
+URL = "https://example.com/billboard"
+
+
+class FakeUpstream:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.headers = []
+
+    async def __call__(self, method, url, payload=None, headers=None):
+        self.headers.append(headers)
+        return self.responses.pop(0)
+
+
+class ConditionalFetcherTests(SimpleTestCase):
+    async def fetch(self, fetcher: ConditionalFetcher, upstream: FakeUpstream):
+        with mock.patch("apps.cinema.services.conditional.request", upstream):
+            return await fetcher.fetch_json("zone", "GET", URL)
+
+    async def test_not_modified_reuses_the_stored_value(self):
+        fetcher = ConditionalFetcher()
+        upstream = FakeUpstream(
+            (200, {"ETag": '"v1"', "Last-Modified": "Mon"}, b'{"movies": 1}'),
+            (304, {}, b""),
+        )
+        self.assertEqual(await self.fetch(fetcher, upstream), ({"movies": 1}, True))
+        self.assertEqual(await self.fetch(fetcher, upstream), ({"movies": 1}, False))
+        self.assertEqual(
+            upstream.headers[1],
+            {"If-None-Match": '"v1"', "If-Modified-Since": "Mon"},
+        )
+        self.assertEqual(fetcher.get_stats()["not_modified"], 1)
+
+    async def test_not_modified_without_a_stored_value_refetches(self):
+        fetcher = ConditionalFetcher()
+        upstream = FakeUpstream((304, {}, b""), (200, {}, b'{"movies": 2}'))
+        self.assertEqual(await self.fetch(fetcher, upstream), ({"movies": 2}, True))
+        self.assertIsNone(upstream.headers[1])
+        self.assertEqual(fetcher.get_stats()["requests"], 2)
+
+    async def test_identical_bodies_are_not_decoded_again(self):
+        fetcher = ConditionalFetcher()
+        upstream = FakeUpstream(
+            (200, {}, b'{"movies": 3}'), (200, {"ETag": '"v2"'}, b'{"movies": 3}')
+        )
+        await self.fetch(fetcher, upstream)
+        self.assertEqual(await self.fetch(fetcher, upstream), ({"movies": 3}, False))
+        self.assertEqual(fetcher.states["zone"].etag, '"v2"')
+        self.assertEqual(fetcher.get_stats()["decoded"], 1)
@@ -0,0 +1,66 @@
+from datetime import date
+
+from django.test import SimpleTestCase
+
+from apps.cinema.dates import (
+    LAST_MINUTE,
+    TimeWindow,
+    format_user_date,
+    parse_date,
+    parse_time_window,
+    parse_user_date,
+)
+
+
+class UserDateTests(SimpleTestCase):
+    def test_spellings_of_a_day_parse_to_one_date(self):
+        expected = parse_user_date("15-octubre")
+        self.assertEqual((expected.month, expected.day), (10, 15))
+        for value in ("15 octubre", "15/10", "15-10", " 15-OCTUBRE "):
+            with self.subTest(value=value):
+                self.assertEqual(parse_user_date(value), expected)
+
+    def test_iso_dates_are_taken_as_is(self):
+        self.assertEqual(parse_user_date("2023-07-21"), date(2023, 7, 21))
+
+    def test_day_and_month_pick_the_closest_year(self):
+        today = date(2026, 1, 2)
+        self.assertEqual(parse_date("30-diciembre", today), date(2025, 12, 30))
+        self.assertEqual(parse_date("3-enero", today), date(2026, 1, 3))
+        self.assertIsNone(parse_date("29-02", today))
+        self.assertEqual(parse_date("29-02", date(2025, 1, 2)), date(2024, 2, 29))
+
+    def test_unknown_dates_are_none(self):
+        for value in (None, "", "hoy", "15", "15-brumario", "32-10"):
+            with self.subTest(value=value):
+                self.assertIsNone(parse_user_date(value))
+
+    def test_formatted_date_parses_back(self):
+        showing_date = parse_user_date("1/9")
+        self.assertEqual(format_user_date(showing_date), "1-septiembre")
+        self.assertEqual(parse_user_date(format_user_date(showing_date)), showing_date)
+
+
+class TimeWindowTests(SimpleTestCase):
+    def test_windows(self):
+        windows = {
+            "21": TimeWindow(21 * 60, LAST_MINUTE),
+            "18-20": TimeWindow(18 * 60, 20 * 60),
+            "18:30-20:00": TimeWindow(18 * 60 + 30, 20 * 60),
+            "desde-21": TimeWindow(21 * 60, LAST_MINUTE),
+            "hasta-20": TimeWindow(0, 20 * 60),
+        }
+        for value, window in windows.items():
+            with self.subTest(value=value):
+                self.assertEqual(parse_time_window(value), window)
+
+    def test_windows_past_midnight_wrap(self):
+        self.assertEqual(
+            parse_time_window("23-2").get_ranges(),
+            ((23 * 60, LAST_MINUTE), (0, 2 * 60)),
+        )
+
+    def test_unknown_windows_are_none(self):
+        for value in (None, "", "noche", "25-26", "18-tarde"):
+            with self.subTest(value=value):
+                self.assertIsNone(parse_time_window(value))
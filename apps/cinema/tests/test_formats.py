@@ -0,0 +1,90 @@
+from django.test import SimpleTestCase
+
+from apps.cinema.formats import FormatVocabulary
+from apps.cinema.services.cinehoyts import _get_formatted_format
+from apps.cinema.services.cinemark import _format_show_format
+
+CINEHOYTS_FORMATS = (
+    "ESP",
+    "SUBT",
+    "2D DOB",
+    "2D SUBT",
+    "3D DOB",
+    "3D SUBT",
+    "4DX DOB",
+    "4DX 3D DOB",
+    "4DX SUBT",
+    "IMAX SUBT",
+    "MACRO XE DOB",
+)
+CINEMARK_FORMATS = (
+    "BARBIE (2D DOB)",
+    "BARBIE (2D SUBT)",
+    "BARBIE (3D SUBT)",
+    "BARBIE (XD DOB)",
+    "BARBIE (XD 2D SUBT)",
+    "BARBIE (PREMIER SUBT)",
+    "BARBIE (DBOX DOB)",
+)
+FORMAT_NAMES = tuple(
+    dict.fromkeys(
+        [
+            *(_get_formatted_format(name) for name in CINEHOYTS_FORMATS),
+            *(_format_show_format(name) for name in CINEMARK_FORMATS),
+        ]
+    )
+)
+SINGLE_FILTERS = ("2D", "3D", "4D", "XD", "ESP", "SUB", "4DX", "IMAX", "DBOX", "D")
+
+
+def _get_vocabulary() -> FormatVocabulary:
+    vocabulary = FormatVocabulary()
+    for name in FORMAT_NAMES:
+        vocabulary.get_format(name)
+    return vocabulary
+
+
+def _get_matches(vocabulary: FormatVocabulary, format: str):
+    format_filter = vocabulary.get_filter(format)
+    return {
+        show_format.name
+        for show_format in vocabulary.formats
+        if format_filter.matches(show_format)
+    }
+
+
+class FormatFilterTests(SimpleTestCase):
+    def test_single_tokens_match_like_a_substring_test(self):
+        vocabulary = _get_vocabulary()
+        for format in SINGLE_FILTERS:
+            with self.subTest(format=format):
+                self.assertEqual(
+                    _get_matches(vocabulary, format),
+                    {name for name in FORMAT_NAMES if format in name},
+                )
+
+    def test_premium_rooms_keep_their_dimension(self):
+        vocabulary = _get_vocabulary()
+        self.assertIn("4DX 3D ESP", _get_matches(vocabulary, "3D"))
+        self.assertIn("4DX 3D ESP", _get_matches(vocabulary, "4D"))
+        self.assertIn("XD 2D SUB", _get_matches(vocabulary, "XD"))
+        self.assertIn("XD 2D SUB", _get_matches(vocabulary, "2D"))
+
+    def test_token_order_does_not_matter(self):
+        vocabulary = _get_vocabulary()
+        self.assertEqual(
+            _get_matches(vocabulary, "ESP 3D"), _get_matches(vocabulary, "3D ESP")
+        )
+        self.assertEqual(_get_matches(vocabulary, "3D ESP"), {"3D ESP", "4DX 3D ESP"})
+
+    def test_filters_compiled_before_formats_are_seen_agree(self):
+        for format in (*SINGLE_FILTERS, "3D ESP", "MACRO XE"):
+            with self.subTest(format=format):
+                early_vocabulary = FormatVocabulary()
+                format_filter = early_vocabulary.get_filter(format)
+                early_matches = {
+                    name
+                    for name in FORMAT_NAMES
+                    if format_filter.matches(early_vocabulary.get_format(name))
+                }
+                self.assertEqual(early_matches, _get_matches(_get_vocabulary(), format))
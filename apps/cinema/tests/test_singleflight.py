@@ -0,0 +1,58 @@
+import asyncio
+
+from django.test import SimpleTestCase
+
+from apps.cinema.services.singleflight import SingleFlight
+
+
+class SingleFlightTests(SimpleTestCase):
+    async def test_concurrent_calls_share_one_fetch(self):
+        flights, release, fetches = SingleFlight(), asyncio.Event(), []
+
+        async def fetch():
+            fetches.append(1)
+            await release.wait()
+            return "billboard"
+
+        calls = [asyncio.ensure_future(flights.do("zone", fetch)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        self.assertEqual(await asyncio.gather(*calls), ["billboard"] * 3)
+        self.assertEqual(len(fetches), 1)
+        self.assertEqual(
+            flights.get_stats(),
+            {"calls": 3, "shared": 2, "fetches": 1, "in_flight": 0},
+        )
+
+    async def test_cancelled_caller_does_not_cancel_the_fetch(self):
+        flights, release = SingleFlight(), asyncio.Event()
+
+        async def fetch():
+            await release.wait()
+            return "billboard"
+
+        first = asyncio.ensure_future(flights.do("zone", fetch))
+        second = asyncio.ensure_future(flights.do("zone", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+        self.assertEqual(await second, "billboard")
+        with self.assertRaises(asyncio.CancelledError):
+            await first
+
+    async def test_failures_reach_every_caller_and_are_not_kept(self):
+        flights, release = SingleFlight(), asyncio.Event()
+
+        async def fail():
+            await release.wait()
+            raise ConnectionError("upstream down")
+
+        async def fetch():
+            return "billboard"
+
+        calls = [asyncio.ensure_future(flights.do("zone", fail)) for _ in range(2)]
+        await asyncio.sleep(0)
+        release.set()
+        for result in await asyncio.gather(*calls, return_exceptions=True):
+            self.assertIsInstance(result, ConnectionError)
+        self.assertEqual(await flights.do("zone", fetch), "billboard")
@@ -1,10 +1,46 @@
-from difflib import SequenceMatcher
-from typing import List, Optional, Tuple
+import asyncio
+from collections import Counter
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
 
 from apps.cinema.dataclasses import Cinema, ShowDate
+from apps.cinema.dates import format_user_date, parse_time_window, parse_user_date
+from apps.cinema.formats import FormatFilter, format_vocabulary
+from apps.cinema.registry import CHAIN_NAMES, CINEHOYTS, CINEMARK, registry
 from apps.cinema.services import cinehoyts as cinehoyts_services
 from apps.cinema.services import cinemark as cinemark_services
-from apps.discord.constants import CINEMAS, CINEMAS_ZONES
+from apps.cinema.services.budgets import (
+    SKIPPED_ERROR,
+    SKIPPED_TIMEOUT,
+    CommandBudget,
+    Skipped,
+    current_budget,
+)
+from apps.cinema.services.cache import showings_cache
+from apps.cinema.services.conditional import conditional_fetcher
+from apps.cinema.services.http import get_pool_stats
+from apps.cinema.services.singleflight import upstream_flights
+from apps.cinema.services.streams import merge
+from apps.cinema.snapshots import snapshot_store
+from apps.discord.cache import Versions, rendered_cache
+from apps.discord.messages import stream_movie_date_messages
+from apps.movie.search import MovieMatch, get_movie_match
+from apps.movie.showtime_index import showtime_index
+from apps.movie.titles import title_grouper
+
+BREAKDOWNS = ("movie", "format", "cinema", "chain", "zone")
+TOTAL_TITLES = ("PELÍCULAS", "FORMATOS", "CINES", "CADENAS", "ZONAS")
+
+Breakdowns = Dict[str, List[Tuple[str, int]]]
 
 
 def get_chain(cinema: str) -> Optional[str]:
@@ -15,297 +51,424 @@ def get_chain(cinema: str) -> Optional[str]:
     return None
 
 
-def get_showings(movie, date, cinema, format) -> ShowDate:
+async def get_showings(movie, date, cinema, format) -> ShowDate:
     chain = get_chain(cinema)
     if chain == "CINEHOYTS":
-        return cinehoyts_services.get_showings(movie, date, cinema, format)
+        return await cinehoyts_services.get_showings(movie, date, cinema, format)
     elif chain == "CINEMARK":
-        return cinemark_services.get_showings(movie, date, cinema, format)
+        return await cinemark_services.get_showings(movie, date, cinema, format)
 
 
-def get_showings_by_zone(movie, date, cinema, format) -> ShowDate:
-    cinehoyts_cinemas = cinehoyts_services.get_showings_by_zone(
-        movie, date, cinema, format
+def iter_showings_by_zone(movie, date, cinema, format) -> AsyncIterator[Cinema]:
+    return merge(
+        cinehoyts_services.iter_showings_by_zone(movie, date, cinema, format),
+        cinemark_services.iter_showings_by_zone(movie, date, cinema, format),
     )
-    cinemark_cinemas = cinemark_services.get_showings_by_zone(
-        movie, date, cinema, format
-    )
-    return ShowDate(date=date, cinemas=cinehoyts_cinemas + cinemark_cinemas)
 
 
-def get_showing_by_date(movie, date, format) -> ShowDate:
-    cinehoyts_cinemas = cinehoyts_services.get_showing_by_date(movie, date, format)
-    cinemark_cinemas = cinemark_services.get_showing_by_date(movie, date, format)
-    return ShowDate(date=date, cinemas=cinehoyts_cinemas + cinemark_cinemas)
+def iter_showing_by_date(movie, date, format) -> AsyncIterator[Cinema]:
+    return merge(
+        cinehoyts_services.iter_showing_by_date(movie, date, format),
+        cinemark_services.iter_showing_by_date(movie, date, format),
+    )
 
 
-def get_general_showings(
-    movie: str, date: str, cinema: str = None, format: str = None
-) -> Tuple[str, int]:
-    cinema_is_zone = cinema in CINEMAS_ZONES
+async def _get_movie_match(movie: Optional[str]) -> Optional[MovieMatch]:
+    if not movie:
+        return None
+    index = await showtime_index.get_index()
+    return get_movie_match(movie, index.movie_search if index else None)
+
+
+async def _get_data_versions(cinema: Optional[str]) -> Optional[Versions]:
+    if not await snapshot_store.has_snapshot():
+        return None
+    if not cinema:
+        cinema_tags = registry.get_sorted_cinema_tags()
+    elif registry.is_zone(cinema):
+        cinema_tags = [
+            zone_cinema["tag"]
+            for chain in (CINEHOYTS, CINEMARK)
+            for zone_cinema in registry.get_zone_cinemas(chain, cinema)
+        ]
+    else:
+        cinema_tags = [cinema]
+    versions = tuple(
+        snapshot_store.get_cinema_version(cinema_tag) for cinema_tag in cinema_tags
+    )
+    # Cinemas without a version are served live, so their answers can't be keyed.
+    if None in versions:
+        return None
+    return (registry.version, *versions)
+
+
+def _is_complete() -> bool:
+    budget = current_budget.get()
+    return not budget or not any(budget.skipped.values())
+
+
+# Cache keys use the parsed query so spellings of the same date, format or
+# window share one entry; the date is rendered in one spelling for the same reason.
+def _normalize_date(date: Optional[str]) -> Optional[str]:
+    parsed_date = parse_user_date(date)
+    return format_user_date(parsed_date) if parsed_date else date
+
+
+def _normalize_format(format: Optional[str]) -> Optional[str]:
+    return format.strip().upper() if format else None
+
+
+async def _cache_messages(
+    key: Hashable, cinema: Optional[str], messages: AsyncIterator[str]
+) -> AsyncIterator[str]:
+    versions = await _get_data_versions(cinema)
+    cached_messages = rendered_cache.get(key, versions) if versions else None
+    if cached_messages is not None:
+        for message in cached_messages:
+            yield message
+        return
+    rendered_messages = []
+    async for message in messages:
+        rendered_messages.append(message)
+        yield message
+    if versions and _is_complete() and versions == await _get_data_versions(cinema):
+        rendered_cache.set(key, versions, rendered_messages)
+
+
+async def _cache_texts(
+    key: Hashable, get_texts: Callable[[], Awaitable[Tuple[str, ...]]]
+) -> Tuple[str, ...]:
+    versions = await _get_data_versions(None)
+    cached_texts = rendered_cache.get(key, versions) if versions else None
+    if cached_texts is not None:
+        return cached_texts
+    texts = await get_texts()
+    if versions and _is_complete() and versions == await _get_data_versions(None):
+        rendered_cache.set(key, versions, texts)
+    return texts
+
+
+async def _iter_general_showings(
+    movie: str, date: str, cinema: str, format: str
+) -> AsyncIterator[Optional[ShowDate]]:
+    movie = await _get_movie_match(movie)
+    format = format_vocabulary.get_filter(format)
+    cinema_is_zone = registry.is_zone(cinema)
     if cinema and not cinema_is_zone:
-        cinema_showings = get_showings(movie, date, cinema, format)
-        message, total = get_movie_date_message([cinema_showings], "CINEMA")
+        yield await get_showings(movie, date, cinema, format)
+        return
     elif cinema and cinema_is_zone:
-        cinema_showings = get_showings_by_zone(movie, date, cinema, format)
-        message, total = get_movie_date_message([cinema_showings], "CINEMA")
+        cinemas = iter_showings_by_zone(movie, date, cinema, format)
     else:
-        cinema_showings = get_showing_by_date(movie, date, format)
-        message, total = get_movie_date_message([cinema_showings], "CINEMA")
-    return message, total
+        cinemas = iter_showing_by_date(movie, date, format)
+    async for cinema_showings in cinemas:
+        yield ShowDate(date=date, cinemas=(cinema_showings,))
+
+
+def get_general_showings(
+    movie: str, date: str, cinema: str = None, format: str = None, window: str = None
+) -> AsyncIterator[str]:
+    date, format = _normalize_date(date), _normalize_format(format)
+    window = parse_time_window(window)
+    return _cache_messages(
+        ("horarios", movie, parse_user_date(date) or date, cinema, format, window),
+        cinema,
+        stream_movie_date_messages(
+            _iter_general_showings(movie, date, cinema, format), window
+        ),
+    )
 
 
-def get_showing_by_cinema(movie: str, cinema: str, format: str) -> List[ShowDate]:
-    cinema_is_zone = cinema in CINEMAS_ZONES
+async def iter_showing_by_cinema(
+    movie: str, cinema: str, format: str
+) -> AsyncIterator[ShowDate]:
+    movie = await _get_movie_match(movie)
+    format = format_vocabulary.get_filter(format)
+    cinema_is_zone = registry.is_zone(cinema)
     if not cinema_is_zone:
         chain = get_chain(cinema)
         if chain == "CINEHOYTS":
-            return cinehoyts_services.get_showing_by_cinema(movie, cinema, format)
+            showings = await cinehoyts_services.get_showing_by_cinema(
+                movie, cinema, format
+            )
         elif chain == "CINEMARK":
-            return cinemark_services.get_showing_by_cinema(
+            showings = await cinemark_services.get_showing_by_cinema(
                 movie, cinemark_services.get_cinema_by_cinema_key(cinema), format
             )
         else:
-            cinehoyts_showings = cinehoyts_services.get_showing_by_cinema(
-                movie, cinema, format
-            )
-            cinemark_showings = cinemark_services.get_showing_by_cinema(
-                movie, cinemark_services.get_cinema_by_cinema_key(cinema), format
+            cinehoyts_showings, cinemark_showings = await asyncio.gather(
+                cinehoyts_services.get_showing_by_cinema(movie, cinema, format),
+                cinemark_services.get_showing_by_cinema(
+                    movie, cinemark_services.get_cinema_by_cinema_key(cinema), format
+                ),
             )
-            return cinehoyts_showings + cinemark_showings
+            showings = cinehoyts_showings + cinemark_showings
+        for showdate in showings:
+            yield showdate
     else:
-        cinehoyts_showings = cinehoyts_services.get_showing_by_zone(
-            movie, cinema, format
+        showings = merge(
+            cinehoyts_services.iter_showing_by_zone(movie, cinema, format),
+            cinemark_services.iter_showing_by_zone(movie, cinema, format),
         )
-        cinemark_showings = cinemark_services.get_showing_by_zone(movie, cinema, format)
-        return cinehoyts_showings + cinemark_showings
+        async for showdate in showings:
+            yield showdate
 
 
-def get_cinema_showings_by_date(cinema, date, format) -> ShowDate:
+async def get_cinema_showings_by_date(cinema, date, format) -> Optional[ShowDate]:
     chain = get_chain(cinema)
     if chain == "CINEHOYTS":
-        return cinehoyts_services.get_cinema_showings_by_date(cinema, date, format)
+        return await cinehoyts_services.get_cinema_showings_by_date(
+            cinema, date, format
+        )
     elif chain == "CINEMARK":
-        return cinemark_services.get_cinema_showings_by_date(
+        return await cinemark_services.get_cinema_showings_by_date(
             cinemark_services.get_cinema_by_cinema_key(cinema), date, format
         )
 
 
-def get_cinema_showings_by_date_and_zone(cinema, date, format) -> List[ShowDate]:
-    cinehoyts_showings = cinehoyts_services.get_cinema_showings_by_date_and_zone(
-        cinema, date, format
+def iter_cinema_showings_by_date_and_zone(
+    cinema, date, format
+) -> AsyncIterator[ShowDate]:
+    return merge(
+        cinehoyts_services.iter_cinema_showings_by_date_and_zone(cinema, date, format),
+        cinemark_services.iter_cinema_showings_by_date_and_zone(cinema, date, format),
     )
-    cinemark_showings = cinemark_services.get_cinema_showings_by_date_and_zone(
-        cinema, date, format
-    )
-    return cinehoyts_showings + cinemark_showings
 
 
-def get_cinema_showings(cinema, format) -> List[ShowDate]:
+async def get_cinema_showings(cinema, format) -> List[ShowDate]:
     chain = get_chain(cinema)
     if chain == "CINEHOYTS":
-        return cinehoyts_services.get_cinema_showings(cinema, format)
+        return await cinehoyts_services.get_cinema_showings(cinema, format)
     elif chain == "CINEMARK":
-        return cinemark_services.get_cinema_showings(cinema, format)
+        return await cinemark_services.get_cinema_showings(
+            cinemark_services.get_cinema_by_cinema_key(cinema), format
+        )
 
 
-def get_cinema_showings_by_zone(cinema, format) -> List[ShowDate]:
-    cinehoyts_showings = cinehoyts_services.get_cinema_showings_by_zone(cinema, format)
-    cinemark_showings = cinemark_services.get_cinema_showings_by_zone(cinema, format)
-    return cinehoyts_showings + cinemark_showings
+def iter_cinema_showings_by_zone(cinema, format) -> AsyncIterator[ShowDate]:
+    return merge(
+        cinehoyts_services.iter_cinema_showings_by_zone(cinema, format),
+        cinemark_services.iter_cinema_showings_by_zone(cinema, format),
+    )
 
 
-def get_general_cinema_showings(
-    cinema: str, date: str = None, format: str = None
-) -> Tuple[str, int]:
-    cinema_is_zone = cinema in CINEMAS_ZONES
+async def _iter_general_cinema_showings(
+    cinema: str, date: str, format: str
+) -> AsyncIterator[Optional[ShowDate]]:
+    format = format_vocabulary.get_filter(format)
+    cinema_is_zone = registry.is_zone(cinema)
     if not cinema_is_zone and date:
-        cinema_showings = get_cinema_showings_by_date(cinema, date, format)
-        message, total = get_movie_date_message([cinema_showings], "CINEMA")
+        yield await get_cinema_showings_by_date(cinema, date, format)
+        return
     elif not cinema_is_zone and not date:
-        cinema_showings = get_cinema_showings(cinema, format)
-        message, total = get_movie_date_message(cinema_showings, "CINEMA")
+        for showdate in await get_cinema_showings(cinema, format):
+            yield showdate
+        return
     elif cinema_is_zone and date:
-        cinema_showings = get_cinema_showings_by_date_and_zone(cinema, date, format)
-        message, total = get_movie_date_message(cinema_showings, "CINEMA")
+        showings = iter_cinema_showings_by_date_and_zone(cinema, date, format)
     else:
-        cinema_showings = get_cinema_showings_by_zone(cinema, format)
-        message, total = get_movie_date_message(cinema_showings, "CINEMA")
-    return message, total
-
-
-def get_movie_date_message(
-    showdates: List[ShowDate], separator_type: str
-) -> Tuple[str, int]:
-    result = ""
-    total_shotimes = 0
-    for showdate in showdates:
-        if not showdate:
-            continue
-        temp_result = f"{showdate.get_formatted_date()}\n\n"
-        is_there_any_cinema = False
-        for cinema in showdate.cinemas:
-            movie_temp_result = f"{cinema.name}\n\n"
-            is_there_any_movie = False
-            for movie in cinema.movies:
-                show_temp_result = f"{movie.get_formatted_title()}\n"
-                is_there_showtime = False
-                for showtime in movie.showtimes:
-                    is_there_any_cinema = True
-                    is_there_any_movie = True
-                    is_there_showtime = True
-                    if showtime.seats:
-                        seats = (
-                            f"{showtime.seats} asientos disponibles"
-                            if int(showtime.seats) > 0
-                            else "AGOTADA"
-                        )
-                        show_temp_result += (
-                            f"{showtime.showtime} hrs — {showtime.format} — {seats}\n"
-                        )
-                    else:
-                        show_temp_result += (
-                            f"{showtime.showtime} hrs — {showtime.format}\n"
-                        )
-                    total_shotimes += 1
-                show_temp_result += "——————\n\n"
-                if separator_type == "MOVIE":
-                    show_temp_result += "\n\n$SEPARATOR$"
-                if is_there_showtime:
-                    movie_temp_result += show_temp_result
-            if separator_type == "CINEMA":
-                movie_temp_result += "$SEPARATOR$"
-            if is_there_any_movie:
-                temp_result += movie_temp_result
-        if is_there_any_cinema:
-            result += temp_result
-        if separator_type == "SHOWTIME":
-            result += "\n\n$SEPARATOR$"
-    return result, total_shotimes
-
-
-def similar(a, b):
-    return SequenceMatcher(None, a, b).ratio()
-
-
-def _check_movie_in_total(movie_title, total):
-    movie_title.replace("¡", "").replace("!", "").replace("¿", "").replace(
-        "?", ""
-    ).replace(",", "").replace(".", "").replace(":", "")
-    for possible_movie in total.keys():
-        possible_movie.replace("¡", "").replace("!", "").replace("¿", "").replace(
-            "?", ""
-        ).replace(",", "").replace(".", "").replace(":", "")
-        similarity = similar(movie_title, possible_movie)
-        minimum_title_len = min(len(movie_title), len(possible_movie))
-        first_similarity = similar(movie_title[:minimum_title_len], possible_movie[:minimum_title_len])
-        last_similarity = similar(movie_title[-minimum_title_len:], possible_movie[-minimum_title_len:])
-
-        if (
-            (len(movie_title) >= 5 and len(possible_movie) >= 5)
-            and ((movie_title in possible_movie) or (possible_movie in movie_title))
-        ) or (
-            similarity > 0.66 or first_similarity > 0.85 or last_similarity > 0.85
-        ):
-            return True, possible_movie
-    return False, movie_title
-
-
-def _get_movie_total(cinemas: List[Cinema]) -> str:
-    total = {}
-    for cinema in cinemas:
-        for movie in cinema.movies:
-            movie_title = movie.title.upper().replace("-", " ").replace(":", "")
-            movie_exists, movie_key = _check_movie_in_total(movie_title, total)
-            if movie_exists:
-                total[movie_key] += len(movie.showtimes)
-            else:
-                total[movie_key] = len(movie.showtimes)
-    total = {
-        k: v for k, v in sorted(total.items(), key=lambda item: item[1], reverse=True)
-    }
-    message = ""
-    for movie_title in total.keys():
-        message += f"{movie_title}: {total[movie_title]}\n"
-    return message
+        showings = iter_cinema_showings_by_zone(cinema, format)
+    async for showdate in showings:
+        yield showdate
 
 
-def _get_format_total(cinemas: List[Cinema]) -> str:
-    total = {}
-    for cinema in cinemas:
-        for movie in cinema.movies:
-            for showtime in movie.showtimes:
-                showtime_format = showtime.format
-                if showtime_format in total:
-                    total[showtime_format] += 1
-                else:
-                    total[showtime_format] = 1
+def get_general_cinema_showings(
+    cinema: str, date: str = None, format: str = None, window: str = None
+) -> AsyncIterator[str]:
+    date, format = _normalize_date(date), _normalize_format(format)
+    window = parse_time_window(window)
+    return _cache_messages(
+        ("horarios", None, parse_user_date(date) or date, cinema, format, window),
+        cinema,
+        stream_movie_date_messages(
+            _iter_general_cinema_showings(cinema, date, format), window
+        ),
+    )
+
+
+def get_movie_cinema_showings(
+    movie: str, cinema: str, format: str = None, window: str = None
+) -> AsyncIterator[str]:
+    format = _normalize_format(format)
+    window = parse_time_window(window)
+    return _cache_messages(
+        ("horarios", movie, None, cinema, format, window),
+        cinema,
+        stream_movie_date_messages(
+            iter_showing_by_cinema(movie, cinema, format), window
+        ),
+    )
+
+
+def _get_total_message(total: Dict[str, int]) -> str:
     total = {
         k: v for k, v in sorted(total.items(), key=lambda item: item[1], reverse=True)
     }
     message = ""
-    for showtime_format in total.keys():
-        message += f"{showtime_format}: {total[showtime_format]}\n"
+    for total_key in total.keys():
+        message += f"{total_key}: {total[total_key]}\n"
     return message
 
 
-def _get_cinema_total(cinemas: List[Cinema]) -> str:
-    total = {}
-    for cinema in cinemas:
-        for movie in cinema.movies:
-            if cinema.name in total:
-                total[cinema.name] += len(movie.showtimes)
-            else:
-                total[cinema.name] = len(movie.showtimes)
-    total = {
-        k: v for k, v in sorted(total.items(), key=lambda item: item[1], reverse=True)
+def _get_movie_counts_total(movie_counts: Iterable[Tuple[str, int]]) -> str:
+    return _get_total_message(title_grouper.get_totals(movie_counts))
+
+
+def _add_total(totals: Dict[str, int], key: str, total: int):
+    totals[key] = totals.get(key, 0) + total
+
+
+def _get_chains_breakdowns(
+    chains_cinemas: Dict[str, List[Tuple[str, Cinema]]],
+) -> Breakdowns:
+    breakdowns: Dict[str, Dict[str, int]] = {column: {} for column in BREAKDOWNS}
+    format_counts: Counter = Counter()
+    for chain, cinemas in chains_cinemas.items():
+        for cinema_tag, cinema in cinemas:
+            if not cinema.movies:
+                continue
+            cinema_showtimes = 0
+            for movie in cinema.movies:
+                showtimes = len(movie.showtimes)
+                _add_total(breakdowns["movie"], movie.title, showtimes)
+                format_counts.update(movie.showtimes.format_ids)
+                cinema_showtimes += showtimes
+            _add_total(breakdowns["cinema"], cinema.name, cinema_showtimes)
+            _add_total(breakdowns["chain"], chain, cinema_showtimes)
+            zone = registry.get_zone(chain, cinema_tag)
+            if zone:
+                _add_total(breakdowns["zone"], zone, cinema_showtimes)
+    formats = format_vocabulary.formats
+    breakdowns["format"] = {
+        formats[format_id].name: total for format_id, total in format_counts.items()
     }
-    message = ""
-    for cinema_name in total.keys():
-        message += f"{cinema_name}: {total[cinema_name]}\n"
-    return message
+    return {column: list(totals.items()) for column, totals in breakdowns.items()}
 
 
-def get_total(date: str, format: str) -> str:
-    cinehoyts_total = cinehoyts_services.get_total(date, format)
-    cinemark_total = cinemark_services.get_total(date, format)
-    total = _get_movie_total(cinehoyts_total + cinemark_total)
-    return total
+async def _get_chains_total(
+    date: str, format: Optional[FormatFilter]
+) -> Dict[str, List[Tuple[str, Cinema]]]:
+    cinehoyts_total, cinemark_total = await asyncio.gather(
+        cinehoyts_services.get_total(date, format),
+        cinemark_services.get_total(date, format),
+    )
+    return {CINEHOYTS: cinehoyts_total, CINEMARK: cinemark_total}
+
+
+async def _get_breakdowns(date: str, format: Optional[FormatFilter]) -> Breakdowns:
+    parsed_date = parse_user_date(date)
+    index = await showtime_index.get_index() if parsed_date else None
+    if index:
+        breakdowns = index.get_breakdowns(parsed_date, format)
+        if breakdowns["movie"]:
+            return breakdowns
+    return _get_chains_breakdowns(await _get_chains_total(date, format))
+
+
+async def _get_total_texts(date: str, format: str) -> Tuple[str, ...]:
+    breakdowns = await _get_breakdowns(date, format_vocabulary.get_filter(format))
+    return (
+        _get_movie_counts_total(breakdowns["movie"]),
+        _get_total_message(dict(breakdowns["format"])),
+        _get_total_message(dict(breakdowns["cinema"])),
+        _get_total_message(
+            {CHAIN_NAMES[chain]: total for chain, total in breakdowns["chain"]}
+        ),
+        _get_total_message(dict(breakdowns["zone"])),
+    )
 
 
-def get_format_total(date: str, format: str) -> str:
-    cinehoyts_total = cinehoyts_services.get_total(date, format)
-    cinemark_total = cinemark_services.get_total(date, format)
-    total = _get_format_total(cinehoyts_total + cinemark_total)
-    return total
+async def get_total_texts(date: str, format: str) -> Tuple[str, ...]:
+    date, format = _normalize_date(date), _normalize_format(format)
+    return await _cache_texts(
+        ("totals", parse_user_date(date) or date, format),
+        lambda: _get_total_texts(date, format),
+    )
+
+
+async def get_total(date: str, format: str) -> str:
+    return (await get_total_texts(date, format))[0]
+
 
+async def get_format_total(date: str, format: str) -> str:
+    return (await get_total_texts(date, format))[1]
 
-def get_cinema_total(date: str, format: str) -> str:
-    cinehoyts_total = cinehoyts_services.get_total(date, format)
-    cinemark_total = cinemark_services.get_total(date, format)
-    total = _get_cinema_total(cinehoyts_total + cinemark_total)
-    return total
+
+async def get_cinema_total(date: str, format: str) -> str:
+    return (await get_total_texts(date, format))[2]
+
+
+async def get_all_totals(date: str, format: str) -> str:
+    return "".join(
+        f"{title}\n——————\n{text}\n"
+        for title, text in zip(TOTAL_TITLES, await get_total_texts(date, format))
+    )
+
+
+def _get_skipped_cinemas(skipped: List[Skipped]) -> List[str]:
+    cinemas = []
+    for chain, key in skipped:
+        if chain == CINEHOYTS:
+            cinemas += cinehoyts_services.get_response_cinemas(key)
+        else:
+            cinemas += cinemark_services.get_response_cinemas(key)
+    return cinemas
+
+
+def get_skipped_message(budget: CommandBudget) -> str:
+    message = ""
+    timed_out = _get_skipped_cinemas(budget.skipped[SKIPPED_TIMEOUT])
+    if timed_out:
+        message += f"SIN RESPUESTA A TIEMPO: {', '.join(timed_out)}\n"
+    failed = _get_skipped_cinemas(budget.skipped[SKIPPED_ERROR])
+    if failed:
+        message += f"NO DISPONIBLES: {', '.join(failed)}\n"
+    return message
 
 
 def get_info_cities():
-    info = ""
-    uniques = {}
-    CINEMAS_ZONES.sort()
-    for cinema in CINEMAS_ZONES:
-        if cinema in uniques:
-            continue
-        info += f"{cinema}\n"
-        uniques[cinema] = True
-    return info
+    return "".join(f"{zone}\n" for zone in registry.get_sorted_zone_tags())
 
 
 def get_info_cinemas():
+    return "".join(f"{cinema}\n" for cinema in registry.get_sorted_cinema_tags())
+
+
+def get_info_stats():
     info = ""
-    uniques = {}
-    CINEMAS.sort()
-    for cinema in CINEMAS:
-        if cinema in uniques:
-            continue
-        info += f"{cinema}\n"
-        uniques[cinema] = True
+    for host, stats in get_pool_stats().items():
+        info += (
+            f"{host}: {stats['requests']} requests, "
+            f"{stats['connections_created']} new connections, "
+            f"{stats['connections_reused']} reused "
+            f"({stats['reuse_ratio']:.0%}), "
+            f"{stats['connect_seconds']:.2f}s connecting, "
+            f"{stats['errors']} errors\n"
+        )
+    stats = showings_cache.get_stats()
+    info += (
+        f"cache: {stats['entries']} entries, {stats['hits']} hits, "
+        f"{stats['stale']} stale, {stats['misses']} misses "
+        f"({stats['hit_ratio']:.0%}), {stats['refreshes']} refreshes, "
+        f"{stats['refresh_errors']} refresh errors, "
+        f"{stats['evictions']} evictions\n"
+    )
+    stats = upstream_flights.get_stats()
+    info += (
+        f"single-flight: {stats['calls']} callers, "
+        f"{stats['fetches']} upstream calls, {stats['shared']} shared, "
+        f"{stats['in_flight']} in flight\n"
+    )
+    stats = conditional_fetcher.get_stats()
+    info += (
+        f"conditional: {stats['requests']} requests, "
+        f"{stats['not_modified']} not modified, {stats['unchanged']} unchanged, "
+        f"{stats['decoded']} decoded\n"
+    )
+    stats = rendered_cache.get_stats()
+    info += (
+        f"rendered: {stats['entries']} entries, {stats['bytes'] // 1024} KiB, "
+        f"{stats['hits']} hits, {stats['misses']} misses, "
+        f"{stats['invalidations']} invalidations, {stats['evictions']} evictions\n"
+    )
     return info
@@ -0,0 +1,61 @@
+import sys
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+
+from cinema_showings_bot.settings import RENDERED_CACHE_MAX_BYTES
+
+Versions = Tuple[Optional[int], ...]
+Entry = Tuple[Versions, Tuple[str, ...], int]
+
+
+class RenderedCache:
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[Hashable, Entry]" = OrderedDict()
+        self.size = 0
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0, "evictions": 0}
+
+    def _pop(self, key: Hashable):
+        _, _, size = self.entries.pop(key)
+        self.size -= size
+
+    def get(self, key: Hashable, versions: Versions) -> Optional[Tuple[str, ...]]:
+        entry = self.entries.get(key)
+        if entry and entry[0] != versions:
+            self._pop(key)
+            self.stats["invalidations"] += 1
+            entry = None
+        if not entry:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        self.entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: Hashable, versions: Versions, messages: Iterable[str]):
+        messages = tuple(messages)
+        size = sys.getsizeof(versions) + sum(
+            sys.getsizeof(message) for message in messages
+        )
+        if key in self.entries:
+            self._pop(key)
+        if size > self.max_bytes:
+            return
+        self.entries[key] = (versions, messages, size)
+        self.size += size
+        while self.size > self.max_bytes:
+            self._pop(next(iter(self.entries)))
+            self.stats["evictions"] += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.size = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats["entries"] = len(self.entries)
+        stats["bytes"] = self.size
+        return stats
+
+
+rendered_cache = RenderedCache(max_bytes=RENDERED_CACHE_MAX_BYTES)
@@ -1,11 +0,0 @@
-from apps.cinema.constants.cinehoyts import (
-    CINEMA_ZONES_TAGS as CINEHOYTS_CINEMA_ZONES_TAGS,
-)
-from apps.cinema.constants.cinehoyts import CINEMAS_TAGS as CINEHOYTS_CINEMAS_TAGS
-from apps.cinema.constants.cinemark import (
-    CINEMA_ZONES_TAGS as CINEMARK_CINEMA_ZONES_TAGS,
-)
-from apps.cinema.constants.cinemark import CINEMAS_TAGS as CINEMARK_CINEMAS_TAGS
-
-CINEMAS_ZONES = CINEHOYTS_CINEMA_ZONES_TAGS + CINEMARK_CINEMA_ZONES_TAGS
-CINEMAS = CINEHOYTS_CINEMAS_TAGS + CINEMARK_CINEMAS_TAGS
@@ -0,0 +1,146 @@
+from functools import lru_cache
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, List, Optional
+
+from apps.cinema.dataclasses import ShowDate
+from apps.cinema.dates import TimeWindow
+from apps.movie.dataclasses import get_formatted_minutes
+
+DISCORD_MESSAGE_LIMIT = 2000
+
+
+class MessagePacker:
+    def __init__(self, limit: int = DISCORD_MESSAGE_LIMIT):
+        self.limit = limit
+        self.messages: List[str] = []
+        self.blocks: List[str] = []
+        self.length = 0
+
+    def _flush(self):
+        if self.blocks:
+            self.messages.append("".join(self.blocks))
+        self.blocks = []
+        self.length = 0
+
+    def _append(self, text: str):
+        while len(text) > self.limit:
+            self._append(text[: self.limit])
+            text = text[self.limit :]
+        if self.length + len(text) > self.limit:
+            self._flush()
+        if self.blocks or text.strip():
+            self.blocks.append(text)
+            self.length += len(text)
+
+    def add(self, block: str):
+        if len(block) <= self.limit:
+            self._append(block)
+            return
+        for line in block.splitlines(keepends=True):
+            self._append(line)
+
+    def pop_messages(self) -> List[str]:
+        messages, self.messages = self.messages, []
+        return messages
+
+    def get_messages(self) -> List[str]:
+        self._flush()
+        return self.pop_messages()
+
+
+def pack_messages(
+    blocks: Iterable[str], limit: int = DISCORD_MESSAGE_LIMIT
+) -> List[str]:
+    packer = MessagePacker(limit)
+    for block in blocks:
+        packer.add(block)
+    return packer.get_messages()
+
+
+@lru_cache(maxsize=4096)
+def _get_showtime_message(minutes: int, format: str, seats: Optional[int]) -> str:
+    showtime = get_formatted_minutes(minutes)
+    if seats is None:
+        return f"{showtime} hrs — {format}\n"
+    seats_message = f"{seats} asientos disponibles" if seats > 0 else "AGOTADA"
+    return f"{showtime} hrs — {format} — {seats_message}\n"
+
+
+def _iter_movie_date_blocks(showdate: ShowDate, with_date: bool) -> Iterator[str]:
+    date_header = f"{showdate.get_formatted_date()}\n\n" if with_date else ""
+    for cinema in showdate.cinemas:
+        cinema_header = f"{cinema.name}\n\n"
+        for movie in cinema.movies:
+            if not movie.showtimes:
+                continue
+            yield "".join(
+                [
+                    date_header,
+                    cinema_header,
+                    f"{movie.get_formatted_title()}\n",
+                    *[
+                        _get_showtime_message(*showtime)
+                        for showtime in movie.showtimes.get_rows()
+                    ],
+                    "——————\n\n",
+                ]
+            )
+            date_header = cinema_header = ""
+
+
+class MovieDateRenderer:
+    def __init__(
+        self,
+        window: Optional[TimeWindow] = None,
+        limit: int = DISCORD_MESSAGE_LIMIT,
+    ):
+        self.window = window
+        self.packer = MessagePacker(limit)
+        self.rendered_date = None
+        self.total = 0
+
+    def add(self, showdate: Optional[ShowDate]) -> List[str]:
+        if not showdate:
+            return []
+        if self.window:
+            showdate = showdate.get_window(self.window)
+        blocks = _iter_movie_date_blocks(
+            showdate, with_date=showdate.date != self.rendered_date
+        )
+        for block in blocks:
+            self.packer.add(block)
+            self.rendered_date = showdate.date
+        self.total += sum(
+            len(movie.showtimes)
+            for cinema in showdate.cinemas
+            for movie in cinema.movies
+        )
+        return self.packer.pop_messages()
+
+    def finish(self) -> List[str]:
+        self.packer.add(f"{self.total} HORARIOS EN TOTAL\n")
+        return self.packer.get_messages()
+
+
+def get_movie_date_messages(
+    showdates: Iterable[Optional[ShowDate]], window: Optional[TimeWindow] = None
+) -> List[str]:
+    renderer = MovieDateRenderer(window)
+    messages = []
+    for showdate in showdates:
+        messages.extend(renderer.add(showdate))
+    messages.extend(renderer.finish())
+    return messages
+
+
+# Streaming sends each message as soon as it fills, so the message count is only
+# known once the last cinema arrives; get_movie_date_messages knows it up front.
+async def stream_movie_date_messages(
+    showdates: AsyncIterable[Optional[ShowDate]],
+    window: Optional[TimeWindow] = None,
+) -> AsyncIterator[str]:
+    renderer = MovieDateRenderer(window)
+    async for showdate in showdates:
+        for message in renderer.add(showdate):
+            yield message
+    for message in renderer.finish():
+        yield message
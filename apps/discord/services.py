@@ -4,17 +4,22 @@ import os
 from discord import Intents
 from discord.ext import commands
 
+from apps.cinema.registry import registry
+from apps.cinema.services.budgets import command_budget
 from apps.discord import (
+    get_all_totals,
     get_cinema_total,
     get_format_total,
     get_general_cinema_showings,
     get_general_showings,
     get_info_cinemas,
     get_info_cities,
-    get_movie_date_message,
-    get_showing_by_cinema,
+    get_info_stats,
+    get_movie_cinema_showings,
+    get_skipped_message,
     get_total,
 )
+from apps.discord.messages import pack_messages
 from cinema_showings_bot.settings import COMMAND
 
 
@@ -28,43 +33,71 @@ def main():
     async def on_ready():
         print(f"{client.user} has connected to Discord!")
 
+    @client.before_invoke
+    async def refresh_registry(ctx):
+        await registry.refresh()
+
     @client.command()
     async def horarios(
-        ctx, movie: str, date: str, cinema: str = None, format: str = None
+        ctx,
+        movie: str,
+        date: str,
+        cinema: str = None,
+        format: str = None,
+        window: str = None,
     ):
         movie = None if not movie or movie in ("skip", "sk", "sp") else movie.lower()
         date = None if not date or date in ("skip", "sk", "sp") else date.lower()
         cinema = (
             None if not cinema or cinema in ("skip", "sk", "sp") else cinema.lower()
         )
-        format = None if not format else format.upper()
+        format = (
+            None if not format or format in ("skip", "sk", "sp") else format.upper()
+        )
         if not movie and date and cinema:
-            message, total = get_general_cinema_showings(cinema, date, format)
+            messages = get_general_cinema_showings(cinema, date, format, window)
         elif movie and not date and cinema:
-            message, total = get_movie_date_message(
-                get_showing_by_cinema(movie, cinema, format), "CINEMA"
-            )
+            messages = get_movie_cinema_showings(movie, cinema, format, window)
         else:
-            message, total = get_general_showings(movie, date, cinema, format)
-        message = f"{total} HORARIOS EN TOTAL \n——————\n{message}"
-        for cinema_showing_part in message.split("$SEPARATOR$"):
-            if cinema_showing_part and cinema_showing_part not in ("\n", "\n\n"):
-                await ctx.send(cinema_showing_part)
+            messages = get_general_showings(movie, date, cinema, format, window)
+        with command_budget() as budget:
+            async for message in messages:
+                await ctx.send(message)
+        skipped_message = get_skipped_message(budget)
+        if skipped_message:
+            await ctx.send(skipped_message)
 
     @client.command()
     async def total(ctx, date, format: str = None):
-        message = get_total(date, format)
-        await ctx.send(message)
+        with command_budget() as budget:
+            total = await get_total(date, format)
+        total += get_skipped_message(budget)
+        for message in pack_messages(total.splitlines(keepends=True)):
+            await ctx.send(message)
 
     @client.command()
     async def total_formatos(ctx, date, format: str = None):
-        message = get_format_total(date, format)
-        await ctx.send(message)
+        with command_budget() as budget:
+            total = await get_format_total(date, format)
+        total += get_skipped_message(budget)
+        for message in pack_messages(total.splitlines(keepends=True)):
+            await ctx.send(message)
 
     @client.command()
     async def total_cinemas(ctx, date, format: str = None):
-        message = get_cinema_total(date, format)
-        await ctx.send(message)
+        with command_budget() as budget:
+            total = await get_cinema_total(date, format)
+        total += get_skipped_message(budget)
+        for message in pack_messages(total.splitlines(keepends=True)):
+            await ctx.send(message)
+
+    @client.command()
+    async def totales(ctx, date, format: str = None):
+        with command_budget() as budget:
+            total = await get_all_totals(date, format)
+        total += get_skipped_message(budget)
+        for message in pack_messages(total.splitlines(keepends=True)):
+            await ctx.send(message)
 
     @client.command()
     async def info_cities(
@@ -78,10 +111,19 @@ def main():
         cinemas = get_info_cinemas()
         await ctx.send(cinemas)
 
+    @client.command()
+    async def stats(ctx):
+        stats = get_info_stats()
+        await ctx.send(stats)
+
     @client.command()
     async def info(ctx):
         info = "$c.horarios nombre-pelicula fecha nombre-cine(opcional)\nHORARIOS PELÍCULA PARA UNA FECHA EN PARTICULAR. EN UN CINE O TODOS LOS CINES. NOMBRE DEL CINE TAMBIÉN PUEDE SER UNA ZONA.\n\n"
+        info += "$c.horarios nombre-pelicula fecha nombre-cine formato rango-horario\nRANGO HORARIO OPCIONAL: 21, 18-20, 18:30-20:00, desde-21, hasta-20. USA skip PARA OMITIR CINE O FORMATO.\n\n"
         info += "$c.total fecha\nRECUENTO DE PELÍCULAS TOTALES POR FECHA.\n\n"
+        info += (
+            "$c.totales fecha\nTOTALES POR PELÍCULA, FORMATO, CINE, CADENA Y ZONA.\n\n"
+        )
         info += "$c.info_cities\nLISTA DE ZONAS INCLUIDAS.\n\n"
         info += "$c.info_cinemas\nLISTA DE CINES INCLUIDOS.\n\n"
         await ctx.send(info)
@@ -0,0 +1,46 @@
+from django.test import SimpleTestCase
+
+from apps.discord.messages import DISCORD_MESSAGE_LIMIT, MessagePacker, pack_messages
+
+
+def _get_line(length: int) -> str:
+    return "x" * (length - 1) + "\n"
+
+
+class MessagePackerTests(SimpleTestCase):
+    def test_blocks_filling_the_limit_share_one_message(self):
+        blocks = [_get_line(1000), _get_line(1000)]
+        self.assertEqual(pack_messages(blocks), ["".join(blocks)])
+
+    def test_one_character_over_the_limit_starts_a_new_message(self):
+        blocks = [_get_line(1000), _get_line(1001)]
+        self.assertEqual(pack_messages(blocks), blocks)
+
+    def test_long_blocks_are_split_on_lines(self):
+        block = _get_line(1500) * 3
+        messages = pack_messages([block])
+        self.assertEqual(messages, [_get_line(1500)] * 3)
+
+    def test_long_lines_are_split_at_the_limit(self):
+        line = _get_line(DISCORD_MESSAGE_LIMIT * 2 + 10)
+        messages = pack_messages([line])
+        self.assertEqual([len(message) for message in messages], [2000, 2000, 10])
+        self.assertEqual("".join(messages), line)
+
+    def test_messages_never_exceed_the_limit(self):
+        blocks = [_get_line(length) for length in range(2, 600, 7)]
+        messages = pack_messages(blocks)
+        self.assertTrue(all(len(message) <= 2000 for message in messages))
+        self.assertEqual("".join(messages), "".join(blocks))
+
+    def test_full_messages_are_released_before_the_end(self):
+        packer = MessagePacker()
+        packer.add(_get_line(1500))
+        self.assertEqual(packer.pop_messages(), [])
+        packer.add(_get_line(1500))
+        self.assertEqual(packer.pop_messages(), [_get_line(1500)])
+        self.assertEqual(packer.get_messages(), [_get_line(1500)])
+
+    def test_messages_do_not_start_with_blank_lines(self):
+        messages = pack_messages([_get_line(2000), "\n", "total\n"])
+        self.assertEqual(messages, [_get_line(2000), "total\n"])
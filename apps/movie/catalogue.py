@@ -0,0 +1,124 @@
+import re
+import threading
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+
+from apps.movie.models import Movie, MovieAlias
+
+Alias = Tuple[str, str]
+AliasEntry = Tuple[str, str, Optional[str]]
+
+
+def get_canonical_title(movie_title: str) -> str:
+    return movie_title.upper().replace("-", " ").replace(":", "")
+
+
+def get_movie_slug(movie_title: str) -> str:
+    movie_title = unicodedata.normalize("NFKD", movie_title)
+    movie_title = "".join(
+        character for character in movie_title if not unicodedata.combining(character)
+    )
+    return re.sub(r"[^a-z0-9]+", "-", movie_title.lower()).strip("-")
+
+
+class MovieCatalogue:
+    def __init__(self):
+        self.movie_ids: Dict[Alias, int] = {}
+        self.slugs: Dict[str, int] = {}
+        self.titles: Dict[int, str] = {}
+        self.loaded = False
+        self.lock = threading.Lock()
+
+    def load(self):
+        self.slugs, self.titles = {}, {}
+        for movie_id, slug, title in Movie.objects.values_list("id", "slug", "title"):
+            self.slugs[slug] = movie_id
+            self.titles[movie_id] = title
+        self.movie_ids = {
+            (chain, alias): movie_id
+            for chain, alias, movie_id in MovieAlias.objects.values_list(
+                "chain", "alias", "movie_id"
+            )
+        }
+        self.loaded = True
+
+    def clear(self):
+        with self.lock:
+            self.movie_ids, self.slugs, self.titles = {}, {}, {}
+            self.loaded = False
+
+    def get_movie_id(self, chain: str, alias: str) -> Optional[int]:
+        return self.movie_ids.get((chain, alias))
+
+    def get_title(self, movie_id: int) -> Optional[str]:
+        return self.titles.get(movie_id)
+
+    def _add_movies(self, titles: List[str]):
+        slugs = {}
+        for title in titles:
+            slug = get_movie_slug(title)
+            if slug not in self.slugs:
+                slugs.setdefault(slug, get_canonical_title(title))
+        if not slugs:
+            return
+        Movie.objects.bulk_create(
+            [Movie(slug=slug, title=title) for slug, title in slugs.items()],
+            ignore_conflicts=True,
+        )
+        for movie_id, slug, title in Movie.objects.filter(
+            slug__in=list(slugs)
+        ).values_list("id", "slug", "title"):
+            self.slugs[slug] = movie_id
+            self.titles[movie_id] = title
+
+    def _add_aliases(self, aliases: Dict[Alias, int]):
+        MovieAlias.objects.bulk_create(
+            [
+                MovieAlias(chain=chain, alias=alias, movie_id=movie_id)
+                for (chain, alias), movie_id in aliases.items()
+            ],
+            ignore_conflicts=True,
+        )
+        for chain, alias, movie_id in MovieAlias.objects.filter(
+            alias__in=[alias for _, alias in aliases]
+        ).values_list("chain", "alias", "movie_id"):
+            self.movie_ids[(chain, alias)] = movie_id
+
+    def find_movie_ids(
+        self, entries: Iterable[AliasEntry]
+    ) -> Dict[Alias, Optional[int]]:
+        with self.lock:
+            if not self.loaded:
+                self.load()
+            return {
+                (chain, title): self.movie_ids.get((chain, title))
+                for chain, title, _ in entries
+            }
+
+    def get_movie_ids(self, entries: Iterable[AliasEntry]) -> Dict[Alias, int]:
+        entries = list(dict.fromkeys(entries))
+        with self.lock:
+            if not self.loaded:
+                self.load()
+            missing = [
+                entry for entry in entries if (entry[0], entry[1]) not in self.movie_ids
+            ]
+            if missing:
+                with transaction.atomic():
+                    self._add_movies([title for _, title, _ in missing])
+                    aliases = {}
+                    for chain, title, key in missing:
+                        movie_id = self.slugs[get_movie_slug(title)]
+                        aliases[(chain, title)] = movie_id
+                        if key and (chain, key) not in self.movie_ids:
+                            aliases.setdefault((chain, key), movie_id)
+                    self._add_aliases(aliases)
+            return {
+                (chain, title): self.movie_ids[(chain, title)]
+                for chain, title, _ in entries
+            }
+
+
+movie_catalogue = MovieCatalogue()
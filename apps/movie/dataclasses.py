@@ -1,21 +1,120 @@
+from array import array
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
-from typing import List, Optional
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
+from apps.cinema.dates import TimeWindow
+from apps.cinema.formats import ShowFormat, format_vocabulary
 
-@dataclass
+Session = Tuple[int, ShowFormat, Optional[int]]
+
+UNKNOWN_SEATS = -1
+
+
+@lru_cache(maxsize=2048)
+def get_formatted_minutes(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+@dataclass(frozen=True)
 class ShowTime:
-    showtime: str
+    __slots__ = ("showtime", "format", "seats")
+
+    showtime: int
     format: str
-    seats: Optional[str]
+    seats: Optional[int]
+
+    def get_formatted_showtime(self) -> str:
+        return get_formatted_minutes(self.showtime)
+
+
+class ShowTimes(Sequence[ShowTime]):
+    __slots__ = ("minutes", "format_ids", "seats", "starts", "order")
+
+    def __init__(self, minutes: array, format_ids: array, seats: array):
+        self.minutes = minutes
+        self.format_ids = format_ids
+        self.seats = seats
+        self.starts: Optional[array] = None
+        self.order: Optional[array] = None
 
+    @classmethod
+    def from_sessions(cls, sessions: Iterable[Session]) -> "ShowTimes":
+        minutes, format_ids, seats = array("H"), array("H"), array("i")
+        for session_minutes, show_format, session_seats in sessions:
+            minutes.append(session_minutes)
+            format_ids.append(show_format.id)
+            seats.append(UNKNOWN_SEATS if session_seats is None else session_seats)
+        return cls(minutes, format_ids, seats)
 
-@dataclass
+    def __len__(self) -> int:
+        return len(self.minutes)
+
+    def __getitem__(self, position: Union[int, slice]):
+        if isinstance(position, slice):
+            return ShowTimes(
+                self.minutes[position], self.format_ids[position], self.seats[position]
+            )
+        seats = self.seats[position]
+        return ShowTime(
+            showtime=self.minutes[position],
+            format=format_vocabulary.formats[self.format_ids[position]].name,
+            seats=None if seats == UNKNOWN_SEATS else seats,
+        )
+
+    def __iter__(self) -> Iterator[ShowTime]:
+        for showtime, format, seats in self.get_rows():
+            yield ShowTime(showtime=showtime, format=format, seats=seats)
+
+    def get_rows(self) -> Iterator[Tuple[int, str, Optional[int]]]:
+        formats = format_vocabulary.formats
+        for minutes, format_id, seats in zip(self.minutes, self.format_ids, self.seats):
+            yield minutes, formats[format_id].name, (
+                None if seats == UNKNOWN_SEATS else seats
+            )
+
+    def _sort(self):
+        order = sorted(range(len(self.minutes)), key=self.minutes.__getitem__)
+        self.starts = array("H", [self.minutes[position] for position in order])
+        self.order = array("H", order)
+
+    def get_window(self, window: TimeWindow) -> "ShowTimes":
+        if self.order is None:
+            self._sort()
+        positions: List[int] = []
+        for start, end in window.get_ranges():
+            positions += self.order[
+                bisect_left(self.starts, start) : bisect_right(self.starts, end)
+            ]
+        if len(positions) == len(self.minutes):
+            return self
+        positions.sort()
+        return ShowTimes(
+            array("H", [self.minutes[position] for position in positions]),
+            array("H", [self.format_ids[position] for position in positions]),
+            array("i", [self.seats[position] for position in positions]),
+        )
+
+    def __repr__(self) -> str:
+        return f"ShowTimes({list(self)!r})"
+
+
+@dataclass(frozen=True)
 class Movie:
+    __slots__ = ("title", "showtimes")
+
     title: str
-    showtimes: List[ShowTime]
+    showtimes: ShowTimes
 
     def get_showtimes(self):
         return self.showtimes
 
     def get_formatted_title(self):
         return self.title.upper().replace("-", " ")
+
+    def get_window(self, window: TimeWindow) -> "Movie":
+        showtimes = self.showtimes.get_window(window)
+        if showtimes is self.showtimes:
+            return self
+        return Movie(title=self.title, showtimes=showtimes)
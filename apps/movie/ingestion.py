@@ -0,0 +1,158 @@
+from collections import defaultdict
+from datetime import date, time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from django.db import transaction
+from django.db.models import F
+
+from apps.cinema.models import Cinema
+from apps.cinema.registry import CHAIN_NAMES, CINEMARK, registry, seed_registry
+from apps.cinema.services import cinehoyts as cinehoyts_services
+from apps.cinema.services import cinemark as cinemark_services
+from apps.movie.catalogue import movie_catalogue
+from apps.movie.models import Showing
+from cinema_showings_bot.settings import INGESTION_BATCH_SIZE
+
+ShowingKey = Tuple[date, time, str, str]
+StoredShowing = Tuple[int, Optional[int], Optional[int]]
+
+
+def _sync_cinemas() -> Dict[str, int]:
+    seed_registry()
+    return dict(Cinema.objects.values_list("keyword", "id"))
+
+
+def iter_snapshot_cinemas(
+    showings: Dict[str, Dict[str, Any]],
+    sources: Optional[Set[Tuple[str, str]]] = None,
+) -> Iterator[Tuple[str, Iterator[Dict[str, Any]]]]:
+    for zone, zone_showings in showings.get("cinehoyts", {}).items():
+        if sources is not None and ("cinehoyts", zone) not in sources:
+            continue
+        for cinema_showings in zone_showings:
+            yield cinema_showings["Key"], cinehoyts_services.normalize_showings(
+                [cinema_showings]
+            )
+    for cinema in registry.get_chain_cinemas(CINEMARK):
+        cinema_tag = cinema["tag"]
+        if sources is not None and ("cinemark", str(cinema["id"])) not in sources:
+            continue
+        dateshows = showings.get("cinemark", {}).get(str(cinema["id"]))
+        if dateshows is not None:
+            yield cinema_tag, cinemark_services.normalize_showings(
+                cinema_tag, dateshows
+            )
+
+
+def _get_showing_key(showing: Dict[str, Any]) -> ShowingKey:
+    return (
+        showing["date"],
+        showing["time"],
+        showing["movie_title"],
+        showing["format"],
+    )
+
+
+def _get_stored_showings(
+    cinema_ids: Iterable[int],
+) -> Dict[int, Dict[ShowingKey, StoredShowing]]:
+    stored_showings = defaultdict(dict)
+    for showing in (
+        Showing.objects.filter(cinema_id__in=list(cinema_ids))
+        .values_list(
+            "id",
+            "cinema_id",
+            "date",
+            "time",
+            "movie_title",
+            "format",
+            "seats",
+            "movie_id",
+        )
+        .iterator()
+    ):
+        showing_id, cinema_id, *key, seats, movie_id = showing
+        stored_showings[cinema_id][tuple(key)] = (showing_id, seats, movie_id)
+    return stored_showings
+
+
+def _get_batches(items: List[Any]) -> Iterator[List[Any]]:
+    for start in range(0, len(items), INGESTION_BATCH_SIZE):
+        yield items[start : start + INGESTION_BATCH_SIZE]
+
+
+# The bot answers from the showtime index, not from Showing. The table is kept
+# because diffing against it is what bumps the per-cinema versions that key the
+# rendered cache, and it records the catalogue link of every session.
+def ingest_showings(
+    showings: Dict[str, Dict[str, Any]],
+    sources: Optional[Set[Tuple[str, str]]] = None,
+) -> Dict[str, int]:
+    cinema_ids = _sync_cinemas()
+    fetched_showings, cinema_chains, movie_aliases = {}, {}, {}
+    for cinema_tag, cinema_showings in iter_snapshot_cinemas(showings, sources):
+        cinema_id = cinema_ids.get(cinema_tag)
+        if not cinema_id:
+            continue
+        chain = cinema_chains[cinema_id] = CHAIN_NAMES[registry.get_chain(cinema_tag)]
+        fetched_showings[cinema_id] = {}
+        for showing in cinema_showings:
+            fetched_showings[cinema_id][_get_showing_key(showing)] = showing["seats"]
+            movie_aliases[(chain, showing["movie_title"])] = showing.get("movie_key")
+    movie_ids = movie_catalogue.get_movie_ids(
+        (chain, movie_title, movie_key)
+        for (chain, movie_title), movie_key in movie_aliases.items()
+    )
+    stored_showings = _get_stored_showings(fetched_showings.keys())
+    inserts, updates, deletes, links, changed_cinema_ids = [], [], [], [], set()
+    for cinema_id, cinema_showings in fetched_showings.items():
+        chain = cinema_chains[cinema_id]
+        stored_cinema_showings = stored_showings.get(cinema_id, {})
+        for key, seats in cinema_showings.items():
+            stored_showing = stored_cinema_showings.get(key)
+            movie_id = movie_ids[(chain, key[2])]
+            if not stored_showing:
+                showing_date, showing_time, movie_title, format = key
+                inserts.append(
+                    Showing(
+                        cinema_id=cinema_id,
+                        movie_title=movie_title,
+                        date=showing_date,
+                        time=showing_time,
+                        format=format,
+                        seats=seats,
+                        movie_id=movie_id,
+                    )
+                )
+                changed_cinema_ids.add(cinema_id)
+                continue
+            if stored_showing[1] != seats:
+                updates.append(Showing(id=stored_showing[0], seats=seats))
+                changed_cinema_ids.add(cinema_id)
+            if stored_showing[2] != movie_id:
+                links.append(Showing(id=stored_showing[0], movie_id=movie_id))
+        for key, (showing_id, *_) in stored_cinema_showings.items():
+            if key not in cinema_showings:
+                deletes.append(showing_id)
+                changed_cinema_ids.add(cinema_id)
+    with transaction.atomic():
+        Showing.objects.bulk_create(inserts, batch_size=INGESTION_BATCH_SIZE)
+        Showing.objects.bulk_update(updates, ["seats"], batch_size=INGESTION_BATCH_SIZE)
+        Showing.objects.bulk_update(links, ["movie"], batch_size=INGESTION_BATCH_SIZE)
+        for batch in _get_batches(deletes):
+            Showing.objects.filter(id__in=batch).delete()
+        Cinema.objects.filter(id__in=changed_cinema_ids).update(
+            version=F("version") + 1
+        )
+    return {
+        "inserted": len(inserts),
+        "updated": len(updates),
+        "deleted": len(deletes),
+        "linked": len(links),
+        "changed_cinemas": len(changed_cinema_ids),
+        "normalized_cinemas": len(fetched_showings),
+    }
+
+
+def get_cinema_versions() -> Dict[str, int]:
+    return dict(Cinema.objects.values_list("keyword", "version"))
@@ -0,0 +1,71 @@
+from django.db import migrations, models
+
+
+def clear_legacy_showings(apps, schema_editor):
+    # Legacy rows keep free-form date strings that can't become DateField
+    # values. Showings are derived data, so the next ingest recreates them.
+    apps.get_model("movie", "Showing").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("movie", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="showing",
+            name="time",
+            field=models.TimeField(null=True),
+        ),
+        migrations.RunPython(clear_legacy_showings, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name="showing",
+            name="datetime",
+        ),
+        migrations.AlterField(
+            model_name="showing",
+            name="date",
+            field=models.DateField(),
+        ),
+        migrations.AlterField(
+            model_name="showing",
+            name="time",
+            field=models.TimeField(),
+        ),
+        migrations.AddField(
+            model_name="showing",
+            name="seats",
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name="showing",
+            name="imdb_id",
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name="showing",
+            constraint=models.UniqueConstraint(
+                fields=("cinema", "date", "time", "movie_title", "format"),
+                name="unique_showing",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="showing",
+            index=models.Index(
+                fields=["date", "cinema"], name="showing_date_cinema_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="showing",
+            index=models.Index(
+                fields=["date", "movie_title"], name="showing_date_movie_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="showing",
+            index=models.Index(
+                fields=["date", "format"], name="showing_date_format_idx"
+            ),
+        ),
+    ]
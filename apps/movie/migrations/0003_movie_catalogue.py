@@ -0,0 +1,86 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("movie", "0002_showing_columns"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Movie",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("slug", models.CharField(max_length=255, unique=True)),
+                ("title", models.CharField(max_length=255)),
+                ("imdb_id", models.CharField(blank=True, max_length=255, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="showing",
+            name="movie",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="showings",
+                to="movie.movie",
+            ),
+        ),
+        migrations.CreateModel(
+            name="MovieAlias",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "chain",
+                    models.CharField(
+                        choices=[
+                            ("CineHoyts", "CineHoyts"),
+                            ("Cinemark", "Cinemark"),
+                            ("Cineplanet", "Cineplanet"),
+                            ("Independent", "Independent"),
+                            ("Muvix", "Muvix"),
+                        ],
+                        max_length=255,
+                    ),
+                ),
+                ("alias", models.CharField(max_length=255)),
+                (
+                    "movie",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="aliases",
+                        to="movie.movie",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("chain", "alias"), name="unique_movie_alias"
+                    )
+                ],
+            },
+        ),
+    ]
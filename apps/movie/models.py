@@ -3,6 +3,31 @@ from django.db import models
 from apps.cinema.models import Cinema
 
 
+class Movie(models.Model):
+    slug = models.CharField(max_length=255, unique=True)
+    title = models.CharField(max_length=255)
+    imdb_id = models.CharField(max_length=255, blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+
+class MovieAlias(models.Model):
+    movie = models.ForeignKey(
+        Movie,
+        on_delete=models.CASCADE,
+        related_name="aliases",
+    )
+    chain = models.CharField(max_length=255, choices=Cinema.CHAIN_CHOICES)
+    alias = models.CharField(max_length=255)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["chain", "alias"],
+                name="unique_movie_alias",
+            )
+        ]
+
+
 class Showing(models.Model):
     movie_title = models.CharField(max_length=255)
     cinema = models.ForeignKey(
@@ -10,7 +35,28 @@ class Showing(models.Model):
         on_delete=models.CASCADE,
         related_name="showings",
     )
-    date = models.CharField(max_length=255)
-    datetime = models.CharField(max_length=255)
+    date = models.DateField()
+    time = models.TimeField()
     format = models.CharField(max_length=255)
-    imdb_id = models.CharField(max_length=255)
+    seats = models.IntegerField(blank=True, null=True)
+    imdb_id = models.CharField(max_length=255, blank=True, null=True)
+    movie = models.ForeignKey(
+        Movie,
+        on_delete=models.SET_NULL,
+        related_name="showings",
+        blank=True,
+        null=True,
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["cinema", "date", "time", "movie_title", "format"],
+                name="unique_showing",
+            )
+        ]
+        indexes = [
+            models.Index(fields=["date", "cinema"], name="showing_date_cinema_idx"),
+            models.Index(fields=["date", "movie_title"], name="showing_date_movie_idx"),
+            models.Index(fields=["date", "format"], name="showing_date_format_idx"),
+        ]
@@ -0,0 +1,108 @@
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, Mapping, Optional, Set, Tuple
+
+from apps.movie.catalogue import get_movie_slug, movie_catalogue
+from cinema_showings_bot.settings import MOVIE_SEARCH_THRESHOLD
+
+
+def get_trigrams(text: str) -> FrozenSet[str]:
+    trigrams = set()
+    for word in get_movie_slug(text).split("-"):
+        if not word:
+            continue
+        padded_word = f"  {word} "
+        trigrams.update(
+            padded_word[start : start + 3] for start in range(len(padded_word) - 2)
+        )
+    return frozenset(trigrams)
+
+
+def _get_similarity(trigrams: FrozenSet[str], movie_trigrams: FrozenSet[str]) -> float:
+    # Share of the query trigrams found in the movie, so a query naming one
+    # word of a long title still scores like pg_trgm's word_similarity.
+    return len(trigrams & movie_trigrams) / len(trigrams) if trigrams else 0.0
+
+
+@dataclass(frozen=True)
+class MovieSearchIndex:
+    aliases: Tuple[Tuple[str, int], ...] = ()
+    movie_trigrams: Mapping[int, FrozenSet[str]] = field(default_factory=dict)
+    trigram_movies: Mapping[str, FrozenSet[int]] = field(default_factory=dict)
+
+    def search(self, query: str) -> Tuple[int, ...]:
+        query = query.lower()
+        movie_ids = {
+            movie_id
+            for alias, movie_id in self.aliases
+            if query in alias or alias in query
+        }
+        is_substring_match = bool(movie_ids)
+        trigrams = get_trigrams(query)
+        if not is_substring_match:
+            for trigram in trigrams:
+                movie_ids.update(self.trigram_movies.get(trigram, ()))
+        scores = {
+            movie_id: _get_similarity(trigrams, self.movie_trigrams[movie_id])
+            for movie_id in movie_ids
+        }
+        ranked = sorted(scores, key=lambda movie_id: (-scores[movie_id], movie_id))
+        if is_substring_match or not ranked:
+            return tuple(ranked)
+        # Without a substring hit only the best typo matches are returned.
+        minimum_score = max(MOVIE_SEARCH_THRESHOLD, scores[ranked[0]])
+        return tuple(
+            movie_id for movie_id in ranked if scores[movie_id] >= minimum_score
+        )
+
+
+def build_movie_search(aliases: Iterable[Tuple[str, int]]) -> MovieSearchIndex:
+    aliases = tuple(
+        dict.fromkeys((alias.lower(), movie_id) for alias, movie_id in aliases if alias)
+    )
+    movie_trigrams: Dict[int, Set[str]] = defaultdict(set)
+    for alias, movie_id in aliases:
+        movie_trigrams[movie_id].update(get_trigrams(alias))
+    trigram_movies: Dict[str, Set[int]] = defaultdict(set)
+    for movie_id, trigrams in movie_trigrams.items():
+        for trigram in trigrams:
+            trigram_movies[trigram].add(movie_id)
+    return MovieSearchIndex(
+        aliases=aliases,
+        movie_trigrams={
+            movie_id: frozenset(trigrams)
+            for movie_id, trigrams in movie_trigrams.items()
+        },
+        trigram_movies={
+            trigram: frozenset(movie_ids)
+            for trigram, movie_ids in trigram_movies.items()
+        },
+    )
+
+
+@dataclass(frozen=True)
+class MovieMatch:
+    query: str
+    movie_ids: FrozenSet[int] = frozenset()
+    indexed_movie_ids: FrozenSet[int] = frozenset()
+
+    def matches(self, chain: str, alias: str) -> bool:
+        if self.indexed_movie_ids:
+            movie_id = movie_catalogue.get_movie_id(chain, alias)
+            if movie_id in self.indexed_movie_ids:
+                return movie_id in self.movie_ids
+        return self.query in alias or alias in self.query
+
+
+def get_movie_match(
+    movie: Optional[str], movie_search: Optional[MovieSearchIndex]
+) -> Optional[MovieMatch]:
+    if not movie:
+        return None
+    if not movie_search:
+        return MovieMatch(query=movie)
+    return MovieMatch(
+        query=movie,
+        movie_ids=frozenset(movie_search.search(movie)),
+        indexed_movie_ids=frozenset(movie_search.movie_trigrams),
+    )
@@ -0,0 +1,250 @@
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from asgiref.sync import sync_to_async
+
+from apps.cinema.formats import FormatFilter, format_vocabulary
+from apps.cinema.loops import LoopLock
+from apps.cinema.registry import CHAIN_NAMES, registry
+from apps.cinema.snapshots import snapshot_store
+from apps.movie.catalogue import get_canonical_title, movie_catalogue
+from apps.movie.ingestion import iter_snapshot_cinemas
+from apps.movie.search import MovieSearchIndex, build_movie_search
+
+COLUMNS = {
+    "date": np.int16,
+    "cinema": np.int32,
+    "chain": np.int8,
+    "movie": np.int32,
+    "movie_id": np.int32,
+    "format": np.int16,
+    "minute": np.int16,
+    "seats": np.int32,
+}
+# Movies are counted by catalogue id so every alias of a movie lands in one total.
+COUNT_COLUMNS = {"movie": "movie_id"}
+
+
+class _Labels:
+    def __init__(self):
+        self.ids: Dict[Any, int] = {}
+        self.values: List[Any] = []
+
+    def get_id(self, value: Any) -> int:
+        label_id = self.ids.get(value)
+        if label_id is None:
+            label_id = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return label_id
+
+
+@dataclass(frozen=True)
+class ShowtimeIndex:
+    version: Optional[int]
+    columns: Dict[str, np.ndarray]
+    labels: Dict[str, Tuple[Any, ...]]
+    label_ids: Dict[str, Dict[Any, int]]
+    movie_search: MovieSearchIndex
+
+    def __len__(self) -> int:
+        return len(self.columns["date"])
+
+    def _get_label_ids(self, column: str, values: Iterable[Any]) -> List[int]:
+        label_ids = self.label_ids[column]
+        return [label_ids[value] for value in values if value in label_ids]
+
+    def filter(
+        self,
+        showing_date: Optional[date] = None,
+        movie: Optional[str] = None,
+        cinemas: Optional[Iterable[str]] = None,
+        chain: Optional[str] = None,
+        format: Optional[FormatFilter] = None,
+    ) -> np.ndarray:
+        mask = np.ones(len(self), dtype=bool)
+        if showing_date is not None:
+            mask &= self.columns["date"] == self.label_ids["date"].get(showing_date, -1)
+        if movie:
+            canonical_movie = get_canonical_title(movie)
+            mask &= np.isin(
+                self.columns["movie"],
+                [
+                    movie_id
+                    for movie_id, movie_title in enumerate(self.labels["movie"])
+                    if canonical_movie in movie_title
+                ],
+            )
+        if cinemas is not None:
+            mask &= np.isin(
+                self.columns["cinema"], self._get_label_ids("cinema", cinemas)
+            )
+        if chain:
+            mask &= self.columns["chain"] == self.label_ids["chain"].get(chain, -1)
+        if format:
+            selected_formats = np.zeros(len(self.labels["format"]), dtype=bool)
+            selected_formats[
+                format.get_format_ids(
+                    format_vocabulary.formats[: len(self.labels["format"])]
+                )
+            ] = True
+            mask &= selected_formats[self.columns["format"]]
+        return mask
+
+    def count_by(self, column: str, mask: np.ndarray) -> List[Tuple[int, int]]:
+        counts = np.bincount(
+            self.columns[column][mask], minlength=len(self.labels[column])
+        )
+        label_ids = np.flatnonzero(counts)
+        label_ids = label_ids[np.argsort(-counts[label_ids], kind="stable")]
+        return [(int(label_id), int(counts[label_id])) for label_id in label_ids]
+
+    def _get_labelled_counts(
+        self, column: str, counts: List[Tuple[int, int]]
+    ) -> List[Tuple[Any, int]]:
+        labels = self.labels["cinema_name" if column == "cinema" else column]
+        return [(labels[label_id], total) for label_id, total in counts]
+
+    def get_totals(
+        self,
+        column: str,
+        showing_date: Optional[date] = None,
+        format: Optional[FormatFilter] = None,
+        **filters,
+    ) -> List[Tuple[Any, int]]:
+        mask = self.filter(showing_date=showing_date, format=format, **filters)
+        column = COUNT_COLUMNS.get(column, column)
+        return self._get_labelled_counts(column, self.count_by(column, mask))
+
+    def get_breakdowns(
+        self,
+        showing_date: Optional[date] = None,
+        format: Optional[FormatFilter] = None,
+        **filters,
+    ) -> Dict[str, List[Tuple[Any, int]]]:
+        mask = self.filter(showing_date=showing_date, format=format, **filters)
+        breakdowns = {
+            column: self._get_labelled_counts(
+                COUNT_COLUMNS.get(column, column),
+                self.count_by(COUNT_COLUMNS.get(column, column), mask),
+            )
+            for column in ("movie", "format", "chain")
+        }
+        cinema_counts = self.count_by("cinema", mask)
+        breakdowns["cinema"] = self._get_labelled_counts("cinema", cinema_counts)
+        zone_totals: Dict[str, int] = {}
+        for cinema_id, total in cinema_counts:
+            zone = self.labels["cinema_zone"][cinema_id]
+            zone_totals[zone] = zone_totals.get(zone, 0) + total
+        breakdowns["zone"] = sorted(
+            zone_totals.items(), key=lambda item: item[1], reverse=True
+        )
+        return breakdowns
+
+
+def build_showtime_index(
+    showings: Dict[str, Dict[str, Any]], version: Optional[int] = None
+) -> ShowtimeIndex:
+    labels = {
+        column: _Labels()
+        for column in COLUMNS
+        if column not in ("movie_id", "format", "minute", "seats")
+    }
+    columns: Dict[str, List[int]] = {column: [] for column in COLUMNS}
+    movie_aliases = _Labels()
+    cinema_names, cinema_zones = [], []
+    for cinema_tag, cinema_showings in iter_snapshot_cinemas(showings):
+        chain = registry.get_chain(cinema_tag)
+        if not chain:
+            continue
+        cinema_id = labels["cinema"].get_id(cinema_tag)
+        if cinema_id == len(cinema_names):
+            cinema = registry.get_cinema(chain, cinema_tag)
+            cinema_names.append(cinema["name"])
+            cinema_zones.append(cinema["zone"])
+        chain_id = labels["chain"].get_id(chain)
+        chain_name = CHAIN_NAMES[chain]
+        for showing in cinema_showings:
+            columns["date"].append(labels["date"].get_id(showing["date"]))
+            columns["cinema"].append(cinema_id)
+            columns["chain"].append(chain_id)
+            columns["movie"].append(
+                labels["movie"].get_id(get_canonical_title(showing["movie_title"]))
+            )
+            columns["movie_id"].append(
+                movie_aliases.get_id(
+                    (chain_name, showing["movie_title"], showing.get("movie_key"))
+                )
+            )
+            columns["format"].append(format_vocabulary.get_format(showing["format"]).id)
+            columns["minute"].append(showing["time"].hour * 60 + showing["time"].minute)
+            columns["seats"].append(
+                -1 if showing["seats"] is None else showing["seats"]
+            )
+    # The index only reads the catalogue; ingestion is what adds new movies.
+    # Until then a movie is keyed by its canonical title.
+    movie_ids = movie_catalogue.find_movie_ids(movie_aliases.values)
+    movies = _Labels()
+    movie_titles = []
+    alias_movies = []
+    for chain, movie_title, _ in movie_aliases.values:
+        movie_id = movie_ids[(chain, movie_title)]
+        canonical_title = get_canonical_title(movie_title)
+        movie = movies.get_id(canonical_title if movie_id is None else movie_id)
+        if movie == len(movie_titles):
+            title = None if movie_id is None else movie_catalogue.get_title(movie_id)
+            movie_titles.append(title or canonical_title)
+        alias_movies.append(movie)
+    columns["movie_id"] = np.array(alias_movies, dtype=COLUMNS["movie_id"])[
+        np.array(columns["movie_id"], dtype=np.intp)
+    ]
+    format_names = tuple(show_format.name for show_format in format_vocabulary.formats)
+    return ShowtimeIndex(
+        version=version,
+        columns={
+            column: np.array(values, dtype=COLUMNS[column])
+            for column, values in columns.items()
+        },
+        labels={
+            **{column: tuple(label.values) for column, label in labels.items()},
+            "cinema_name": tuple(cinema_names),
+            "cinema_zone": tuple(cinema_zones),
+            "format": format_names,
+            "movie_id": tuple(movie_titles),
+        },
+        label_ids={
+            **{column: label.ids for column, label in labels.items()},
+            "format": {
+                format_name: format_id
+                for format_id, format_name in enumerate(format_names)
+            },
+        },
+        movie_search=build_movie_search(
+            (alias, movie_ids[(chain, movie_title)])
+            for chain, movie_title, movie_key in movie_aliases.values
+            if movie_ids[(chain, movie_title)] is not None
+            for alias in (movie_title, movie_key)
+            if alias
+        ),
+    )
+
+
+class ShowtimeIndexStore:
+    def __init__(self):
+        self.index: Optional[ShowtimeIndex] = None
+        self.lock = LoopLock()
+
+    async def get_index(self) -> Optional[ShowtimeIndex]:
+        if not await snapshot_store.has_snapshot():
+            return None
+        async with self.lock:
+            version = snapshot_store.version
+            if self.index is None or self.index.version != version:
+                self.index = await sync_to_async(build_showtime_index)(
+                    snapshot_store.showings, version
+                )
+        return self.index
+
+
+showtime_index = ShowtimeIndexStore()
@@ -0,0 +1,198 @@
+from collections import OrderedDict
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Set, Tuple
+
+import numpy as np
+
+from apps.movie.catalogue import get_canonical_title
+
+BUCKETS = 64
+SUBSTRING_MIN_LENGTH = 5
+RATIO_THRESHOLD = 0.66
+EDGE_THRESHOLD = 0.85
+
+
+def _get_ratio(a: str, b: str) -> float:
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def is_similar_title(movie_title: str, possible_movie: str) -> bool:
+    if (
+        len(movie_title) >= SUBSTRING_MIN_LENGTH
+        and len(possible_movie) >= SUBSTRING_MIN_LENGTH
+        and (movie_title in possible_movie or possible_movie in movie_title)
+    ):
+        return True
+    minimum_title_len = min(len(movie_title), len(possible_movie))
+    return (
+        _get_ratio(movie_title, possible_movie) > RATIO_THRESHOLD
+        or _get_ratio(
+            movie_title[:minimum_title_len], possible_movie[:minimum_title_len]
+        )
+        > EDGE_THRESHOLD
+        or _get_ratio(
+            movie_title[-minimum_title_len:], possible_movie[-minimum_title_len:]
+        )
+        > EDGE_THRESHOLD
+    )
+
+
+@lru_cache(maxsize=4096)
+def _get_cumulative_counts(movie_title: str) -> np.ndarray:
+    counts = np.zeros((len(movie_title) + 1, BUCKETS), dtype=np.int16)
+    for position, character in enumerate(movie_title, start=1):
+        counts[position] = counts[position - 1]
+        counts[position, ord(character) % BUCKETS] += 1
+    return counts
+
+
+def _get_upper_bounds(overlap: np.ndarray, length: np.ndarray) -> np.ndarray:
+    # SequenceMatcher.ratio() is 2 * matches / length and matches can never
+    # exceed the character multiset overlap, so these bounds only prune pairs
+    # that could not pass the threshold anyway.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(length > 0, 2.0 * overlap / length, 1.0)
+
+
+class _TitleFeatures:
+    def __init__(self, titles: List[str]):
+        max_len = max(len(title) for title in titles)
+        self.lengths = np.array([len(title) for title in titles], dtype=np.int64)
+        self.prefixes = np.empty((len(titles), max_len + 1, BUCKETS), dtype=np.int16)
+        self.suffixes = np.empty_like(self.prefixes)
+        for title_id, title in enumerate(titles):
+            prefixes = _get_cumulative_counts(title)
+            suffixes = _get_cumulative_counts(title[::-1])
+            self.prefixes[title_id, : len(title) + 1] = prefixes
+            self.prefixes[title_id, len(title) + 1 :] = prefixes[-1]
+            self.suffixes[title_id, : len(title) + 1] = suffixes
+            self.suffixes[title_id, len(title) + 1 :] = suffixes[-1]
+
+    def get_candidates(self, title_id: int, group_ids: np.ndarray) -> np.ndarray:
+        length = self.lengths[title_id]
+        group_lengths = self.lengths[group_ids]
+        edge_lengths = np.minimum(group_lengths, length)
+        counts = self.prefixes[title_id, -1]
+        overlap = np.minimum(self.prefixes[group_ids, -1], counts).sum(axis=1)
+        candidates = (
+            _get_upper_bounds(overlap, group_lengths + length) > RATIO_THRESHOLD
+        )
+        for edges in (self.prefixes, self.suffixes):
+            overlap = np.minimum(
+                edges[group_ids, length], edges[title_id, edge_lengths]
+            ).sum(axis=1)
+            candidates |= _get_upper_bounds(overlap, 2 * edge_lengths) > EDGE_THRESHOLD
+        return candidates
+
+
+def _get_grams(movie_title: str) -> Set[str]:
+    return {
+        movie_title[position : position + SUBSTRING_MIN_LENGTH]
+        for position in range(len(movie_title) - SUBSTRING_MIN_LENGTH + 1)
+    }
+
+
+class _SubstringIndex:
+    # A title contained in another shares every one of its grams with it, so
+    # looking up the leading gram of each side finds every substring pair.
+    def __init__(self):
+        self.grams: Dict[str, List[int]] = {}
+        self.heads: Dict[str, List[int]] = {}
+
+    def add(self, group_id: int, movie_title: str):
+        if len(movie_title) < SUBSTRING_MIN_LENGTH:
+            return
+        for gram in _get_grams(movie_title):
+            self.grams.setdefault(gram, []).append(group_id)
+        self.heads.setdefault(movie_title[:SUBSTRING_MIN_LENGTH], []).append(group_id)
+
+    def get_candidates(self, movie_title: str) -> Set[int]:
+        if len(movie_title) < SUBSTRING_MIN_LENGTH:
+            return set()
+        candidates = set(self.grams.get(movie_title[:SUBSTRING_MIN_LENGTH], ()))
+        for gram in _get_grams(movie_title):
+            candidates.update(self.heads.get(gram, ()))
+        return candidates
+
+
+def _group_titles(
+    titles: Tuple[str, ...], is_same_movie: Callable[[str, str], bool]
+) -> Tuple[int, ...]:
+    features = _TitleFeatures(list(titles))
+    substrings = _SubstringIndex()
+    group_ids: List[int] = []
+    title_groups = []
+    for title_id, title in enumerate(titles):
+        group_id = title_id
+        if group_ids:
+            groups = np.array(group_ids, dtype=np.int64)
+            candidates = substrings.get_candidates(title)
+            candidates.update(
+                groups[features.get_candidates(title_id, groups)].tolist()
+            )
+            # Group ids are the index of their first title, so sorting keeps
+            # the first matching group winning.
+            for possible_group in sorted(candidates):
+                if is_same_movie(title, titles[possible_group]):
+                    group_id = possible_group
+                    break
+        if group_id == title_id:
+            group_ids.append(title_id)
+            substrings.add(title_id, title)
+        title_groups.append(group_id)
+    return tuple(title_groups)
+
+
+class TitleGrouper:
+    def __init__(self, max_entries: int, max_decisions: int = 65536):
+        self.max_entries = max_entries
+        self.max_decisions = max_decisions
+        self.groupings: "OrderedDict[Tuple[str, ...], Tuple[int, ...]]" = OrderedDict()
+        self.decisions: "OrderedDict[Tuple[str, str], bool]" = OrderedDict()
+
+    def is_same_movie(self, movie_title: str, possible_movie: str) -> bool:
+        key = (movie_title, possible_movie)
+        decision = self.decisions.get(key)
+        if decision is None:
+            decision = self.decisions[key] = is_similar_title(
+                movie_title, possible_movie
+            )
+            while len(self.decisions) > self.max_decisions:
+                self.decisions.popitem(last=False)
+        self.decisions.move_to_end(key)
+        return decision
+
+    def get_groups(self, titles: Tuple[str, ...]) -> Tuple[int, ...]:
+        groups = self.groupings.get(titles)
+        if groups is None:
+            groups = self.groupings[titles] = _group_titles(titles, self.is_same_movie)
+            while len(self.groupings) > self.max_entries:
+                self.groupings.popitem(last=False)
+        self.groupings.move_to_end(titles)
+        return groups
+
+    def clear(self):
+        self.groupings.clear()
+        self.decisions.clear()
+
+    def get_totals(self, movie_counts: Iterable[Tuple[str, int]]) -> Dict[str, int]:
+        title_ids: Dict[str, int] = {}
+        title_counts: List[int] = []
+        for movie_title, showtimes in movie_counts:
+            title_id = title_ids.setdefault(
+                get_canonical_title(movie_title), len(title_ids)
+            )
+            if title_id == len(title_counts):
+                title_counts.append(0)
+            title_counts[title_id] += showtimes
+        if not title_ids:
+            return {}
+        titles = tuple(title_ids)
+        total: Dict[str, int] = {}
+        for group_id, showtimes in zip(self.get_groups(titles), title_counts):
+            total[titles[group_id]] = total.get(titles[group_id], 0) + showtimes
+        return total
+
+
+title_grouper = TitleGrouper(max_entries=128)
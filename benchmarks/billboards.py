@@ -0,0 +1,209 @@
+import random
+from datetime import date, timedelta
+from itertools import zip_longest
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from apps.cinema.dates import MONTHS
+from apps.cinema.registry import CINEHOYTS, CINEMARK, registry
+
+MONTH_NAMES = {number: name for name, number in MONTHS.items()}
+
+TITLE_WORDS = [
+    "Batman",
+    "Avatar",
+    "Wakanda",
+    "Mario",
+    "Oppenheimer",
+    "Barbie",
+    "Dune",
+    "Elementos",
+    "Misión",
+    "Guardianes",
+    "Flash",
+    "Sirenita",
+    "Transformers",
+    "Indiana",
+    "Spider-Man",
+    "Napoleón",
+]
+TITLE_SUBTITLES = [
+    "El camino del agua",
+    "Por siempre",
+    "¡La película!",
+    "Parte dos",
+    "A través del multiverso",
+    "El despertar de las bestias",
+    "Sentencia mortal",
+    "¿Quién es quién?",
+]
+FORMATS = [
+    ("2D DOB", "2D DOB"),
+    ("2D SUBT", "2D SUBT"),
+    ("3D DOB", "3D DOB"),
+    ("3D SUBT", "3D SUBT"),
+    ("4DX DOB", "XD DOB"),
+    ("4DX SUBT", "XD SUBT"),
+    ("IMAX SUBT", "PREMIER SUBT"),
+    ("MACRO XE DOB", "DBOX DOB"),
+]
+
+
+def get_titles(movies: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    titles = []
+    while len(titles) < movies:
+        title = rng.choice(TITLE_WORDS)
+        if rng.random() < 0.6:
+            title = f"{title}: {rng.choice(TITLE_SUBTITLES)}"
+        if rng.random() < 0.3:
+            title = f"{title} {rng.randint(2, 5)}"
+        if title not in titles:
+            titles.append(title)
+    return titles
+
+
+def _get_slug(title: str) -> str:
+    return "".join(
+        character
+        for character in title.lower().replace(" ", "-")
+        if character.isalnum() or character == "-"
+    )
+
+
+def get_dates(dates: int, start: Optional[date] = None) -> List[date]:
+    start = start or date.today()
+    return [start + timedelta(days=offset) for offset in range(dates)]
+
+
+def _get_times(sessions: int) -> List[str]:
+    step = max(1, 12 * 60 // max(1, sessions))
+    return [
+        f"{(11 * 60 + session * step) // 60:02d}:{(11 * 60 + session * step) % 60:02d}"
+        for session in range(sessions)
+    ]
+
+
+def _get_cinehoyts_cinemas(cinemas: int) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    upstream_zones = registry.get_upstream_zones(CINEHOYTS)
+    registry_cinemas = [
+        cinema
+        for zone_cinemas in zip_longest(*upstream_zones.values())
+        for cinema in filter(None, zone_cinemas)
+    ]
+    zones = list(upstream_zones)
+    for number in range(cinemas):
+        if number < len(registry_cinemas):
+            yield registry_cinemas[number]["zone"], registry_cinemas[number]
+        else:
+            tag = f"cinehoyts-benchmark-{number}"
+            yield zones[number % len(zones)], {"name": tag, "tag": tag, "id": tag}
+
+
+def _get_cinemark_cinemas(cinemas: int) -> Iterator[Dict[str, Any]]:
+    registry_cinemas = registry.get_chain_cinemas(CINEMARK)
+    for number in range(cinemas):
+        if number < len(registry_cinemas):
+            yield registry_cinemas[number]
+        else:
+            yield {
+                "name": f"Cinemark Benchmark {number}",
+                "tag": f"cinemark-benchmark-{number}",
+                "id": 100000 + number,
+            }
+
+
+def generate_cinehoyts_cinema(
+    cinema: Dict[str, Any],
+    days: List[date],
+    titles: List[str],
+    formats: int,
+    sessions: int,
+) -> Dict[str, Any]:
+    times = _get_times(sessions)
+    return {
+        "Key": cinema["id"],
+        "Name": cinema["name"],
+        "Dates": [
+            {
+                "ShowtimeDate": f"{day.day:02d} {MONTH_NAMES[day.month]}",
+                "Movies": [
+                    {
+                        "Key": _get_slug(title),
+                        "Title": title,
+                        "Formats": [
+                            {
+                                "Name": format_names[0],
+                                "Showtimes": [{"Time": time} for time in times],
+                            }
+                            for format_names in FORMATS[:formats]
+                        ],
+                    }
+                    for title in titles
+                ],
+            }
+            for day in days
+        ],
+    }
+
+
+def generate_cinemark_cinema(
+    days: List[date],
+    titles: List[str],
+    formats: int,
+    sessions: int,
+    seed: int = 0,
+) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    times = _get_times(sessions)
+    return [
+        {
+            "date": day.isoformat(),
+            "movies": [
+                {
+                    "title": title,
+                    "movie_versions": [
+                        {
+                            "title": f"{title.upper()} ({format_names[1]})",
+                            "sessions": [
+                                {
+                                    "hour": f"{time}:00",
+                                    "seats_available": rng.randint(0, 300),
+                                }
+                                for time in times
+                            ],
+                        }
+                        for format_names in FORMATS[:formats]
+                    ],
+                }
+                for title in titles
+            ],
+        }
+        for day in days
+    ]
+
+
+def generate_showings(
+    cinemas: int,
+    dates: int,
+    movies: int,
+    formats: int,
+    sessions: int,
+    start: Optional[date] = None,
+    seed: int = 0,
+) -> Dict[str, Dict[str, Any]]:
+    days = get_dates(dates, start)
+    titles = get_titles(movies, seed)
+    cinehoyts_showings: Dict[str, Any] = {
+        zone: [] for zone in registry.get_upstream_zones(CINEHOYTS)
+    }
+    for zone, cinema in _get_cinehoyts_cinemas(cinemas):
+        cinehoyts_showings[zone].append(
+            generate_cinehoyts_cinema(cinema, days, titles, formats, sessions)
+        )
+    cinemark_showings = {
+        str(cinema["id"]): generate_cinemark_cinema(
+            days, titles, formats, sessions, seed + cinema["id"]
+        )
+        for cinema in _get_cinemark_cinemas(cinemas)
+    }
+    return {"cinehoyts": cinehoyts_showings, "cinemark": cinemark_showings}
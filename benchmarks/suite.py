@@ -0,0 +1,357 @@
+import asyncio
+import inspect
+import json
+import os
+import platform
+import statistics
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+
+from apps.cinema.dates import MONTHS, parse_time_window
+from apps.cinema.formats import format_vocabulary
+from apps.cinema.registry import CINEMARK, registry
+from apps.cinema.services import cinehoyts as cinehoyts_services
+from apps.cinema.services import cinemark as cinemark_services
+from apps.cinema.services.cache import showings_cache
+from apps.cinema.snapshots import snapshot_store
+from apps.discord import (
+    get_all_totals,
+    get_cinema_total,
+    get_format_total,
+    get_general_cinema_showings,
+    get_general_showings,
+    get_total,
+    iter_showing_by_cinema,
+)
+from apps.discord.cache import rendered_cache
+from apps.discord.messages import get_movie_date_messages, stream_movie_date_messages
+from apps.movie.catalogue import movie_catalogue
+from apps.movie.showtime_index import build_showtime_index
+from apps.movie.titles import TitleGrouper, title_grouper
+from benchmarks.billboards import generate_showings, get_dates, get_titles
+
+MONTH_NAMES = {number: name for name, number in MONTHS.items()}
+
+TITLE_CORPUS = os.path.join(os.path.dirname(__file__), "title_corpus.json")
+
+MEMORY_BENCHMARKS = ("chain.country_showings",)
+
+Benchmark = Tuple[str, Callable[[], Any]]
+
+
+@contextmanager
+def serve_showings(showings: Dict[str, Dict[str, Any]]) -> Iterator[None]:
+    registry_ids = {
+        str(cinema["id"]) for cinema in registry.get_chain_cinemas(CINEMARK)
+    }
+    showings_cache.clear()
+    rendered_cache.clear()
+    snapshot_store.clear()
+    snapshot_store.checked_at = float("inf")
+    # An empty catalogue keeps the synthetic titles away from the configured
+    # database, so the suite neither reads nor writes its movies.
+    movie_catalogue.clear()
+    movie_catalogue.loaded = True
+    for zone, zone_showings in showings["cinehoyts"].items():
+        showings_cache.set(("cinehoyts", zone), zone_showings)
+    for cinema_id, dateshows in showings["cinemark"].items():
+        if cinema_id in registry_ids:
+            showings_cache.set(("cinemark", int(cinema_id)), dateshows)
+    try:
+        yield
+    finally:
+        showings_cache.clear()
+        rendered_cache.clear()
+        snapshot_store.checked_at = 0.0
+        movie_catalogue.clear()
+
+
+def _get_command_date(size: Dict[str, int]) -> str:
+    day = get_dates(size["dates"])[-1]
+    return f"{day.day}-{MONTH_NAMES[day.month]}"
+
+
+def _get_movie_by_cinema_messages() -> AsyncIterator[str]:
+    return stream_movie_date_messages(
+        iter_showing_by_cinema("batman", "alto-las-condes", None)
+    )
+
+
+async def _get_cached_zone_messages() -> List[str]:
+    snapshot_store.version = 0
+    snapshot_store.cinema_versions = dict.fromkeys(registry.get_sorted_cinema_tags(), 0)
+    try:
+        return [
+            message
+            async for message in get_general_cinema_showings(
+                "santiago-oriente", None, None
+            )
+        ]
+    finally:
+        snapshot_store.clear()
+
+
+async def _collect(items: AsyncIterator[Any]) -> List[Any]:
+    return [item async for item in items]
+
+
+async def _get_country_totals(date: str) -> List[Any]:
+    return await asyncio.gather(
+        cinehoyts_services.get_total(date, None),
+        cinemark_services.get_total(date, None),
+    )
+
+
+async def _get_first_message(messages: AsyncIterator[str]) -> Optional[str]:
+    try:
+        async for message in messages:
+            return message
+    finally:
+        await messages.aclose()
+
+
+async def get_benchmarks(
+    size: Dict[str, int], showings: Dict[str, Dict[str, Any]]
+) -> List[Benchmark]:
+    command_date = _get_command_date(size)
+    title_corpus = load_title_corpus()
+    movie_counts = [
+        (title, size["sessions"])
+        for _ in range(size["cinemas"])
+        for title in get_titles(size["movies"])
+    ]
+    showdates = await _collect(
+        cinehoyts_services.iter_cinema_showings_by_zone("santiago-oriente", None)
+    ) + await _collect(
+        cinemark_services.iter_cinema_showings_by_zone("santiago-oriente", None)
+    )
+    time_window = parse_time_window("21-23")
+    index = await sync_to_async(build_showtime_index)(showings)
+    index_date = get_dates(size["dates"])[-1]
+    return [
+        (
+            "micro.group_titles",
+            lambda: TitleGrouper(max_entries=1).get_totals(
+                title_corpus["movie_counts"]
+            ),
+        ),
+        ("micro.movie_counts_total", lambda: title_grouper.get_totals(movie_counts)),
+        (
+            "micro.get_movie_date_messages",
+            lambda: get_movie_date_messages(showdates),
+        ),
+        (
+            "micro.time_window",
+            lambda: [showdate.get_window(time_window) for showdate in showdates],
+        ),
+        (
+            "micro.cinehoyts_normalize",
+            lambda: [
+                row
+                for zone_showings in showings["cinehoyts"].values()
+                for row in cinehoyts_services.normalize_showings(zone_showings)
+            ],
+        ),
+        (
+            "micro.cinemark_normalize",
+            lambda: [
+                row
+                for cinema_id, dateshows in showings["cinemark"].items()
+                for row in cinemark_services.normalize_showings(cinema_id, dateshows)
+            ],
+        ),
+        ("index.build", lambda: build_showtime_index(showings)),
+        ("index.movie_totals", lambda: index.get_totals("movie", index_date)),
+        ("index.format_totals", lambda: index.get_totals("format", index_date)),
+        ("index.cinema_totals", lambda: index.get_totals("cinema", index_date)),
+        (
+            "index.movie_totals_format",
+            lambda: index.get_totals(
+                "movie", index_date, format_vocabulary.get_filter("ESP")
+            ),
+        ),
+        ("index.breakdowns", lambda: index.get_breakdowns(index_date)),
+        ("index.movie_search", lambda: index.movie_search.search("opennheimer")),
+        (
+            "chain.cinehoyts_get_total",
+            lambda: cinehoyts_services.get_total(command_date, None),
+        ),
+        (
+            "chain.cinemark_get_total",
+            lambda: cinemark_services.get_total(command_date, None),
+        ),
+        (
+            "chain.cinehoyts_showings_by_date",
+            lambda: cinehoyts_services.iter_showing_by_date(None, command_date, None),
+        ),
+        (
+            "chain.cinemark_showings_by_date",
+            lambda: cinemark_services.iter_showing_by_date(None, command_date, None),
+        ),
+        ("chain.country_showings", lambda: _get_country_totals(command_date)),
+        ("command.total", lambda: get_total(command_date, None)),
+        ("command.total_formatos", lambda: get_format_total(command_date, None)),
+        ("command.total_cinemas", lambda: get_cinema_total(command_date, None)),
+        ("command.totales", lambda: get_all_totals(command_date, None)),
+        (
+            "command.horarios_movie_date",
+            lambda: get_general_showings("batman", command_date, None, None),
+        ),
+        (
+            "command.horarios_movie_date_zone",
+            lambda: get_general_showings(
+                "batman", command_date, "santiago-oriente", None
+            ),
+        ),
+        ("command.horarios_movie_cinema", _get_movie_by_cinema_messages),
+        (
+            "command.horarios_cinema_date",
+            lambda: get_general_cinema_showings("alto-las-condes", command_date, None),
+        ),
+        (
+            "command.horarios_cinema_date_window",
+            lambda: get_general_cinema_showings(
+                "santiago-oriente", command_date, None, "21-23"
+            ),
+        ),
+        (
+            "command.horarios_zone",
+            lambda: get_general_cinema_showings("santiago-oriente", None, None),
+        ),
+        ("cache.horarios_zone", _get_cached_zone_messages),
+        (
+            "first.horarios_movie_date",
+            lambda: _get_first_message(
+                get_general_showings("batman", command_date, None, None)
+            ),
+        ),
+        (
+            "first.horarios_zone",
+            lambda: _get_first_message(
+                get_general_cinema_showings("santiago-oriente", None, None)
+            ),
+        ),
+    ]
+
+
+async def _call(benchmark: Callable[[], Any]) -> Any:
+    result = benchmark()
+    if inspect.isawaitable(result):
+        result = await result
+    elif inspect.isasyncgen(result):
+        result = [item async for item in result]
+    return result
+
+
+async def _time_benchmark(
+    benchmark: Callable[[], Any], repeat: int, min_time: float
+) -> Dict[str, Any]:
+    started_at = time.perf_counter()
+    await _call(benchmark)
+    number = max(1, int(min_time / max(time.perf_counter() - started_at, 1e-9)))
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        for _ in range(number):
+            await _call(benchmark)
+        timings.append((time.perf_counter() - started_at) / number)
+    return {
+        "best": min(timings),
+        "median": statistics.median(timings),
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+async def _measure_memory(benchmark: Callable[[], Any]) -> Dict[str, int]:
+    tracemalloc.start()
+    try:
+        started_at, _ = tracemalloc.get_traced_memory()
+        result = await _call(benchmark)
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return {"retained": retained - started_at, "peak": peak - started_at}
+
+
+async def run_benchmarks(
+    size: Dict[str, int],
+    repeat: int = 5,
+    min_time: float = 0.05,
+    pattern: Optional[str] = None,
+) -> Dict[str, Dict[str, Any]]:
+    showings = generate_showings(**size)
+    results = {}
+    with serve_showings(showings):
+        for name, benchmark in await get_benchmarks(size, showings):
+            if pattern and pattern not in name:
+                continue
+            results[name] = await _time_benchmark(benchmark, repeat, min_time)
+            if name in MEMORY_BENCHMARKS:
+                results[name].update(await _measure_memory(benchmark))
+    return results
+
+
+def load_title_corpus() -> Dict[str, Any]:
+    with open(TITLE_CORPUS) as title_corpus:
+        return json.load(title_corpus)
+
+
+def check_title_corpus() -> List[str]:
+    title_corpus = load_title_corpus()
+    total = TitleGrouper(max_entries=1).get_totals(title_corpus["movie_counts"])
+    expected = title_corpus["totals"]
+    return [
+        title
+        for title in dict.fromkeys([*expected, *total])
+        if total.get(title) != expected.get(title)
+    ]
+
+
+def get_report(size: Dict[str, int], results: Dict[str, Dict[str, Any]]) -> dict:
+    return {
+        "size": size,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def load_baseline(path: str) -> Optional[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return None
+    with open(path) as baseline:
+        return json.load(baseline)
+
+
+def save_baseline(path: str, report: Dict[str, Any]):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as baseline:
+        json.dump(report, baseline, indent=2, sort_keys=True)
+        baseline.write("\n")
+
+
+def compare_results(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Optional[Dict[str, Any]],
+    threshold: float,
+) -> List[Tuple[str, float, Optional[float], bool]]:
+    baseline_results = (baseline or {}).get("results", {})
+    comparison = []
+    for name, result in results.items():
+        baseline_result = baseline_results.get(name)
+        if not baseline_result:
+            comparison.append((name, result["median"], None, False))
+            continue
+        change = result["median"] / baseline_result["median"] - 1
+        comparison.append((name, result["median"], change, change > threshold))
+    return comparison
+
+
+def run(size: Dict[str, int], **options) -> Dict[str, Dict[str, Any]]:
+    return asyncio.run(run_benchmarks(size, **options))
@@ -38,8 +38,8 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
-    'apps.cinema',
-    'apps.movie',
+    "apps.cinema",
+    "apps.movie",
 ]
 
 MIDDLEWARE = [
@@ -126,3 +126,45 @@ STATIC_URL = "static/"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 COMMAND = str(os.environ.get("COMMAND", "$c."))
+
+CINEHOYTS_HOST = os.environ.get("CINEHOYTS_HOST", "https://cinepolischile.cl")
+CINEMARK_HOST = os.environ.get("CINEMARK_HOST", "https://api.cinemark.cl/api/")
+
+HTTP_CONNECT_TIMEOUT = float(os.environ.get("HTTP_CONNECT_TIMEOUT", 5))
+HTTP_READ_TIMEOUT = float(os.environ.get("HTTP_READ_TIMEOUT", 20))
+HTTP_KEEPALIVE_TIMEOUT = float(os.environ.get("HTTP_KEEPALIVE_TIMEOUT", 30))
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.environ.get("HTTP_MAX_CONNECTIONS_PER_HOST", 8))
+
+COMMAND_BUDGET = float(os.environ.get("COMMAND_BUDGET", 10))
+CINEHOYTS_BUDGET = float(os.environ.get("CINEHOYTS_BUDGET", 8))
+CINEMARK_BUDGET = float(os.environ.get("CINEMARK_BUDGET", 8))
+CINEMA_BUDGET = float(os.environ.get("CINEMA_BUDGET", 5))
+
+SHOWINGS_CACHE_TTL = float(os.environ.get("SHOWINGS_CACHE_TTL", 15 * 60))
+SHOWINGS_CACHE_STALE_TTL = float(
+    os.environ.get("SHOWINGS_CACHE_STALE_TTL", 6 * 60 * 60)
+)
+SHOWINGS_CACHE_MAX_ENTRIES = int(os.environ.get("SHOWINGS_CACHE_MAX_ENTRIES", 128))
+
+RENDERED_CACHE_MAX_BYTES = int(
+    os.environ.get("RENDERED_CACHE_MAX_BYTES", 8 * 1024 * 1024)
+)
+
+SNAPSHOT_INTERVAL = float(os.environ.get("SNAPSHOT_INTERVAL", 10 * 60))
+SNAPSHOT_POLL_INTERVAL = float(os.environ.get("SNAPSHOT_POLL_INTERVAL", 30))
+SNAPSHOT_MAX_AGE = float(os.environ.get("SNAPSHOT_MAX_AGE", 2 * 60 * 60))
+SNAPSHOT_KEEP = int(os.environ.get("SNAPSHOT_KEEP", 3))
+
+INGESTION_BATCH_SIZE = int(os.environ.get("INGESTION_BATCH_SIZE", 1000))
+
+STANDIN_FIXTURES_DIR = os.environ.get(
+    "STANDIN_FIXTURES_DIR", os.path.join(BASE_DIR, "fixtures", "upstream")
+)
+
+BENCHMARK_BASELINE = os.environ.get(
+    "BENCHMARK_BASELINE", os.path.join(BASE_DIR, "benchmarks", "baseline.json")
+)
+
+REGISTRY_POLL_INTERVAL = float(os.environ.get("REGISTRY_POLL_INTERVAL", 60))
+
+MOVIE_SEARCH_THRESHOLD = float(os.environ.get("MOVIE_SEARCH_THRESHOLD", 0.5))
@@ -1,12 +1,8 @@
 import os
 import sys
 
-from apps.discord import services as cinema_showings_bot
-
 
 def main():
-    cinema_showings_bot.main()
-
     """Run administrative tasks."""
     os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'cinema_showings_bot.settings')
     try: